@@ -1,12 +1,17 @@
 """Command line"""
+import cProfile
+import signal
+from pathlib import Path
+
 import click
 from click import Context
 
 from project_template import __version__
 from project_template.config import settings
+from project_template.constants import BENCH_DISTRIBUTIONS
 from project_template.log import init_log
-from project_template.manage import Manage
-from project_template.example_blog.server import Server
+
+# Commands import what they need when they run, so a command does not load the web and database stack of others.
 
 
 @click.group(invoke_without_command=True)
@@ -51,12 +56,105 @@ def server(host, port, level):
         if value:
             settings.set(name, value)
 
+    from project_template.example_blog.server import Server  # pylint: disable=import-outside-toplevel
     Server().run()
     
 @main.command()
-def run():
+@click.option('-w', '--workers', type=int, help=f'Number of transformer processes. Default: {settings.WORKERS}')
+@click.option('--unordered', is_flag=True, help='Load transformed data in completion order, not input order.')
+@click.option('--engine', type=click.Choice(['sync', 'async']), help=f'Pipeline engine. Default: {settings.ENGINE}')
+@click.option('--resume', is_flag=True, help='Continue an unfinished run from the last checkpoint.')
+@click.option('--incremental', is_flag=True, help='Only process data added since the last run.')
+@click.option('--follow', is_flag=True, help='Keep reading extractor file as it grows, like `tail -f`.')
+@click.option('--profile', type=click.Path(dir_okay=False), help='Profile run with cProfile, and dump stats to file.')
+def run(workers, unordered, engine, resume, incremental, follow, profile):
     """Run command"""
+    kwargs = {
+        'WORKERS': workers,
+        'ENGINE': engine,
+        'RESUME': resume,
+        'INCREMENTAL': incremental,
+        'FILE_EXTRACTOR_FOLLOW': follow,
+    }
+    for name, value in kwargs.items():
+        if value:
+            settings.set(name, value)
+    if unordered:
+        settings.set('ORDERED', False)
+    if follow:
+        # Stop following by SIGTERM like Ctrl-C, so a checkpoint is saved.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    from project_template.manage import AsyncManage, Manage  # pylint: disable=import-outside-toplevel
+    init_log()
+    manage = AsyncManage() if settings.ENGINE == 'async' else Manage()
+    if not profile:
+        manage.run()
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        manage.run()
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile)
+        click.echo(f'Profile stats dumped to {profile}, view it by `python -m pstats {profile}`.')
+    
+
+@main.group()
+def bench():
+    """Benchmark commands."""
+
+
+@bench.command()
+@click.option('--size', type=int, default=16 * 1024 * 1024, show_default=True, help='Bytes of synthetic input.')
+@click.option('--line-length', type=int, default=80, show_default=True, help='Mean length of input lines.')
+@click.option(
+    '--distribution',
+    type=click.Choice(BENCH_DISTRIBUTIONS),
+    default='uniform',
+    show_default=True,
+    help='Distribution of line length.',
+)
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed of input.')
+@click.option('-e', '--extractor', multiple=True, help='Extractor to benchmark, repeatable. Default: all.')
+@click.option('-t', '--transformer', multiple=True, help='Transformer to benchmark, repeatable. Default: all.')
+@click.option('-l', '--loader', multiple=True, help='Loader to benchmark, repeatable. Default: all.')
+@click.option('-w', '--workers', type=int, default=1, show_default=True, help='Number of transformer processes.')
+@click.option('--batch-size', type=int, default=1000, show_default=True, help='Records of a batch.')
+@click.option(
+    '--workdir',
+    type=click.Path(file_okay=False),
+    default='/tmp/project_template/bench',
+    show_default=True,
+    help='Directory of input and output files.',
+)
+@click.option(
+    '-o',
+    '--output',
+    type=click.Path(dir_okay=False),
+    help='Json report file. Default: report.json in workdir.',
+)
+def etl(size, line_length, distribution, seed, extractor, transformer, loader, workers, batch_size, workdir, output):
+    """Benchmark every combination of extractor, transformer and loader."""
+    # pylint: disable=import-outside-toplevel
+    from project_template.example_etl.bench import Bench, save_report
+    from project_template.manage import get_extension_names
     init_log()
-    manage = Manage()
-    manage.run()
-    
\ No newline at end of file
+    report = Bench(
+        Path(workdir),
+        size=size,
+        line_length=line_length,
+        distribution=distribution,
+        seed=seed,
+        workers=workers,
+        batch_size=batch_size,
+    ).run(
+        list(extractor) or get_extension_names('example_etl.extractor'),
+        list(transformer) or get_extension_names('example_etl.transformer'),
+        list(loader) or get_extension_names('example_etl.loader'),
+    )
+    output = output or Path(workdir, 'report.json')
+    save_report(report, output)
+    click.echo(f'Benchmark report saved to {output}')
@@ -1,2 +1,4 @@
 """Constants"""
 DEFAULT_ENCODING = 'utf-8'
+# Distributions of line lengths in benchmark input.
+BENCH_DISTRIBUTIONS = ('fixed', 'uniform', 'normal')
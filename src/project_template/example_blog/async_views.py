@@ -0,0 +1,78 @@
+"""Async views, they are used instead of `views` if `BLOG_DB_ASYNC` is true."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project_template.example_blog.dependencies import CommonQueryParams, get_async_db
+from project_template.example_blog.pagination import decode_cursor, encode_cursor
+from project_template.example_blog.schemas import ArticleSchema, CreateArticleSchema, UpdateArticleSchema
+from project_template.example_blog.services import AsyncArticleService
+
+router = APIRouter()
+
+_service = AsyncArticleService()
+
+
+@router.get('/health')
+async def health_check():
+    return {"status": "healthy", "message": "Server is running!"}
+
+
+@router.get('/articles/cache/stats')
+async def cache_stats():
+    return _service.cache_stats()
+
+
+@router.get('/articles')
+async def get(
+        response: Response,
+        session: AsyncSession = Depends(get_async_db),
+        commons: CommonQueryParams = Depends(),
+        cursor: Optional[str] = None,
+):
+    """List articles like `views.get`."""
+    response.headers['X-Total-Count'] = str(await _service.total(session))
+    if cursor is None:
+        return await _service.get(session, offset=commons.offset, limit=commons.limit)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    articles, next_cursor = await _service.get_page(session, cursor=after, limit=commons.limit)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = encode_cursor(next_cursor)
+    return articles
+
+
+@router.get('/articles/{pk}')
+async def get_by_id(
+        pk: int,
+        session: AsyncSession = Depends(get_async_db)
+):
+    return await _service.get_by_id(session, pk)
+
+
+@router.post('/articles', response_model=ArticleSchema)
+async def create(
+        obj_in: CreateArticleSchema,
+        session: AsyncSession = Depends(get_async_db),
+):
+    return await _service.create(session, obj_in)
+
+
+@router.patch('/articles/{pk}', response_model=ArticleSchema)
+async def patch(
+        pk: int,
+        obj_in: UpdateArticleSchema,
+        session: AsyncSession = Depends(get_async_db)
+):
+    return await _service.patch(session, pk, obj_in)
+
+
+@router.delete('/articles/{pk}')
+async def delete(
+        pk: int,
+        session: AsyncSession = Depends(get_async_db)
+):
+    return await _service.delete(session, pk)
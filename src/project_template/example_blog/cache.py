@@ -0,0 +1,226 @@
+"""Read-through cache for blog services.
+
+Reads of services are cached in a backend, the default backend is an in-process LRU with TTL.
+A shared cache can be plugged in by implementing ``CacheBackend``.
+
+Writes bump a generation counter, a value loaded before a write is not cached after it,
+and cached lists are keyed by generation so they are invalidated at once.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Returned by backend when a key is not cached, None may be a cached value.
+MISSING = object()
+
+
+class CacheBackend:
+    """Interface of cache backends, methods must be thread safe."""
+
+    def get(self, key: Hashable) -> Any:
+        """Return cached value of key, or ``MISSING``."""
+        raise NotImplementedError()
+
+    def set(self, key: Hashable, value: Any):
+        """Cache value of key."""
+        raise NotImplementedError()
+
+    def delete(self, key: Hashable):
+        """Remove key from cache."""
+        raise NotImplementedError()
+
+    def clear(self):
+        """Remove all keys."""
+        raise NotImplementedError()
+
+
+class LRUCache(CacheBackend):
+    """In-process cache of at most ``max_items`` keys, the least recently used key is evicted first.
+
+    Args:
+        max_items: Max cached keys.
+        ttl: Seconds a value is cached, 0 caches it until it is evicted.
+    """
+
+    def __init__(self, max_items: int, ttl: float):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.evictions = 0
+        self._items: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return MISSING
+            expire_at, value = item
+            if expire_at and expire_at <= time.monotonic():
+                del self._items[key]
+                return MISSING
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        expire_at = time.monotonic() + self.ttl if self.ttl else 0
+        with self._lock:
+            self._items[key] = (expire_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class ReadThroughCache:
+    """Load values on miss, concurrent misses of a key are loaded once.
+
+    Args:
+        backend: Backend which keeps values.
+        namespace: Prefix of keys, so services can share a backend.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str = ''):
+        self.backend = backend
+        self.namespace = namespace
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Locks of keys which are being loaded, waiters of a key reuse the value loaded by the first caller.
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        # Futures of keys which are being loaded by coroutines, they are used in one event loop.
+        self._async_loading: Dict[Hashable, asyncio.Future] = {}
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Return cached value of key, or value returned by ``load`` which is cached.
+
+        Args:
+            key: Cache key.
+            load: Load value from database.
+
+        Returns:
+            Any: Cached or loaded value.
+        """
+        key = (self.namespace, key)
+        value = self.backend.get(key)
+        if value is not MISSING:
+            self._count(hit=True)
+            return value
+
+        with self._lock:
+            lock = self._loading.setdefault(key, threading.Lock())
+        with lock:
+            # Value may be loaded by another caller while waiting.
+            value = self.backend.get(key)
+            if value is not MISSING:
+                self._count(hit=True)
+                return value
+            self._count(hit=False)
+            generation = self.generation
+            try:
+                value = load()
+                # Skip a value loaded before a write, it may be stale.
+                with self._lock:
+                    if generation == self.generation:
+                        self.backend.set(key, value)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            return value
+
+    async def get_async(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Like ``get``, but ``load`` is a coroutine function, waiters of a key await the same load in event loop.
+
+        Args:
+            key: Cache key.
+            load: Load value from database asynchronously.
+
+        Returns:
+            Any: Cached or loaded value.
+        """
+        key = (self.namespace, key)
+        while True:
+            value = self.backend.get(key)
+            if value is not MISSING:
+                self._count(hit=True)
+                return value
+            future = self._async_loading.get(key)
+            if future is None:
+                break
+            try:
+                value = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Load of the first caller is cancelled, eg: its client is disconnected, so waiters retry it.
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                continue
+            self._count(hit=True)
+            return value
+        self._count(hit=False)
+        future = self._async_loading[key] = asyncio.get_running_loop().create_future()
+        generation = self.generation
+        try:
+            value = await load()
+            with self._lock:
+                if generation == self.generation:
+                    self.backend.set(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+            # Mark exception retrieved, there may be no waiters.
+            future.exception()
+            raise
+        finally:
+            del self._async_loading[key]
+
+    def get_generational(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Like ``get``, but value is invalidated by any write, eg: a page of list."""
+        return self.get((self.generation, key), load)
+
+    async def get_generational_async(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Like ``get_async``, but value is invalidated by any write."""
+        return await self.get_async((self.generation, key), load)
+
+    def invalidate(self, key: Hashable = None):
+        """Invalidate values of generational keys, and value of ``key`` if it is given. Called after writes."""
+        with self._lock:
+            self.generation += 1
+            if key is not None:
+                self.backend.delete((self.namespace, key))
+
+    def _count(self, hit: bool):
+        """Count a hit or a miss, counters are updated by threads of a server."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters."""
+        with self._lock:
+            hits, misses, generation = self.hits, self.misses, self.generation
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'generation': generation,
+        }
@@ -0,0 +1,153 @@
+"""Count strategies
+
+How a DAO counts rows of its table, ``COUNT(*)`` scans an index of the whole table on InnoDB.
+
+- exact: ``COUNT(*)`` on every call.
+- counter: a row of ``counter`` table, it is changed by DAO in the transaction of create and delete,
+  so it drifts if rows are written without DAO.
+- cached: ``COUNT(*)`` cached in process for ``BLOG_COUNT_CACHE_TTL`` seconds.
+- estimate: row count of table statistics, it may be off by a few percent.
+"""
+from typing import Dict, Optional, Type
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from project_template.config import settings
+from project_template.example_blog.cache import LRUCache, ReadThroughCache
+from project_template.example_blog.models import BaseModel, Counter
+
+
+def exact_count(session: Session, model: Type[BaseModel]) -> int:
+    """``SELECT COUNT(*)`` of table, without a subquery."""
+    return session.scalar(select(func.count()).select_from(model))
+
+
+class CountStrategy:
+    """Exact count, base of count strategies."""
+
+    def count(self, session: Session, model: Type[BaseModel]) -> int:
+        """Return number of rows of model."""
+        return exact_count(session, model)
+
+    def changed(self, session: Session, model: Type[BaseModel], delta: int):
+        """Called before a create or delete is committed, ``delta`` is the change of rows."""
+
+    async def count_async(self, session: AsyncSession, model: Type[BaseModel]) -> int:
+        """Return number of rows of model by an async session."""
+        return await session.run_sync(self.count, model)
+
+    async def changed_async(self, session: AsyncSession, model: Type[BaseModel], delta: int):
+        """Like ``changed``, by an async session."""
+        await session.run_sync(self.changed, model, delta)
+
+
+class CounterCount(CountStrategy):
+    """
+    Count kept in ``counter`` table.
+
+    The counter is changed with rows in the transaction of create and delete, so every writer of the table must
+    go through DAO, rows written otherwise, eg: by ``SqlLoader``, are not counted. Delete the counter row to
+    count the table again.
+    """
+
+    def count(self, session: Session, model: Type[BaseModel]) -> int:
+        value = session.scalar(select(Counter.value).where(Counter.name == model.__tablename__))
+        if value is not None:
+            return value
+        # Transaction of caller is not committed by a read.
+        with Session(bind=session.get_bind()) as counter_session:
+            return self.initialize(counter_session, model)
+
+    @staticmethod
+    def initialize(session: Session, model: Type[BaseModel]) -> int:
+        """Set counter of model to an exact count if it is unknown, and return it."""
+        name = model.__tablename__
+        # An unknown counter is created first, so creates and deletes committed after it wait for its lock.
+        session.add(Counter(name=name, value=None))
+        try:
+            session.commit()
+        except IntegrityError:
+            # It is created by a concurrent read.
+            session.rollback()
+        # No create or delete is committed between the count and the update while counter is locked.
+        value = session.scalar(select(Counter.value).where(Counter.name == name).with_for_update())
+        if value is None:
+            value = exact_count(session, model)
+            session.execute(update(Counter).where(Counter.name == name).values(value=value))
+        session.commit()
+        return value
+
+    def changed(self, session: Session, model: Type[BaseModel], delta: int):
+        # A missing or unknown counter is counted by next read, which counts the change too.
+        session.execute(
+            update(Counter).where(Counter.name == model.__tablename__).values(value=Counter.value + delta)
+        )
+
+
+class CachedCount(CountStrategy):
+    """Exact count cached for ``ttl`` seconds, concurrent misses are counted once."""
+
+    def __init__(self, ttl: float):
+        self.cache = ReadThroughCache(LRUCache(max_items=1024, ttl=ttl), 'count')
+
+    def count(self, session: Session, model: Type[BaseModel]) -> int:
+        return self.cache.get(model.__tablename__, lambda: exact_count(session, model))
+
+    async def count_async(self, session: AsyncSession, model: Type[BaseModel]) -> int:
+        # Waiters must not block event loop by locks of threads.
+        return await self.cache.get_async(model.__tablename__, lambda: session.run_sync(exact_count, model))
+
+
+class EstimatedCount(CountStrategy):
+    """
+    Row count of table statistics, exact count if there is no statistics.
+
+    MySQL: ``information_schema.TABLES``, PostgreSQL: ``pg_class``, SQLite: ``sqlite_stat1`` created by ``ANALYZE``.
+    """
+
+    def count(self, session: Session, model: Type[BaseModel]) -> int:
+        estimate = self.estimate(session, model.__tablename__)
+        return exact_count(session, model) if estimate is None else estimate
+
+    @staticmethod
+    def estimate(session: Session, table: str) -> Optional[int]:
+        """Estimated rows of table, None if it is unknown."""
+        dialect = session.get_bind().dialect.name
+        if dialect == 'mysql':
+            return session.scalar(
+                text('SELECT TABLE_ROWS FROM information_schema.TABLES '
+                     'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table'),
+                {'table': table},
+            )
+        if dialect == 'postgresql':
+            value = session.scalar(text('SELECT reltuples FROM pg_class WHERE relname = :table'), {'table': table})
+            # It is -1 before the table is analyzed.
+            return None if value is None or value < 0 else int(value)
+        if dialect == 'sqlite':
+            if session.scalar(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")) is None:
+                return None
+            stat = session.scalar(text('SELECT stat FROM sqlite_stat1 WHERE tbl = :table'), {'table': table})
+            return None if stat is None else int(stat.split()[0])
+        return None
+
+
+def create_count_strategy(name: str) -> CountStrategy:
+    """Create count strategy by name."""
+    if name == 'exact':
+        return CountStrategy()
+    if name == 'counter':
+        return CounterCount()
+    if name == 'cached':
+        return CachedCount(settings.BLOG_COUNT_CACHE_TTL)
+    if name == 'estimate':
+        return EstimatedCount()
+    raise ValueError(f'Unknown count strategy: {name}')
+
+
+def count_strategy_of(model: Type[BaseModel]) -> CountStrategy:
+    """Count strategy of model, by ``BLOG_COUNT_STRATEGIES`` of its table or ``BLOG_COUNT_STRATEGY``."""
+    strategies: Dict[str, str] = settings.BLOG_COUNT_STRATEGIES or {}
+    return create_count_strategy(strategies.get(model.__tablename__, settings.BLOG_COUNT_STRATEGY))
@@ -23,12 +23,16 @@ Todo:
       当新增模型时补充更多 DAO。
 """
 
-from typing import Generic, List, Optional
+from typing import Generic, List, Optional, Sequence, Tuple
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from project_template.example_blog.counts import count_strategy_of
 from project_template.example_blog.models import Article
+from project_template.example_blog.pagination import Cursor
 from project_template.example_blog.schemas import (
     CreateArticleSchema,
     CreateSchema,
@@ -38,6 +42,24 @@ from project_template.example_blog.schemas import (
 )
 
 
+def _page_statement(model: ModelType, cursor: Optional[Cursor], limit: int) -> Select:
+    """Select a page after cursor, and one more row which tells whether there is a next page."""
+    create_time, pk = model.create_time, model.id
+    statement = select(model)
+    if cursor is not None:
+        # Expanded form of `(create_time, id) > cursor`, which uses the index on every database.
+        statement = statement.where(or_(create_time > cursor[0], and_(create_time == cursor[0], pk > cursor[1])))
+    return statement.order_by(create_time, pk).limit(limit + 1)
+
+
+def _split_page(result: Sequence[ModelType], limit: int) -> Tuple[List[ModelType], Optional[Cursor]]:
+    """Rows of page, and cursor of next page if there is one more row."""
+    if len(result) <= limit:
+        return list(result), None
+    result = result[:limit]
+    return list(result), (result[-1].create_time, result[-1].id)
+
+
 class BaseDAO(Generic[ModelType, CreateSchema, UpdateSchema]):
     """Base Data Access Object.
        基础数据访问对象。
@@ -55,6 +77,9 @@ class BaseDAO(Generic[ModelType, CreateSchema, UpdateSchema]):
 
     model: ModelType
 
+    def __init__(self):
+        self.counts = count_strategy_of(self.model)
+
     def get(self, session: Session, offset: int = 0, limit: int = 10) -> List[ModelType]:
         """Return a list of model instances with pagination.
            使用分页返回模型实例列表。
@@ -72,6 +97,29 @@ class BaseDAO(Generic[ModelType, CreateSchema, UpdateSchema]):
         result = session.query(self.model).offset(offset).limit(limit).all()
         return result
 
+    def get_page(
+            self, session: Session, cursor: Optional[Cursor] = None, limit: int = 10,
+    ) -> Tuple[List[ModelType], Optional[Cursor]]:
+        """Return a page of model instances after cursor, ordered by ``(create_time, id)``.
+           返回游标之后的一页模型实例，按 ``(create_time, id)`` 排序。
+
+        The page is read from index of ``(create_time, id)``, so its cost does not grow with depth.
+        该页通过 ``(create_time, id)`` 索引读取，开销不随翻页深度增长。
+
+        Args:
+            session: Active SQLAlchemy session.
+                     活动的 SQLAlchemy 会话。
+            cursor: Sort key of the last instance of previous page, ``None`` for the first page.
+                    上一页最后一个实例的排序键，第一页为 ``None``。
+            limit: Maximum number of items to return. 返回的最大数量。
+
+        Returns:
+            Tuple[List[ModelType], Optional[Cursor]]: Instances of page, and cursor of next page
+                                                      which is ``None`` if it is the last page.
+                                                      该页实例，以及下一页游标，最后一页时为 ``None``。
+        """
+        return _split_page(session.scalars(_page_statement(self.model, cursor, limit)).all(), limit)
+
     def get_by_id(self, session: Session, pk: int) -> Optional[ModelType]:
         """Return a single model instance by primary key.
            通过主键返回单个模型实例。
@@ -104,6 +152,7 @@ class BaseDAO(Generic[ModelType, CreateSchema, UpdateSchema]):
         """
         obj = self.model(**jsonable_encoder(obj_in))
         session.add(obj)
+        self.counts.changed(session, self.model, 1)
         session.commit()
         session.refresh(obj)
         return obj
@@ -155,12 +204,16 @@ class BaseDAO(Generic[ModelType, CreateSchema, UpdateSchema]):
         if obj is None:
             raise ValueError(f"{getattr(self.model, '__name__', 'Model')} not found: {pk}")
         session.delete(obj)
+        self.counts.changed(session, self.model, -1)
         session.commit()
 
     def count(self, session: Session) -> int:
         """Return the total number of rows for the model.
            返回该模型的总记录数。
 
+        It is counted by the count strategy of model, see ``counts``.
+        由模型的计数策略统计，见 ``counts``。
+
         Args:
             session: Active SQLAlchemy session.
                      活动的 SQLAlchemy 会话。
@@ -169,7 +222,99 @@ class BaseDAO(Generic[ModelType, CreateSchema, UpdateSchema]):
             int: Total count of model instances.
                  模型实例总数。
         """
-        return session.query(self.model).count()
+        return self.counts.count(session, self.model)
+
+
+class AsyncBaseDAO(Generic[ModelType, CreateSchema, UpdateSchema]):
+    """Async Base Data Access Object.
+       异步基础数据访问对象。
+
+    Async version of ``BaseDAO`` on ``AsyncSession``, methods have the same
+    arguments and results.
+    ``BaseDAO`` 基于 ``AsyncSession`` 的异步版本，方法的参数与返回值相同。
+
+    Attributes:
+        model (ModelType): SQLAlchemy model class managed by the DAO.
+                           DAO 管理的 SQLAlchemy 模型类。
+    """
+
+    model: ModelType
+
+    def __init__(self):
+        self.counts = count_strategy_of(self.model)
+
+    async def get(self, session: AsyncSession, offset: int = 0, limit: int = 10) -> List[ModelType]:
+        """Return a list of model instances with pagination.
+           使用分页返回模型实例列表。
+        """
+        result = await session.scalars(select(self.model).offset(offset).limit(limit))
+        return list(result.all())
+
+    async def get_page(
+            self, session: AsyncSession, cursor: Optional[Cursor] = None, limit: int = 10,
+    ) -> Tuple[List[ModelType], Optional[Cursor]]:
+        """Return a page of model instances after cursor, and cursor of next page.
+           返回游标之后的一页模型实例，以及下一页游标。
+        """
+        result = await session.scalars(_page_statement(self.model, cursor, limit))
+        return _split_page(result.all(), limit)
+
+    async def get_by_id(self, session: AsyncSession, pk: int) -> Optional[ModelType]:
+        """Return a single model instance by primary key.
+           通过主键返回单个模型实例。
+        """
+        return await session.get(self.model, pk)
+
+    async def create(self, session: AsyncSession, obj_in: CreateSchema) -> ModelType:
+        """Create and persist a new model instance.
+           创建并持久化一个新的模型实例。
+        """
+        obj = self.model(**jsonable_encoder(obj_in))
+        session.add(obj)
+        await self.counts.changed_async(session, self.model, 1)
+        await session.commit()
+        await session.refresh(obj)
+        return obj
+
+    async def patch(self, session: AsyncSession, pk: int, obj_in: UpdateSchema) -> ModelType:
+        """Partially update fields of a model instance.
+           部分更新模型实例的字段。
+
+        Raises:
+            ValueError: If the target instance does not exist.
+                        当目标实例不存在时。
+        """
+        obj = await self.get_by_id(session, pk)
+        if obj is None:
+            raise ValueError(f"{getattr(self.model, '__name__', 'Model')} not found: {pk}")
+        update_data = obj_in.dict(exclude_unset=True)
+        for key, val in update_data.items():
+            setattr(obj, key, val)
+        session.add(obj)
+        await session.commit()
+        await session.refresh(obj)
+        return obj
+
+    async def delete(self, session: AsyncSession, pk: int) -> None:
+        """Delete a model instance by primary key.
+           通过主键删除模型实例。
+
+        Raises:
+            ValueError: If the target instance does not exist.
+                        当目标实例不存在时。
+        """
+        obj = await self.get_by_id(session, pk)
+        if obj is None:
+            raise ValueError(f"{getattr(self.model, '__name__', 'Model')} not found: {pk}")
+        await session.delete(obj)
+        await self.counts.changed_async(session, self.model, -1)
+        await session.commit()
+
+    async def count(self, session: AsyncSession) -> int:
+        """Return the total number of rows for the model by its count strategy.
+           按模型的计数策略返回该模型的总记录数。
+        """
+        return await self.counts.count_async(session, self.model)
 
 
 class ArticleDAO(BaseDAO[Article, CreateArticleSchema, UpdateArticleSchema]):
@@ -180,4 +325,12 @@ class ArticleDAO(BaseDAO[Article, CreateArticleSchema, UpdateArticleSchema]):
     继承自 ``BaseDAO`` 的 CRUD 操作。
     """
 
-    model = Article
\ No newline at end of file
+    model = Article
+
+
+class AsyncArticleDAO(AsyncBaseDAO[Article, CreateArticleSchema, UpdateArticleSchema]):
+    """Async DAO implementation for the ``Article`` model.
+       ``Article`` 模型的异步数据访问对象实现。
+    """
+
+    model = Article
@@ -1,4 +1,5 @@
 """Database connections"""
+from functools import lru_cache
 
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine.base import Engine
@@ -7,18 +8,48 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 
 from project_template.config import settings
 
-url = URL(
+# Async drivers of databases, `DATABASE.ASYNC_DRIVER` is used if it is set.
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+url = URL.create(
     drivername=settings.DATABASE.DRIVER,
     username=settings.DATABASE.get('USERNAME', None),
     password=settings.DATABASE.get('PASSWORD', None),
     host=settings.DATABASE.get('HOST', None),
     port=settings.DATABASE.get('PORT', None),
     database=settings.DATABASE.get('NAME', None),
-    query=settings.DATABASE.get('QUERY', None),
+    query=settings.DATABASE.get('QUERY', None) or {},
 )
 
-engine: Engine = create_engine(url, echo=True)
+engine: Engine = create_engine(url, echo=settings.DATABASE.get('ECHO', True))
 
 SessionFactory = sessionmaker(bind=engine, autocommit=False, autoflush=True)
 
-ScopedSession = scoped_session(SessionFactory)
\ No newline at end of file
+ScopedSession = scoped_session(SessionFactory)
+
+
+def async_url(sync_url: URL) -> URL:
+    """URL of async driver of database."""
+    backend = sync_url.get_backend_name()
+    drivername = settings.DATABASE.get('ASYNC_DRIVER', None) or ASYNC_DRIVERS.get(backend)
+    if drivername is None:
+        raise ValueError(f'No async driver of database {backend}, set it by DATABASE.ASYNC_DRIVER')
+    return sync_url.set(drivername=drivername)
+
+
+@lru_cache(maxsize=None)
+def get_async_session_factory():
+    """
+    Session factory of async engine, it is created on first use, so async driver is only needed by async views.
+
+    Objects are not expired on commit, attributes can not be loaded lazily without awaiting.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(async_url(url), echo=settings.DATABASE.get('ECHO', True))
+    return async_sessionmaker(bind=async_engine, autoflush=True, expire_on_commit=False)
@@ -1,4 +1,7 @@
+from typing import AsyncIterator
+
 from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -6,6 +9,15 @@ def get_db(request: Request) -> Session:
     return request.state.db
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async session of a request, it is closed when response is sent."""
+    # pylint: disable=import-outside-toplevel
+    from project_template.example_blog.db import get_async_session_factory
+
+    async with get_async_session_factory()() as session:
+        yield session
+
+
 class CommonQueryParams:
     def __init__(self, offset: int = 1, limit: int = 10):
         self.offset = offset - 1
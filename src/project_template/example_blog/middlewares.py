@@ -2,6 +2,7 @@ from typing import Callable
 
 from fastapi import FastAPI, Request, Response
 
+from project_template.config import settings
 from project_template.example_blog.db import SessionFactory
 
 
@@ -17,4 +18,6 @@ async def db_session_middleware(request: Request, call_next: Callable) -> Respon
 
 
 def init_middleware(app: FastAPI) -> None:
-    app.middleware('http')(db_session_middleware)
\ No newline at end of file
+    # Async views get async sessions by dependency.
+    if not settings.BLOG_DB_ASYNC:
+        app.middleware('http')(db_session_middleware)
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
 
 
@@ -26,7 +26,20 @@ BaseModel = declarative_base(cls=CustomBase)
 
 class Article(BaseModel):
     """Article table"""
+    # Index of keyset pagination, it is ordered by `(create_time, id)`.
+    __table_args__ = (
+        Index('ix_article_create_time_id', 'create_time', 'id'),
+        CustomBase.__table_args__,
+    )
+
     title = Column(String(500))
     body = Column(Text(), nullable=True)
     create_time = Column(DateTime, default=datetime.now, nullable=False)
-    update_time = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
\ No newline at end of file
+    update_time = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+
+
+class Counter(BaseModel):
+    """Row counts of tables, kept by DAOs whose count strategy is `counter`"""
+    name = Column(String(64), unique=True, nullable=False)
+    # NULL until the table is counted.
+    value = Column(BigInteger, nullable=True)
@@ -0,0 +1,29 @@
+"""Keyset pagination
+
+A cursor is the sort key of the last row of a page, ``(create_time, id)``, encoded as an opaque token.
+The next page is the rows after it, so a deep page is read from an index without skipping earlier rows.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Encode cursor as URL safe base64 of JSON."""
+    create_time, pk = cursor
+    data = json.dumps([create_time.isoformat(), pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode cursor token, raise ValueError if it is invalid."""
+    try:
+        data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        create_time, pk = json.loads(data)
+        return datetime.fromisoformat(create_time), int(pk)
+    except (binascii.Error, TypeError, UnicodeDecodeError, ValueError) as ex:
+        raise ValueError(f'Invalid cursor: {token}') from ex
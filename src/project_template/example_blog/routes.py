@@ -1,7 +1,7 @@
 from fastapi import APIRouter, FastAPI
 from fastapi.responses import RedirectResponse
 
-from project_template.example_blog import views
+from project_template.config import settings
 
 # 添加根路径路由
 def root_router():
@@ -14,6 +14,11 @@ def root_router():
     return router
     
 def router_v1():
+    # Async views use async engine, sync views run in threadpool with sessions of sync engine.
+    if settings.BLOG_DB_ASYNC:
+        from project_template.example_blog import async_views as views  # pylint: disable=import-outside-toplevel
+    else:
+        from project_template.example_blog import views  # pylint: disable=import-outside-toplevel
     router = APIRouter()
     router.include_router(views.router, tags=['Article'])
     return router
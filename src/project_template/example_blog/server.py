@@ -1,4 +1,6 @@
 """server"""
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
@@ -6,7 +8,15 @@ from project_template.example_blog import middlewares, routes
 from project_template.config import settings
 from project_template.log import init_log
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Init log when app starts, in every process which serves it, eg: a reloaded child of uvicorn."""
+    init_log()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 # 在模块级别初始化中间件和路由
 middlewares.init_middleware(app)
 routes.init_routers(app)
@@ -1,39 +1,180 @@
 """Service"""
-from typing import Generic, List
+from typing import Any, Dict, Generic, List, Optional, Tuple, Union
 
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from project_template.example_blog.dao import ArticleDAO, BaseDAO
+from project_template.config import settings
+from project_template.example_blog.cache import LRUCache, ReadThroughCache
+from project_template.example_blog.dao import ArticleDAO, AsyncArticleDAO, AsyncBaseDAO, BaseDAO
 from project_template.example_blog.models import Article
+from project_template.example_blog.pagination import Cursor
 from project_template.example_blog.schemas import CreateSchema, ModelType, UpdateSchema
 
 
-class BaseService(Generic[ModelType, CreateSchema, UpdateSchema]):
+def create_cache(namespace: str) -> Optional[ReadThroughCache]:
+    """Create cache of a service by settings, None if cache is disabled."""
+    if not settings.BLOG_CACHE_ENABLED:
+        return None
+    return ReadThroughCache(LRUCache(settings.BLOG_CACHE_MAX_ITEMS, settings.BLOG_CACHE_TTL), namespace)
+
+
+class CachedService:
+    """
+    Cache of a service
+
+    Reads are cached as column values, so a cached object is not bound to the session which loaded it.
+    Writes invalidate cache.
+    """
+    dao: Union[BaseDAO, AsyncBaseDAO]
+
+    def __init__(self, cache: Optional[ReadThroughCache] = None):
+        self.cache = cache if cache is not None else create_cache(self.dao.model.__tablename__)
+
+    def _dump(self, obj: Optional[ModelType]) -> Optional[Dict[str, Any]]:
+        """Column values of a model instance."""
+        if obj is None:
+            return None
+        return {attr.key: getattr(obj, attr.key) for attr in inspect(self.dao.model).column_attrs}
+
+    def _restore(self, data: Optional[Dict[str, Any]]) -> Optional[ModelType]:
+        """A new model instance of cached column values."""
+        return None if data is None else self.dao.model(**data)
+
+    def _invalidate(self, pk: Optional[int] = None):
+        """Invalidate cache after a write, and cached object of pk if it is given, a miss of pk is cached too."""
+        if self.cache is not None:
+            self.cache.invalidate(None if pk is None else ('id', pk))
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit and miss counters of cache, empty if cache is disabled."""
+        return {} if self.cache is None else self.cache.stats()
+
+
+class BaseService(CachedService, Generic[ModelType, CreateSchema, UpdateSchema]):
     dao: BaseDAO
 
     def get(self, session: Session, offset=0, limit=10) -> List[ModelType]:
         """"""
-        return self.dao.get(session, offset=offset, limit=limit)
+        if self.cache is None:
+            return self.dao.get(session, offset=offset, limit=limit)
+        rows = self.cache.get_generational(
+            ('get', offset, limit),
+            lambda: [self._dump(obj) for obj in self.dao.get(session, offset=offset, limit=limit)],
+        )
+        return [self._restore(data) for data in rows]
+
+    def get_page(
+            self, session: Session, cursor: Optional[Cursor] = None, limit=10,
+    ) -> Tuple[List[ModelType], Optional[Cursor]]:
+        """Get a page after cursor, and cursor of next page"""
+        if self.cache is None:
+            return self.dao.get_page(session, cursor=cursor, limit=limit)
+
+        def load():
+            objs, next_cursor = self.dao.get_page(session, cursor=cursor, limit=limit)
+            return [self._dump(obj) for obj in objs], next_cursor
+
+        rows, next_cursor = self.cache.get_generational(('page', cursor, limit), load)
+        return [self._restore(data) for data in rows], next_cursor
 
     def total(self, session: Session) -> int:
         return self.dao.count(session)
 
     def get_by_id(self, session: Session, pk: int) -> ModelType:
         """Get by id"""
-        return self.dao.get_by_id(session, pk)
+        if self.cache is None:
+            return self.dao.get_by_id(session, pk)
+        return self._restore(self.cache.get(('id', pk), lambda: self._dump(self.dao.get_by_id(session, pk))))
 
     def create(self, session: Session, obj_in: CreateSchema) -> ModelType:
         """Create a object"""
-        return self.dao.create(session, obj_in)
+        obj = self.dao.create(session, obj_in)
+        self._invalidate(obj.id)
+        return obj
 
     def patch(self, session: Session, pk: int, obj_in: UpdateSchema) -> ModelType:
         """Update"""
-        return self.dao.patch(session, pk, obj_in)
+        try:
+            return self.dao.patch(session, pk, obj_in)
+        finally:
+            self._invalidate(pk)
 
     def delete(self, session: Session, pk: int) -> None:
         """Delete a object"""
-        return self.dao.delete(session, pk)
+        try:
+            return self.dao.delete(session, pk)
+        finally:
+            self._invalidate(pk)
+
+
+class AsyncBaseService(CachedService, Generic[ModelType, CreateSchema, UpdateSchema]):
+    """Async version of `BaseService`, concurrent misses of cache wait in event loop."""
+    dao: AsyncBaseDAO
+
+    async def get(self, session: AsyncSession, offset=0, limit=10) -> List[ModelType]:
+        """Get a page by offset"""
+        if self.cache is None:
+            return await self.dao.get(session, offset=offset, limit=limit)
+
+        async def load():
+            return [self._dump(obj) for obj in await self.dao.get(session, offset=offset, limit=limit)]
+
+        rows = await self.cache.get_generational_async(('get', offset, limit), load)
+        return [self._restore(data) for data in rows]
+
+    async def get_page(
+            self, session: AsyncSession, cursor: Optional[Cursor] = None, limit=10,
+    ) -> Tuple[List[ModelType], Optional[Cursor]]:
+        """Get a page after cursor, and cursor of next page"""
+        if self.cache is None:
+            return await self.dao.get_page(session, cursor=cursor, limit=limit)
+
+        async def load():
+            objs, next_cursor = await self.dao.get_page(session, cursor=cursor, limit=limit)
+            return [self._dump(obj) for obj in objs], next_cursor
+
+        rows, next_cursor = await self.cache.get_generational_async(('page', cursor, limit), load)
+        return [self._restore(data) for data in rows], next_cursor
+
+    async def total(self, session: AsyncSession) -> int:
+        return await self.dao.count(session)
+
+    async def get_by_id(self, session: AsyncSession, pk: int) -> ModelType:
+        """Get by id"""
+        if self.cache is None:
+            return await self.dao.get_by_id(session, pk)
+
+        async def load():
+            return self._dump(await self.dao.get_by_id(session, pk))
+
+        return self._restore(await self.cache.get_async(('id', pk), load))
+
+    async def create(self, session: AsyncSession, obj_in: CreateSchema) -> ModelType:
+        """Create a object"""
+        obj = await self.dao.create(session, obj_in)
+        self._invalidate(obj.id)
+        return obj
+
+    async def patch(self, session: AsyncSession, pk: int, obj_in: UpdateSchema) -> ModelType:
+        """Update"""
+        try:
+            return await self.dao.patch(session, pk, obj_in)
+        finally:
+            self._invalidate(pk)
+
+    async def delete(self, session: AsyncSession, pk: int) -> None:
+        """Delete a object"""
+        try:
+            return await self.dao.delete(session, pk)
+        finally:
+            self._invalidate(pk)
 
 
 class ArticleService(BaseService[Article, CreateSchema, UpdateSchema]):
-    dao = ArticleDAO()
\ No newline at end of file
+    dao = ArticleDAO()
+
+
+class AsyncArticleService(AsyncBaseService[Article, CreateSchema, UpdateSchema]):
+    dao = AsyncArticleDAO()
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from project_template.example_blog.dependencies import CommonQueryParams, get_db
+from project_template.example_blog.pagination import decode_cursor, encode_cursor
 from project_template.example_blog.schemas import (ArticleSchema, CreateArticleSchema,
                                   UpdateArticleSchema)
 from project_template.example_blog.services import ArticleService
@@ -16,12 +19,35 @@ async def health_check():
     return {"status": "healthy", "message": "Server is running!"}
 
 
+@router.get('/articles/cache/stats')
+async def cache_stats():
+    return _service.cache_stats()
+
+
 @router.get('/articles')
 def get(
+        response: Response,
         session: Session = Depends(get_db),
-        commons: CommonQueryParams = Depends()
+        commons: CommonQueryParams = Depends(),
+        cursor: Optional[str] = None,
 ):
-    return _service.get(session, offset=commons.offset, limit=commons.limit)
+    """
+    List articles by page number, or after `cursor` if it is given, an empty cursor is the first page.
+
+    Cursor of next page is returned in `X-Next-Cursor` header, it is absent on the last page.
+    Number of articles is returned in `X-Total-Count` header, it is counted by count strategy of article.
+    """
+    response.headers['X-Total-Count'] = str(_service.total(session))
+    if cursor is None:
+        return _service.get(session, offset=commons.offset, limit=commons.limit)
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    articles, next_cursor = _service.get_page(session, cursor=after, limit=commons.limit)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = encode_cursor(next_cursor)
+    return articles
 
 
 @router.get('/articles/{pk}')
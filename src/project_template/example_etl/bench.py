@@ -0,0 +1,208 @@
+"""
+Benchmark
+
+Run the pipeline with every combination of registered plugins on synthetic input, and report throughput and memory.
+"""
+import itertools
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from project_template import __version__
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+_ALPHABET = string.ascii_letters + string.digits + '     '
+
+
+def line_lengths(distribution: str, mean: int, rng: random.Random) -> Iterator[int]:
+    """Yield lengths of lines, `uniform` is in [0, 2 * mean], `normal` has a standard deviation of mean / 2."""
+    if distribution == 'fixed':
+        return itertools.repeat(mean)
+    if distribution == 'uniform':
+        return (rng.randint(0, 2 * mean) for _ in itertools.count())
+    if distribution == 'normal':
+        return (max(0, round(rng.gauss(mean, mean / 2))) for _ in itertools.count())
+    raise ValueError(f'Unknown line length distribution: {distribution}')
+
+
+def generate_input(path: Path, size: int, line_length: int, distribution: str = 'uniform', seed: int = 0) -> int:
+    """
+    Write about `size` bytes of random lines to path, return number of lines.
+
+    Lines have padding spaces, and some are blank, so transformers have work to do. Same seed writes same file.
+    """
+    rng = random.Random(seed)
+    written = lines = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        for length in line_lengths(distribution, line_length, rng):
+            if written >= size:
+                break
+            line = ' ' + ''.join(rng.choices(_ALPHABET, k=length)) + ' \n'
+            file.write(line)
+            written += len(line)
+            lines += 1
+    return lines
+
+
+def prepare_database(url: str, path: Optional[Path]):
+    """Create blog tables in benchmark database, and insert lines of input file to article table if path is given."""
+    from sqlalchemy import create_engine  # pylint: disable=import-outside-toplevel
+
+    from project_template.example_blog.models import Article, BaseModel  # pylint: disable=import-outside-toplevel
+
+    engine = create_engine(url)
+    try:
+        BaseModel.metadata.drop_all(engine)
+        BaseModel.metadata.create_all(engine)
+        if path is None:
+            return
+        with open(path, 'r', encoding='utf-8') as file, engine.begin() as connection:
+            insert = Article.__table__.insert()
+            while batch := [{'title': line.rstrip('\n')} for line in itertools.islice(file, 10000)]:
+                connection.execute(insert, batch)
+    finally:
+        engine.dispose()
+
+
+def run_case(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Run pipeline with settings overrides in a fresh process, return metrics of stages and peak RSS."""
+    from project_template.config import settings  # pylint: disable=import-outside-toplevel
+    from project_template.manage import Manage  # pylint: disable=import-outside-toplevel
+
+    for name, value in overrides.items():
+        settings.set(name, value)
+    manage = Manage()
+    start = time.perf_counter()
+    manage.run()
+    elapsed = time.perf_counter() - start
+    # `ru_maxrss` is KB on Linux, pool workers are children of this process.
+    rss = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    return {
+        'seconds': round(elapsed, 6),
+        'peak_rss_mb': round(rss / 1024, 2),
+        'stages': manage.metrics.summary(),
+    }
+
+
+class Bench:
+    """
+    Benchmark of ETL plugins.
+
+    Every combination runs in a new process, so peak RSS of one does not hide another.
+    A failing combination is recorded with its error, and others go on.
+    """
+
+    def __init__(
+            self,
+            workdir: Path,
+            size: int,
+            line_length: int,
+            distribution: str = 'uniform',
+            seed: int = 0,
+            workers: int = 1,
+            batch_size: int = 1000,
+    ):
+        self.workdir = Path(workdir)
+        self.size = size
+        self.line_length = line_length
+        self.distribution = distribution
+        self.seed = seed
+        self.workers = workers
+        self.batch_size = batch_size
+        self.input_path = self.workdir / 'input.txt'
+        # SQL extractor and loader use different databases, so a loader never writes to table being extracted.
+        self.source_url = f'sqlite:///{self.workdir / "source.db"}'
+        self.target_url = f'sqlite:///{self.workdir / "target.db"}'
+        self.lines = 0
+
+    def prepare(self, extractors: List[str]):
+        """Generate input file, and databases of SQL plugins."""
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        self.lines = generate_input(self.input_path, self.size, self.line_length, self.distribution, self.seed)
+        prepare_database(self.source_url, self.input_path if 'sql' in extractors else None)
+        prepare_database(self.target_url, None)
+        logger.info('Generate %d lines of %d bytes to %s', self.lines, self.size, self.input_path)
+
+    def overrides(self, extractor: str, transformer: str, loader: str) -> Dict[str, Any]:
+        """Settings of a combination, all outputs are in workdir."""
+        name = f'{extractor}-{transformer}-{loader}'
+        return {
+            'EXTRACTOR_NAME': extractor,
+            'TRANSFORMER_NAME': transformer,
+            'LOADER_NAME': loader,
+            'WORKERS': self.workers,
+            'BATCH_SIZE': self.batch_size,
+            'RESUME': False,
+            'INCREMENTAL': False,
+            'METRICS_INTERVAL': 0,
+            'CHECKPOINT_PATH': str(self.workdir / f'{name}.checkpoint.json'),
+            'FILE_EXTRACTOR_PATH': str(self.input_path),
+            'FILE_LOADER_PATH': str(self.workdir / f'{name}.txt'),
+            'SHARD_LOADER_PATH': str(self.workdir / f'{name}-{{shard}}.txt'),
+            'SQL_EXTRACTOR_URL': self.source_url,
+            'SQL_LOADER_URL': self.target_url,
+        }
+
+    def run(self, extractors: List[str], transformers: List[str], loaders: List[str]) -> Dict[str, Any]:
+        """Run all combinations, return report."""
+        self.prepare(extractors)
+        cases = [
+            self.run_one(extractor, transformer, loader)
+            for extractor, transformer, loader in itertools.product(extractors, transformers, loaders)
+        ]
+        return {
+            'version': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': datetime.now().isoformat(),
+            'input': {
+                'size': self.size,
+                'lines': self.lines,
+                'line_length': self.line_length,
+                'distribution': self.distribution,
+                'seed': self.seed,
+            },
+            'workers': self.workers,
+            'batch_size': self.batch_size,
+            'cases': cases,
+        }
+
+    def run_one(self, extractor: str, transformer: str, loader: str) -> Dict[str, Any]:
+        """Run a combination in a new process, `spawn` process has nothing allocated by this process."""
+        case: Dict[str, Any] = {'extractor': extractor, 'transformer': transformer, 'loader': loader}
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                result = executor.submit(run_case, self.overrides(extractor, transformer, loader)).result()
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning('Benchmark %s failed: %r', case, ex)
+            case['error'] = repr(ex)
+            return case
+
+        seconds = result['seconds'] or 1e-9
+        extracted = result['stages'][0]
+        case.update(
+            records=extracted['records'],
+            records_per_second=round(extracted['records'] / seconds, 2),
+            mb_per_second=round(self.size / seconds / 1024 / 1024, 4),
+            **result,
+        )
+        logger.info(
+            'Benchmark %s-%s-%s: %.2f records/s, %.4f MB/s, peak RSS %.2f MB',
+            extractor, transformer, loader, case['records_per_second'], case['mb_per_second'], case['peak_rss_mb'],
+        )
+        return case
+
+
+def save_report(report: Dict[str, Any], path: Path):
+    """Dump report to json file, reports of different versions can be compared."""
+    Path(path).write_text(json.dumps(report, indent=2), encoding='utf-8')
@@ -0,0 +1,73 @@
+"""
+Checkpoint
+
+Record extractor and loader positions in a small local state file, so a run can be resumed.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from project_template.exceptions import ProjectError
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class Checkpoint:
+    """
+    Checkpoint state file.
+
+    State is a json object: `{"extractor": position, "loader": position, "completed": bool, "time": str}`,
+    with `extractor_id` and `loader_id` of data which positions belong to, if they are bound.
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self._saved_at = time.monotonic()
+        self.ids: Dict[str, Optional[str]] = {}
+
+    def bind(self, extractor_id: Optional[str], loader_id: Optional[str]):
+        """Save identities of extractor and loader data in state, eg: their paths, None is not checked."""
+        self.ids = {'extractor_id': extractor_id, 'loader_id': loader_id}
+
+    def verify(self, state: dict):
+        """Raise ProjectError if state is saved for other data than bound identities."""
+        for name, value in self.ids.items():
+            saved = state.get(name)
+            if value is not None and saved is not None and saved != value:
+                raise ProjectError(f'Checkpoint {self.path} is saved for {saved}, not {value}. '
+                                   'Run without --resume and --incremental, or use another CHECKPOINT_PATH.')
+
+    def load(self) -> Optional[dict]:
+        """Load last state, None if there is no checkpoint."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return None
+        logger.info('Load checkpoint from %s: %s', self.path, state)
+        return state
+
+    def due(self) -> bool:
+        """Whether `interval` seconds passed since last save."""
+        return time.monotonic() - self._saved_at >= self.interval
+
+    def save(self, extractor_position: Any, loader_position: Any, completed: bool = False):
+        """Save state, the file is replaced atomically so it is never half written."""
+        state = {
+            'extractor': extractor_position,
+            'loader': loader_position,
+            'completed': completed,
+            'time': datetime.now().isoformat(),
+            **self.ids,
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.path)
+        self._saved_at = time.monotonic()
+        logger.debug('Save checkpoint: %s', state)
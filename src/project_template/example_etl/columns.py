@@ -0,0 +1,80 @@
+"""
+Column batch
+
+A batch of records stored as one list per field, so transformers can process a whole column at once.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+class ColumnBatch:
+    """
+    Columns of a batch of records.
+
+    All columns have the same length, it is the number of records.
+    It is iterated as dict records, so per-record plugins get dicts, eg: dedup of CSV records.
+    """
+    __slots__ = ('columns', 'length')
+
+    def __init__(self, columns: Dict[str, List[Any]], length: Optional[int] = None):
+        self.columns = columns
+        self.length = len(next(iter(columns.values()), ())) if length is None else length
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> 'ColumnBatch':
+        """Create batch from dict records, fields of the first record are used if `fields` is not given."""
+        if fields is None:
+            fields = list(rows[0]) if rows else []
+        return cls({field: [row.get(field) for row in rows] for field in fields}, len(rows))
+
+    @property
+    def fields(self) -> List[str]:
+        """Field names."""
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, field: str) -> List[Any]:
+        return self.columns[field]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.rows()
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ColumnBatch) and self.columns == other.columns
+
+    def __repr__(self) -> str:
+        return f'ColumnBatch({self.columns!r})'
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield records as dicts."""
+        fields = self.fields
+        for values in zip(*self.columns.values()):
+            yield dict(zip(fields, values))
+
+    def select(self, fields: Sequence[str]) -> 'ColumnBatch':
+        """Batch of some fields, missing fields are filled with None."""
+        return ColumnBatch(
+            {field: self.columns[field] if field in self.columns else [None] * self.length for field in fields},
+            self.length,
+        )
+
+    def filter(self, mask: Sequence[bool]) -> 'ColumnBatch':
+        """Batch of records whose mask is true."""
+        if all(mask):
+            return self
+        return ColumnBatch(
+            {field: [value for value, keep in zip(column, mask) if keep] for field, column in self.columns.items()},
+            sum(map(bool, mask)),
+        )
+
+
+def as_columns(batch: Any) -> ColumnBatch:
+    """Convert a batch of dict records to columns, column batch is returned as it is."""
+    if isinstance(batch, ColumnBatch):
+        return batch
+    if not batch:
+        return ColumnBatch({}, 0)
+    if isinstance(batch[0], dict):
+        return ColumnBatch.from_rows(batch)
+    raise TypeError(f'Columnar plugin needs a column batch or dict records, got {type(batch[0]).__name__}')
@@ -0,0 +1,170 @@
+"""
+Compression
+
+Open gzip, bz2 and xz files as streams, optionally compress or decompress them in a background thread,
+so it overlaps with transformation.
+"""
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import threading
+from typing import BinaryIO, Optional
+
+from project_template.exceptions import ProjectError
+
+COMPRESSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+}
+
+# Size of data read from a compressed stream at once by background thread.
+CHUNK_SIZE = 1024 * 1024
+# Max chunks waiting between background thread and current thread.
+QUEUE_SIZE = 16
+
+
+def detect_compression(path: str, compression: Optional[str] = 'auto') -> Optional[str]:
+    """
+    Return compression of file: gzip, bz2, xz, or None if it is not compressed.
+
+    `compression` is `auto` to detect compression from file extension, `none`, or a compression name.
+    """
+    if compression in (None, 'none'):
+        return None
+    if compression == 'auto':
+        return COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+    if compression not in COMPRESSIONS.values():
+        raise ProjectError(f'Unsupported compression "{compression}", use one of {list(COMPRESSIONS.values())}')
+    return compression
+
+
+def open_compressed(path: str, mode: str, compression: str, level: int = 6) -> BinaryIO:
+    """Open a compressed file in binary `mode`. Level is used to write file."""
+    writing = 'r' not in mode
+    if compression == 'gzip':
+        return gzip.open(path, mode, compresslevel=level) if writing else gzip.open(path, mode)
+    if compression == 'bz2':
+        return bz2.open(path, mode, compresslevel=level) if writing else bz2.open(path, mode)
+    if compression == 'xz':
+        return lzma.open(path, mode, preset=level) if writing else lzma.open(path, mode)
+    raise ProjectError(f'Unsupported compression "{compression}"')
+
+
+class ThreadedReader(io.RawIOBase):
+    """
+    Read a stream in a background thread.
+
+    Wrap it by `io.BufferedReader` to read lines. `tell` returns position in stream.
+    """
+
+    def __init__(self, stream: BinaryIO, position: int = 0):
+        super().__init__()
+        self.stream = stream
+        self._position = position
+        self._chunk = memoryview(b'')
+        self._queue: queue.Queue = queue.Queue(QUEUE_SIZE)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._read, name='compression-reader', daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        """Read chunks in background thread until EOF, exception is passed to reader."""
+        try:
+            while not self._stopped.is_set():
+                chunk = self.stream.read(CHUNK_SIZE)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except Exception as e:  # pylint: disable=broad-except
+            self._put(e)
+
+    def _put(self, item):
+        """Put an item to queue, give up if reader is closed."""
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._chunk:
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if not item:
+                # Keep EOF for following reads.
+                self._queue.put(item)
+                return 0
+            self._chunk = memoryview(item)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        self._position += size
+        return size
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._stopped.set()
+            self._thread.join()
+            self.stream.close()
+        super().close()
+
+
+class ThreadedWriter(io.RawIOBase):
+    """
+    Write a stream in a background thread.
+
+    Wrap it by `io.BufferedWriter` to write small data. Exception of background thread is raised by next write.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__()
+        self.stream = stream
+        self._error: Optional[Exception] = None
+        self._queue: queue.Queue = queue.Queue(QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._write, name='compression-writer', daemon=True)
+        self._thread.start()
+
+    def _write(self):
+        """Write chunks in background thread until None."""
+        while (chunk := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    self.stream.write(chunk)
+                except Exception as e:  # pylint: disable=broad-except
+                    self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._raise_error()
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            self.stream.close()
+            super().close()
+            self._raise_error()
+        super().close()
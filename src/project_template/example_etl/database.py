@@ -0,0 +1,36 @@
+"""
+Database
+
+Engine and tables shared by SQL extractor and loader.
+"""
+from typing import Tuple
+
+from sqlalchemy import MetaData, Table, create_engine
+from sqlalchemy.engine import Engine, make_url
+
+
+def get_engine(url: str) -> Tuple[Engine, bool]:
+    """
+    Create engine of url, or reuse engine of blog database if url is empty.
+
+    Return engine, and whether it is created and should be disposed by caller.
+    """
+    if url:
+        return create_engine(url), True
+    # Blog database is imported only when it is used.
+    from project_template.example_blog.db import engine  # pylint: disable=import-outside-toplevel
+    return engine, False
+
+
+def database_id(url: str) -> str:
+    """Url without password to identify a database in checkpoint, `blog` for the blog database."""
+    return make_url(url).render_as_string() if url else 'blog'
+
+
+def get_table(name: str, engine: Engine) -> Table:
+    """Use table of blog models to keep Python side column defaults, or reflect it from database."""
+    from project_template.example_blog.models import BaseModel  # pylint: disable=import-outside-toplevel
+    table = BaseModel.metadata.tables.get(name)
+    if table is None:
+        table = Table(name, MetaData(), autoload_with=engine)
+    return table
@@ -1,9 +1,16 @@
 """Base extractor."""
-from typing import Iterable
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
 
 class BaseExtractor:
-    """Base extractor"""
+    """
+    Base extractor
+
+    A streaming extractor waits for new data instead of stopping at the end of data,
+    its batches should be loaded as soon as they are extracted.
+    """
+    streaming = False
 
     def __init__(self, settings):
         self.settings = settings
@@ -16,6 +23,64 @@ class BaseExtractor:
         """Extract data."""
         raise NotImplementedError()
 
+    def extract_batches(self, batch_size: int) -> Iterable[List[str]]:
+        """
+        Extract data as lists of at most `batch_size` records.
+
+        Per-record extractors are grouped automatically, override it to read batches natively.
+        """
+        iterator = iter(self.extract())
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def tell(self) -> Optional[Any]:
+        """
+        Return position after the last extracted batch, it is used as a checkpoint.
+
+        Return None if extractor can not resume from a position, or it is not at a resumable point now.
+        """
+        return None
+
+    def seek(self, position: Any):
+        """Extract data after `position` returned by `tell`."""
+        raise NotImplementedError()
+
+    @classmethod
+    def checkpoint_id(cls, settings) -> Optional[str]:
+        """
+        Return identity of data extracted by settings, eg: path of file, it is saved in checkpoint with position.
+
+        A checkpoint of other data is not continued. Return None if it is not checked.
+        """
+        return None
+
+    def splits(self) -> List[Any]:
+        """
+        Split data to parts which can be extracted independently, eg: by parallel workers.
+
+        Return an empty list if extractor can not be split.
+        """
+        return []
+
+    def extract_split(self, split: Any, batch_size: int) -> Iterable[List[str]]:
+        """Extract a part of data returned by `splits` as batches."""
+        raise NotImplementedError()
+
+    def split_position(self, split: Any) -> Optional[Any]:
+        """Return position after `split`, like `tell`."""
+        return None
+
+    def split_settings(self, split: Any) -> Dict[str, Any]:
+        """
+        Return settings which make a new extractor extract only `split`, eg: to run a pipeline per input.
+
+        Raise NotImplementedError if splits can not be extracted by settings.
+        """
+        raise NotImplementedError()
+
     def close(self):
         """Close something."""
 
@@ -24,4 +89,44 @@ class BaseExtractor:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
-        
\ No newline at end of file
+
+
+class AsyncBaseExtractor:
+    """
+    Async base extractor
+
+    Used by async manage, for extractors which spend most of time waiting on I/O.
+    A streaming extractor waits for new data, like `streaming` of sync extractor.
+    """
+    streaming = False
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    async def setup(self):
+        """Setup something when enter extractor"""
+
+    def extract(self) -> AsyncIterator[str]:
+        """Extract data, it should be implemented by an async generator."""
+        raise NotImplementedError()
+
+    async def extract_batches(self, batch_size: int) -> AsyncIterator[List[str]]:
+        """Extract data as lists of at most `batch_size` records."""
+        batch = []
+        async for data in self.extract():
+            batch.append(data)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def close(self):
+        """Close something."""
+
+    async def __aenter__(self):
+        await self.setup()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -3,22 +3,299 @@ File extractor
 
 extract data from file.
 """
-from typing import Iterable
+import glob
+import io
+import mmap
+import os
+import time
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from project_template.log import get_logger
 from project_template.constants import DEFAULT_ENCODING
+from project_template.example_etl.compression import CHUNK_SIZE, ThreadedReader, detect_compression, open_compressed
 from project_template.example_etl.extractor.base import BaseExtractor
+from project_template.exceptions import ProjectError
 
 logger = get_logger(__name__)
 
 
+def split_ranges(path: str, range_size: int, start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Split file after `start` to byte ranges of about `range_size` bytes.
+
+    Every range ends after a newline, or at the end of file, so ranges can be decoded on their own.
+    """
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size <= start:
+            return []
+        ranges = []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            while start < size:
+                end = mapped.find(b'\n', min(start + range_size, size) - 1)
+                end = size if end == -1 else end + 1
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+
+def input_paths(path: str) -> Optional[List[str]]:
+    """Files in a directory, or files matching a glob pattern, None if path is a file path."""
+    if os.path.isdir(path):
+        return sorted(entry.path for entry in os.scandir(path) if entry.is_file())
+    if any(char in path for char in '*?['):
+        return sorted(name for name in glob.glob(path, recursive=True) if os.path.isfile(name))
+    return None
+
+
+def _decode_lines(data: bytes) -> io.StringIO:
+    """Decode data to lines with universal newlines, the same as reading file in text mode."""
+    return io.StringIO(data.decode(DEFAULT_ENCODING), newline=None)
+
+
 class FileExtractor(BaseExtractor):
-    """File extractor"""
+    """
+    File extractor
 
-    def extract(self) -> Iterable[str]:
-        """Open and read file"""
+    In follow mode, file is read as it grows like `tail -f`, until it is idle for `FILE_EXTRACTOR_IDLE_TIMEOUT` seconds.
+
+    If path is a directory or a glob pattern, every file is a split, they are sorted by size from the largest,
+    so workers which take splits from a queue end at about the same time.
+    Position is the list of completed files, a file is extracted again if it is not completed.
+    """
+
+    # Byte offset of file after the last extracted batch, None if it is in the middle of a byte range,
+    # or completed files of a directory or glob pattern.
+    position: Optional[Union[int, List[str]]] = 0
+    compression: Optional[str] = None
+    # Files of a directory or glob pattern.
+    paths: Optional[List[str]] = None
+
+    def setup(self):
+        """Detect compression of file, or find files of a directory or glob pattern."""
+        range_size = self.settings.FILE_EXTRACTOR_RANGE_SIZE
+        if not isinstance(range_size, int) or range_size <= 0:
+            raise ProjectError(f'FILE_EXTRACTOR_RANGE_SIZE must be a positive integer, but got {range_size!r}')
+        # Completed files of a directory or glob pattern, other files in order of splits and their indexes.
+        self.completed: List[str] = []
+        self._order: List[str] = []
+        self._indexes: Dict[str, int] = {}
+        self.paths = input_paths(self.settings.FILE_EXTRACTOR_PATH)
+        if self.paths is not None:
+            logger.info('Extract %d files of %s', len(self.paths), self.settings.FILE_EXTRACTOR_PATH)
+            self.position = self.completed = []
+            return
+        self.compression = detect_compression(
+            self.settings.FILE_EXTRACTOR_PATH,
+            self.settings.FILE_EXTRACTOR_COMPRESSION,
+        )
+        if self.compression and self.settings.FILE_EXTRACTOR_MMAP:
+            logger.warning('Compressed file can not be read by memory map, read it as stream.')
+        self.streaming = self.settings.FILE_EXTRACTOR_FOLLOW and not self.compression
+        if self.compression and self.settings.FILE_EXTRACTOR_FOLLOW:
+            logger.warning('Compressed file can not be followed, read it to the end.')
+
+    def _open(self):
+        """Open extractor file, or the first file of a directory or glob pattern."""
+        if self.paths:
+            return io.TextIOWrapper(self._open_binary(0, self.paths[0]), encoding=DEFAULT_ENCODING)
         extractor_path = self.settings.FILE_EXTRACTOR_PATH
         logger.info('Extract data from %s', extractor_path)
-        with open(extractor_path, 'r', encoding=DEFAULT_ENCODING) as file:
+        if self.compression:
+            return io.TextIOWrapper(self._open_binary(0), encoding=DEFAULT_ENCODING)
+        return open(extractor_path, 'r', encoding=DEFAULT_ENCODING)
+
+    def _open_binary(self, position: int, path: Optional[str] = None) -> BinaryIO:
+        """Open extractor file, or a file of directory, in binary mode at position, compressed file is decompressed."""
+        extractor_path, compression = self.settings.FILE_EXTRACTOR_PATH, self.compression
+        if path is not None:
+            extractor_path, compression = path, detect_compression(path, self.settings.FILE_EXTRACTOR_COMPRESSION)
+        if not compression:
+            file = open(extractor_path, 'rb')  # pylint: disable=consider-using-with
+            file.seek(position)
+            return file
+
+        stream = open_compressed(extractor_path, 'rb', compression)
+        stream.seek(position)
+        if self.settings.FILE_COMPRESSION_THREAD:
+            return io.BufferedReader(ThreadedReader(stream, position), CHUNK_SIZE)
+        return stream
+
+    @property
+    def _mmap(self) -> bool:
+        """Whether read file by memory map."""
+        return self.settings.FILE_EXTRACTOR_MMAP and not self.compression and not self.streaming
+
+    def extract(self) -> Iterable[str]:
+        """Open and read file"""
+        if self.paths is not None:
+            for batch in self.extract_batches(self.settings.BATCH_SIZE):
+                yield from batch
+            return
+        with self._open() as file:
             for i in file:
                 yield i
+
+    def extract_batches(self, batch_size: int) -> Iterable[List[str]]:
+        """Open and read file by batch of lines."""
+        if self._mmap or self.paths is not None:
+            for split in self.splits():
+                yield from self.extract_split(split, batch_size)
+            return
+
+        extractor_path = self.settings.FILE_EXTRACTOR_PATH
+        logger.info('Extract data from %s, start at %d', extractor_path, self.position)
+        if self.streaming:
+            yield from self._follow(batch_size)
+            return
+        # Read bytes to know the offset of every batch, and decode a batch at once.
+        with self._open_binary(self.position) as file:
+            while True:
+                lines = list(islice(file, batch_size))
+                if not lines:
+                    return
+                self.position = file.tell()
+                yield list(_decode_lines(b''.join(lines)))
+
+    def _follow(self, batch_size: int) -> Iterator[List[str]]:
+        """
+        Read lines as file grows, a batch is yielded as soon as there are complete lines.
+
+        A partial line at the end of file is read again when it is completed.
+        When file is rotated, the old file is read to the end, then the new file is read from start.
+        When file is truncated, it is read from start.
+        """
+        extractor_path = self.settings.FILE_EXTRACTOR_PATH
+        interval = self.settings.FILE_EXTRACTOR_POLL_INTERVAL
+        idle_timeout = self.settings.FILE_EXTRACTOR_IDLE_TIMEOUT
+        file = self._open_binary(self.position)
+        idle_since = time.monotonic()
+        rotated = False
+        try:
+            while True:
+                lines = list(islice(file, batch_size))
+                if lines and not lines[-1].endswith(b'\n'):
+                    file.seek(-len(lines.pop()), os.SEEK_CUR)
+                if lines:
+                    self.position = file.tell()
+                    idle_since = time.monotonic()
+                    yield list(_decode_lines(b''.join(lines)))
+                    continue
+
+                if rotated:
+                    logger.info('%s is rotated, follow the new file.', extractor_path)
+                    file.close()
+                    self.position, rotated = 0, False
+                    file = self._open_binary(0)
+                    continue
+                try:
+                    stat = os.stat(extractor_path)
+                except FileNotFoundError:
+                    # The new file of rotation is not created yet.
+                    stat = None
+                if stat is not None and stat.st_ino != os.fstat(file.fileno()).st_ino:
+                    # Read the rest of old file before switch to the new file.
+                    rotated = True
+                    continue
+                if stat is not None and stat.st_size < self.position:
+                    logger.warning('%s is truncated, extract it from start.', extractor_path)
+                    file.seek(0)
+                    self.position = 0
+                    continue
+
+                if idle_timeout and time.monotonic() - idle_since >= idle_timeout:
+                    logger.info('No new data in %s seconds, stop following %s.', idle_timeout, extractor_path)
+                    return
+                time.sleep(interval)
+        finally:
+            file.close()
+
+    def tell(self) -> Optional[int]:
+        """Return byte offset after the last extracted batch."""
+        return self.position
+
+    def seek(self, position: Union[int, List[str]]):
+        """
+        Extract data after byte offset, extract from start if file is truncated or rotated.
+
+        Offset of compressed file is in decompressed data. Completed files of a directory are not extracted again.
+        """
+        if self.paths is not None:
+            self.position = self.completed = list(position)
+            return
+        extractor_path = self.settings.FILE_EXTRACTOR_PATH
+        if not self.compression and os.path.getsize(extractor_path) < position:
+            logger.warning('%s is smaller than position %d, extract it from start.', extractor_path, position)
+            position = 0
+        self.position = position
+
+    @classmethod
+    def checkpoint_id(cls, settings) -> Optional[str]:
+        """Absolute path of file, None for a directory or glob pattern whose position has paths of files."""
+        path = settings.FILE_EXTRACTOR_PATH
+        return None if input_paths(path) is not None else os.path.abspath(path)
+
+    def splits(self) -> List[Union[Tuple[int, int], str]]:
+        """Split file to newline-aligned byte ranges in mmap mode, or files of a directory from the largest."""
+        if self.paths is not None:
+            completed = set(self.completed)
+            self._order = sorted((path for path in self.paths if path not in completed), key=os.path.getsize,
+                                 reverse=True)
+            self._indexes = {path: index for index, path in enumerate(self._order)}
+            logger.info('Extract %d files, %d files are completed', len(self._order), len(completed))
+            return list(self._order)
+        if not self._mmap:
+            return []
+        extractor_path = self.settings.FILE_EXTRACTOR_PATH
+        ranges = split_ranges(extractor_path, self.settings.FILE_EXTRACTOR_RANGE_SIZE, self.position)
+        logger.info('Split %s to %d ranges', extractor_path, len(ranges))
+        return ranges
+
+    def extract_split(self, split: Union[Tuple[int, int], str], batch_size: int) -> Iterable[List[str]]:
+        """Read a byte range of file by memory map, and decode it at once. Or read a file of directory."""
+        if isinstance(split, str):
+            yield from self._extract_file(split, batch_size)
+            return
+        start, end = split
+        with open(self.settings.FILE_EXTRACTOR_PATH, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                lines = _decode_lines(mapped[start:end])
+        batch = list(islice(lines, batch_size))
+        while batch:
+            following = list(islice(lines, batch_size))
+            # Only the end of range is a known byte offset.
+            self.position = None if following else end
+            yield batch
+            batch = following
+
+    def _extract_file(self, path: str, batch_size: int) -> Iterable[List[str]]:
+        """Read a file of directory, position is set when the file is completed."""
+        with self._open_binary(0, path) as file:
+            batch = list(islice(file, batch_size))
+            if not batch:
+                # An empty batch marks an empty file completed.
+                self.position = self.split_position(path)
+                yield []
+            while batch:
+                following = list(islice(file, batch_size))
+                self.position = None if following else self.split_position(path)
+                yield list(_decode_lines(b''.join(batch)))
+                batch = following
+
+    def split_position(self, split: Union[Tuple[int, int], str]) -> Union[int, List[str]]:
+        """
+        Return byte offset after the range, or files completed after the file if splits are completed in order.
+
+        Return None for a file which is not returned by `splits` of this extractor, eg: in a worker process.
+        """
+        if isinstance(split, str):
+            index = self._indexes.get(split)
+            return None if index is None else self.completed + self._order[:index + 1]
+        return split[1]
+
+    def split_settings(self, split: Union[Tuple[int, int], str]) -> Dict[str, Any]:
+        """Settings of an extractor which extracts only a file of directory."""
+        if not isinstance(split, str):
+            return super().split_settings(split)
+        return {'FILE_EXTRACTOR_PATH': split, 'FILE_EXTRACTOR_MMAP': False, 'FILE_EXTRACTOR_FOLLOW': False}
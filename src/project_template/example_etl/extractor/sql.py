@@ -0,0 +1,113 @@
+"""
+SQL extractor
+
+Stream rows of a database table.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine, Row
+
+from project_template.example_etl.database import database_id, get_engine, get_table
+from project_template.example_etl.extractor.base import BaseExtractor
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+# Key types which are not json values, a position of them is saved as `{"type": name, "value": str}`.
+KEY_TYPES = {
+    'datetime': (datetime, datetime.fromisoformat),
+    'date': (date, date.fromisoformat),
+    'time': (time, time.fromisoformat),
+    'decimal': (Decimal, Decimal),
+}
+
+
+def dump_key(value: Any) -> Any:
+    """Json value of a key, raise TypeError if its type is not supported."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # datetime is a subclass of date, so it is matched first.
+    for name, (key_type, _) in KEY_TYPES.items():
+        if isinstance(value, key_type):
+            return {'type': name, 'value': value.isoformat() if name != 'decimal' else str(value)}
+    raise TypeError(f'Unsupported type of SQL_EXTRACTOR_KEY: {type(value).__name__}')
+
+
+def load_key(value: Any) -> Any:
+    """Key of a json value returned by `dump_key`."""
+    if isinstance(value, dict):
+        return KEY_TYPES[value['type']][1](value['value'])
+    return value
+
+
+class SqlExtractor(BaseExtractor):
+    """
+    SQL extractor
+
+    Rows are queried by keyset chunks ordered by `SQL_EXTRACTOR_KEY`, every chunk is read by a server side cursor,
+    so memory is constant however big the table is. The key of the last extracted row is the checkpoint position.
+    """
+    engine: Optional[Engine] = None
+    dispose = False
+    # Key of the last extracted row.
+    position: Optional[Any] = None
+
+    def setup(self):
+        """Prepare engine and query columns."""
+        self.engine, self.dispose = get_engine(self.settings.SQL_EXTRACTOR_URL)
+        table = get_table(self.settings.SQL_EXTRACTOR_TABLE, self.engine)
+        self.key = table.c[self.settings.SQL_EXTRACTOR_KEY]
+        column_names = self.settings.SQL_EXTRACTOR_COLUMNS
+        self.columns = [table.c[name] for name in column_names] if column_names else list(table.c)
+        self.chunk_size = self.settings.SQL_EXTRACTOR_CHUNK_SIZE
+        self.format = self.settings.SQL_EXTRACTOR_FORMAT
+
+    def _format(self, rows: List[Row]) -> List[Any]:
+        """Format rows without key column which is the first column."""
+        if self.format == 'dict':
+            names = [column.name for column in self.columns]
+            return [dict(zip(names, row[1:])) for row in rows]
+        return ['\t'.join('' if value is None else str(value) for value in row[1:]) + '\n' for row in rows]
+
+    def extract(self) -> Iterable[Any]:
+        """Extract rows one by one."""
+        for batch in self.extract_batches(self.chunk_size):
+            yield from batch
+
+    def extract_batches(self, batch_size: int) -> Iterable[List[Any]]:
+        """Query table by keyset chunks, and fetch every chunk by batches from a server side cursor."""
+        logger.info('Extract data from table %s after key %s', self.key.table.name, self.position)
+        with self.engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True, yield_per=batch_size)
+            while True:
+                query = select(self.key, *self.columns).order_by(self.key).limit(self.chunk_size)
+                if self.position is not None:
+                    query = query.where(self.key > self.position)
+                count = 0
+                for rows in connection.execute(query).partitions():
+                    count += len(rows)
+                    self.position = rows[-1][0]
+                    yield self._format(rows)
+                if count < self.chunk_size:
+                    return
+
+    def tell(self) -> Optional[Any]:
+        """Return key of the last extracted row, as a json value."""
+        return dump_key(self.position)
+
+    def seek(self, position: Optional[Any]):
+        """Extract rows whose key is greater than position returned by `tell`."""
+        self.position = load_key(position)
+
+    @classmethod
+    def checkpoint_id(cls, settings) -> str:
+        """Database url without password, table and key column."""
+        return f'{database_id(settings.SQL_EXTRACTOR_URL)}/{settings.SQL_EXTRACTOR_TABLE}.{settings.SQL_EXTRACTOR_KEY}'
+
+    def close(self):
+        """Dispose engine if it is created by extractor."""
+        if self.dispose:
+            self.engine.dispose()
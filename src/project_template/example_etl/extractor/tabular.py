@@ -0,0 +1,115 @@
+"""
+Tabular extractors
+
+Parse CSV or JSON lines file to column batches.
+"""
+import csv
+import json
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from project_template.example_etl.columns import ColumnBatch
+from project_template.example_etl.extractor.file import FileExtractor
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class TabularExtractor(FileExtractor):
+    """
+    Base of tabular extractors.
+
+    Lines are read by file extractor, so compression, memory map, splits and checkpoints work the same,
+    and every batch of lines is parsed to columns at once. A record must be in one line.
+    """
+    # Whether the first line of file is a header.
+    header = False
+
+    def setup(self):
+        super().setup()
+        self.fields: List[str] = list(self.settings.TABULAR_FIELDS) or self._detect_fields()
+        logger.info('Extract fields: %s', self.fields)
+
+    def _first_line(self) -> str:
+        """First line which is not blank."""
+        with self._open() as file:
+            return next((line for line in file if line.strip()), '')
+
+    def _detect_fields(self) -> List[str]:
+        """Detect fields from file, when they are not configured."""
+        raise NotImplementedError()
+
+    def parse(self, lines: List[str]) -> ColumnBatch:
+        """Parse lines to a column batch."""
+        raise NotImplementedError()
+
+    def extract(self) -> Iterable[Dict[str, Any]]:
+        """Extract records as dicts."""
+        for batch in self.extract_batches(self.settings.BATCH_SIZE):
+            yield from batch.rows()
+
+    def extract_batches(self, batch_size: int) -> Iterable[ColumnBatch]:
+        """Read batches of lines, and parse them to columns."""
+        if self._mmap or self.paths is not None:
+            # Splits and files of directory are parsed by `extract_split`.
+            yield from super().extract_batches(batch_size)
+            return
+        skip_header = self.header and self.position == 0
+        for lines in super().extract_batches(batch_size):
+            if skip_header:
+                lines, skip_header = lines[1:], False
+            yield self.parse(lines)
+
+    def extract_split(self, split: Union[Tuple[int, int], str], batch_size: int) -> Iterable[ColumnBatch]:
+        """Read a byte range of file or a file of directory, and parse it to columns. Every file has a header."""
+        skip_header = self.header and (isinstance(split, str) or split[0] == 0)
+        for lines in super().extract_split(split, batch_size):
+            if skip_header:
+                lines, skip_header = lines[1:], False
+            yield self.parse(lines)
+
+
+class CsvExtractor(TabularExtractor):
+    """
+    CSV extractor
+
+    Fields are read from header if `TABULAR_FIELDS` is empty, a short row is filled with empty strings.
+    """
+
+    def setup(self):
+        self.header = self.settings.CSV_HEADER
+        self.delimiter = self.settings.CSV_DELIMITER
+        super().setup()
+
+    def _detect_fields(self) -> List[str]:
+        if not self.header:
+            raise ValueError('CSV file has no header, fields must be configured by `TABULAR_FIELDS`.')
+        return next(csv.reader([self._first_line()], delimiter=self.delimiter), [])
+
+    def parse(self, lines: List[str]) -> ColumnBatch:
+        """Parse rows by csv reader, and transpose them to columns."""
+        rows = [row for row in csv.reader(lines, delimiter=self.delimiter) if row]
+        width = len(self.fields)
+        if any(len(row) != width for row in rows):
+            rows = [(row + [''] * width)[:width] for row in rows]
+        columns = list(map(list, zip(*rows))) if rows else [[] for _ in range(width)]
+        return ColumnBatch(dict(zip(self.fields, columns)), len(rows))
+
+
+class JsonlExtractor(TabularExtractor):
+    """
+    JSON lines extractor
+
+    Every line is a JSON object, fields are keys of the first object if `TABULAR_FIELDS` is empty.
+    Missing fields are None.
+    """
+
+    def _detect_fields(self) -> List[str]:
+        line = self._first_line()
+        return list(json.loads(line)) if line else []
+
+    def parse(self, lines: List[str]) -> ColumnBatch:
+        """Parse objects, and collect values of every field."""
+        loads = json.loads
+        records = [loads(line) for line in lines if line.strip()]
+        return ColumnBatch.from_rows(records, self.fields)
+
@@ -1,4 +1,5 @@
 """Base loader"""
+from typing import Any, Dict, List, Optional
 
 
 class BaseLoader:
@@ -15,11 +16,88 @@ class BaseLoader:
         """Write data to loader"""
         raise NotImplementedError()
 
+    def load_batch(self, batch: List[str]):
+        """
+        Write a batch of data to loader.
+
+        Per-record loaders load each record, override it to write batches natively.
+        """
+        load = self.load
+        for data in batch:
+            load(data)
+
+    def flush(self):
+        """Make loaded data visible now, eg: after a batch of streaming extractor, which may wait long for more data."""
+
+    def tell(self) -> Optional[Any]:
+        """Return position after loaded data, it is used as a checkpoint. Return None if loader can not resume."""
+        return None
+
+    def seek(self, position: Any):
+        """Continue loading after `position` returned by `tell`, data loaded after it is discarded."""
+        raise NotImplementedError()
+
+    @classmethod
+    def checkpoint_id(cls, settings) -> Optional[str]:
+        """Return identity of data loaded by settings, eg: path of file, like `checkpoint_id` of extractor."""
+        return None
+
+    def finish(self):
+        """Called when all data is loaded and before the final checkpoint, eg: to make output durable."""
+
     def close(self):
         """Close something"""
 
+    @classmethod
+    def input_settings(cls, settings, name: str) -> Dict[str, Any]:
+        """
+        Return settings of a loader which writes output of input `name`, when output is written per input.
+
+        Raise NotImplementedError if output of loader can not be separated by settings.
+        """
+        raise NotImplementedError()
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
     def __enter__(self):
         return self
+
+
+class AsyncBaseLoader:
+    """
+    Async base loader
+
+    Used by async manage, for loaders which spend most of time waiting on I/O.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    async def setup(self):
+        """Setup something when enter loader."""
+
+    async def load(self, data: str):
+        """Write data to loader"""
+        raise NotImplementedError()
+
+    async def load_batch(self, batch: List[str]):
+        """Write a batch of data to loader."""
+        for data in batch:
+            await self.load(data)
+
+    async def flush(self):
+        """Make loaded data visible now, like `flush` of sync loader."""
+
+    async def finish(self):
+        """Called when all data is loaded."""
+
+    async def close(self):
+        """Close something"""
+
+    async def __aenter__(self):
+        await self.setup()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
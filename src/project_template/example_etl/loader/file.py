@@ -1,36 +1,214 @@
 """
 File loader
 
-Write data to loader file.
+Write data to loader file, it is made durable by a policy of `FILE_LOADER_DURABILITY`.
 """
+import io
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
 
 from project_template.constants import DEFAULT_ENCODING
+from project_template.exceptions import ProjectError
+from project_template.example_etl.compression import CHUNK_SIZE, ThreadedWriter, detect_compression, open_compressed
 from project_template.example_etl.loader.base import BaseLoader
 
 from project_template.log import get_logger
 
 logger = get_logger(__name__)
 
+DURABILITIES = ('buffered', 'group_commit', 'atomic')
+
+
+def fsync_path(path: str):
+    """Flush file or directory to disk, eg: a closed file, or a directory after a file renamed in it."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 class FileLoader(BaseLoader):
     """
     File loader
+
+    Durability of `FILE_LOADER_DURABILITY`:
+    - buffered: data is flushed every `FILE_LOADER_FLUSH_INTERVAL` seconds, it survives a crash of process.
+    - group_commit: data is flushed and fsynced every `FILE_LOADER_COMMIT_RECORDS` records
+      or `FILE_LOADER_COMMIT_INTERVAL` milliseconds, it survives a crash of system.
+    - atomic: data is written to `<path>.tmp`, it is fsynced and renamed to path when all data is loaded,
+      so path has complete output or its previous content.
+    Data of a streaming extractor is flushed, or committed by group_commit, after every batch.
+
+    Positions returned by `tell` are flushed, and fsynced unless durability is buffered,
+    so a checkpoint never refers to data which is lost. Compressed file is fsynced only when it is finished.
     """
     file = None
+    compression: Optional[str] = None
+    finished = False
 
     def setup(self):
-        """Open a file when init loader."""
+        """
+        Prepare file when init loader.
+
+        File is opened and truncated when the first data is written, unless `seek` is called before.
+        """
         loader_path = self.settings.FILE_LOADER_PATH
+        self.compression = detect_compression(loader_path, self.settings.FILE_LOADER_COMPRESSION)
+        self.durability = self.settings.FILE_LOADER_DURABILITY
+        if self.durability not in DURABILITIES:
+            raise ProjectError(f'Unknown file loader durability "{self.durability}", use one of {list(DURABILITIES)}')
+        self.path = f'{loader_path}.tmp' if self.durability == 'atomic' else loader_path
+        if self.durability == 'group_commit':
+            self.commit_records = self.settings.FILE_LOADER_COMMIT_RECORDS
+            self.commit_interval = self.settings.FILE_LOADER_COMMIT_INTERVAL / 1000
+        else:
+            self.commit_records = 0
+            self.commit_interval = self.settings.FILE_LOADER_FLUSH_INTERVAL
+        self.pending = 0
+        self._committed_at = time.monotonic()
+        self.position: Optional[int] = None
         logger.info('Write data to %s', loader_path)
-        self.file = open(loader_path, 'w', encoding=DEFAULT_ENCODING)  # pylint: disable=consider-using-with
+
+    def _open(self, mode: str = 'w'):
+        """Open loader file, compressed file is compressed in a background thread if it is enabled."""
+        if not self.compression:
+            self.file = open(self.path, mode, encoding=DEFAULT_ENCODING)  # pylint: disable=consider-using-with
+            return
+
+        stream = open_compressed(self.path, f'{mode}b', self.compression, self.settings.FILE_COMPRESSION_LEVEL)
+        if self.settings.FILE_COMPRESSION_THREAD:
+            stream = io.BufferedWriter(ThreadedWriter(stream), CHUNK_SIZE)
+        self.file = io.TextIOWrapper(stream, encoding=DEFAULT_ENCODING)
 
     def load(self, data: str):
         """Write data to a file."""
+        if self.file is None:
+            self._open()
         self.file.write(data)
+        self.written(1)
+
+    def load_batch(self, batch: List[str]):
+        """Write a batch of data to a file."""
+        if self.file is None:
+            self._open()
+        self.file.writelines(batch)
+        self.written(len(batch))
+
+    def written(self, count: int):
+        """Count written records, and flush or commit them if it is due."""
+        self.pending += count
+        if self.commit_records and self.pending >= self.commit_records:
+            self.commit()
+        elif time.monotonic() - self._committed_at >= self.commit_interval:
+            self.flush()
+
+    def flush(self):
+        """Flush written data, it is committed if durability is group_commit."""
+        if self.file is None or not self.pending:
+            return
+        if self.durability == 'group_commit':
+            self.commit()
+            return
+        self.file.flush()
+        self.pending = 0
+        self._committed_at = time.monotonic()
+
+    def commit(self):
+        """Flush written data, and fsync it unless durability is buffered."""
         self.file.flush()
+        if self.durability != 'buffered' and not self.compression:
+            os.fsync(self.file.fileno())
+        self.pending = 0
+        self._committed_at = time.monotonic()
+
+    def tell(self) -> Optional[int]:
+        """
+        Return position of file after committed data.
+
+        Compressed file can not be truncated in a stream, so its position is None until it is finished,
+        then it is size of file.
+        """
+        if self.finished or self.compression:
+            return self.position
+        if self.file is None:
+            self._open()
+        self.commit()
+        return self.file.tell()
+
+    def seek(self, position: Optional[int]):
+        """
+        Continue writing file after position, and truncate data after it.
+
+        Data is appended to compressed file as a new stream of gzip, bz2 or xz, only after a finished run,
+        since the last stream of an unfinished run may be truncated.
+        Atomic output is continued in its temporary file, which is copied from output if it is finished before.
+        A missing output is written from start.
+        """
+        loader_path = self.settings.FILE_LOADER_PATH
+        if self.compression and position is None:
+            raise ProjectError(f'Can not continue compressed file {loader_path} of an unfinished run, '
+                               'its last stream may be truncated, run it again from start.')
+        if self.durability == 'atomic' and not os.path.exists(self.path) and os.path.exists(loader_path):
+            shutil.copyfile(loader_path, self.path)
+        if not os.path.exists(self.path):
+            logger.warning('%s is missing, eg: it is rotated or removed, write it from start.', loader_path)
+            self._open()
+            return
+        size = os.path.getsize(self.path)
+        if size < position:
+            logger.warning('%s is smaller than position %d, continue writing at its end.', loader_path, position)
+            position = size
+        if self.compression:
+            logger.info('Append a new stream to compressed file %s at %d', loader_path, position)
+            with open(self.path, 'r+b') as file:
+                file.truncate(position)
+            self._open('a')
+            return
+        logger.info('Continue writing %s at %d', loader_path, position)
+        self._open('r+')
+        self.file.seek(position)
+        self.file.truncate()
+
+    @classmethod
+    def checkpoint_id(cls, settings) -> str:
+        """Absolute path of output."""
+        return os.path.abspath(settings.FILE_LOADER_PATH)
+
+    @classmethod
+    def input_settings(cls, settings, name: str) -> Dict[str, Any]:
+        """Replace `{name}` in path by name of input."""
+        path = settings.FILE_LOADER_PATH
+        if '{name}' not in path:
+            raise ProjectError(f'FILE_LOADER_PATH must contain {{name}} to write a file per input: {path}')
+        return {'FILE_LOADER_PATH': path.replace('{name}', name)}
+
+    def finish(self):
+        """Close file when all data is loaded, and make it durable by policy."""
+        if self.file is None:
+            self._open()
+        position = None if self.compression else self.file.tell()
+        self.file.close()
+        self.position = os.path.getsize(self.path) if self.compression else position
+        self.finished = True
+        if self.durability == 'buffered':
+            return
+        fsync_path(self.path)
+        if self.durability == 'atomic':
+            loader_path = self.settings.FILE_LOADER_PATH
+            os.replace(self.path, loader_path)
+            fsync_path(os.path.dirname(os.path.abspath(loader_path)))
+            logger.info('Rename %s to %s', self.path, loader_path)
 
     def close(self):
-        """Close file object when task done."""
+        """
+        Close file object when task done.
+
+        Output is not created or truncated if nothing is written, eg: resume fails before loader seeks,
+        an empty output of a run without data is created by `finish`.
+        """
+        if self.finished or self.file is None:
+            return
         self.file.close()
-        
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Shard file loader
+
+Partition data across several files, every file is written by its own thread.
+"""
+import importlib
+import os
+import queue
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from project_template.example_etl.loader.base import BaseLoader
+from project_template.example_etl.loader.file import FileLoader
+from project_template.exceptions import ProjectError
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+# Max batches waiting to be written by a shard writer.
+QUEUE_SIZE = 8
+
+
+def load_key_function(key: str) -> Callable[[str], Any]:
+    """Load key function from `module:function`."""
+    module_name, _, function_name = key.partition(':')
+    if not function_name:
+        raise ProjectError(f'Key function should be "module:function", but got "{key}"')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+class _ShardWriter(threading.Thread):
+    """Write batches of a shard by a file loader in a thread."""
+
+    def __init__(self, loader: FileLoader, name: str):
+        super().__init__(name=name, daemon=True)
+        self.loader = loader
+        self.queue: queue.Queue = queue.Queue(QUEUE_SIZE)
+        self.error: Optional[Exception] = None
+
+    def run(self):
+        while True:
+            batch = self.queue.get()
+            try:
+                if batch is None:
+                    return
+                if self.error is None:
+                    self.loader.load_batch(batch)
+            except Exception as e:  # pylint: disable=broad-except
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def raise_error(self):
+        """Raise exception of thread in caller."""
+        if self.error is not None:
+            raise ProjectError(f'Failed to write {self.name}') from self.error
+
+
+class ShardFileLoader(BaseLoader):
+    """
+    Shard file loader
+
+    Data is partitioned to `SHARD_LOADER_COUNT` files by round robin, or by hash of data key.
+    `{shard}` in `SHARD_LOADER_PATH` is replaced by shard number.
+    """
+    writers: List[_ShardWriter] = []
+
+    def setup(self):
+        """Create a file loader and a writer thread for every shard."""
+        self.count = self.settings.SHARD_LOADER_COUNT
+        key = self.settings.SHARD_LOADER_KEY
+        self.round_robin = key == 'round_robin'
+        self.key: Optional[Callable[[str], Any]] = None if key in ('round_robin', 'hash') else load_key_function(key)
+        self.offset = 0
+
+        self.writers = []
+        for shard in range(self.count):
+            shard_settings = self.settings.dynaconf_clone()
+            shard_settings.set('FILE_LOADER_PATH', self.settings.SHARD_LOADER_PATH.format(shard=shard))
+            writer = _ShardWriter(FileLoader(shard_settings), name=f'shard-{shard}')
+            writer.start()
+            self.writers.append(writer)
+        logger.info('Write data to %d shards by %s', self.count, key)
+
+    def partition(self, batch: List[str]) -> List[List[str]]:
+        """Partition batch to a list for every shard."""
+        count = self.count
+        if self.round_robin:
+            offset = self.offset
+            self.offset = (offset + len(batch)) % count
+            return [batch[(shard - offset) % count::count] for shard in range(count)]
+
+        parts: List[List[str]] = [[] for _ in range(count)]
+        appends = [part.append for part in parts]
+        crc32 = zlib.crc32
+        key = self.key
+        for data in batch:
+            value = data if key is None else key(data)
+            # Keys which are not bytes are hashed by their text, eg: int or tuple.
+            if isinstance(value, str):
+                value = value.encode()
+            elif not isinstance(value, bytes):
+                value = str(value).encode()
+            appends[crc32(value) % count](data)
+        return parts
+
+    def load(self, data: str):
+        """Write data to a shard."""
+        self.load_batch([data])
+
+    def load_batch(self, batch: List[str]):
+        """Partition batch and hand parts to shard writers."""
+        for writer, part in zip(self.writers, self.partition(batch)):
+            writer.raise_error()
+            if part:
+                writer.queue.put(part)
+
+    def _join(self):
+        """Wait until all queued batches written."""
+        for writer in self.writers:
+            writer.queue.join()
+            writer.raise_error()
+
+    def flush(self):
+        """Flush every shard file after queued batches written."""
+        self._join()
+        for writer in self.writers:
+            writer.loader.flush()
+
+    def tell(self) -> List[Optional[int]]:
+        """Return positions of all shard files, after queued batches written."""
+        self._join()
+        return [writer.loader.tell() for writer in self.writers]
+
+    def seek(self, position: List[Optional[int]]):
+        """Continue writing every shard file after its position."""
+        if len(position) != self.count:
+            raise ProjectError(f'Checkpoint has {len(position)} shards, but SHARD_LOADER_COUNT is {self.count}')
+        for writer, shard_position in zip(self.writers, position):
+            writer.loader.seek(shard_position)
+
+    @classmethod
+    def checkpoint_id(cls, settings) -> str:
+        """Absolute path pattern of shard files."""
+        return os.path.abspath(settings.SHARD_LOADER_PATH)
+
+    @classmethod
+    def input_settings(cls, settings, name: str) -> Dict[str, Any]:
+        """Replace `{name}` in shard path by name of input."""
+        path = settings.SHARD_LOADER_PATH
+        if '{name}' not in path:
+            raise ProjectError(f'SHARD_LOADER_PATH must contain {{name}} to write shards per input: {path}')
+        return {'SHARD_LOADER_PATH': path.replace('{name}', name)}
+
+    def finish(self):
+        """Finish every shard file after queued batches written."""
+        self._join()
+        for writer in self.writers:
+            writer.loader.finish()
+
+    def close(self):
+        """Stop writers and close shard files."""
+        for writer in self.writers:
+            writer.queue.put(None)
+        for writer in self.writers:
+            writer.join()
+            writer.loader.close()
+        for writer in self.writers:
+            writer.raise_error()
@@ -0,0 +1,118 @@
+"""
+SQL loader
+
+Insert data to a database table in bulk.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from project_template.example_etl.database import database_id, get_engine, get_table
+from project_template.example_etl.loader.base import BaseLoader
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class SqlLoader(BaseLoader):
+    """
+    SQL loader
+
+    Batches are inserted by one multi-row `executemany`, and committed every `SQL_LOADER_COMMIT_EVERY` rows.
+    Text data is inserted to `SQL_LOADER_COLUMN`, keys of dict data are renamed to columns by `SQL_LOADER_MAPPING`.
+    """
+    engine: Optional[Engine] = None
+    dispose = False
+    connection = None
+    transaction = None
+
+    def setup(self):
+        """Connect database and begin a transaction."""
+        self.engine, self.dispose = get_engine(self.settings.SQL_LOADER_URL)
+        self.table = get_table(self.settings.SQL_LOADER_TABLE, self.engine)
+        self.insert = self.table.insert()
+        self.column = self.settings.SQL_LOADER_COLUMN
+        self.mapping: Dict[str, str] = dict(self.settings.SQL_LOADER_MAPPING)
+        self.values: Dict[str, Any] = dict(self.settings.SQL_LOADER_VALUES)
+        self.commit_every = self.settings.SQL_LOADER_COMMIT_EVERY
+        self.pending = 0
+        self.committed = 0
+
+        self.connection = self.engine.connect()
+        self.transaction = self.connection.begin()
+        logger.info('Write data to table %s of %s', self.table.name, self.engine.url.render_as_string())
+
+    def _rows(self, batch: List[Any]) -> List[Dict[str, Any]]:
+        """Convert data to rows of table."""
+        values, column, mapping = self.values, self.column, self.mapping
+        return [
+            {**values, **{mapping.get(key, key): value for key, value in data.items()}}
+            if isinstance(data, dict) else {**values, column: data}
+            for data in batch
+        ]
+
+    def load(self, data: Any):
+        """Insert data."""
+        self.load_batch([data])
+
+    def load_batch(self, batch: List[Any]):
+        """Insert batch by executemany, and commit if there are enough rows."""
+        if not batch:
+            return
+        self.connection.execute(self.insert, self._rows(batch))
+        self.pending += len(batch)
+        if self.pending >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        """Commit pending rows and begin a new transaction."""
+        self.transaction.commit()
+        self.committed += self.pending
+        logger.debug('Commit %d rows, %d rows committed', self.pending, self.committed)
+        self.pending = 0
+        self.transaction = self.connection.begin()
+
+    def flush(self):
+        """Commit pending rows."""
+        if self.pending:
+            self.commit()
+
+    def tell(self) -> int:
+        """Commit pending rows, so the checkpoint only covers committed data. Return number of committed rows."""
+        self.commit()
+        return self.committed
+
+    def seek(self, position: Optional[int]):
+        """
+        Rows committed after checkpoint can not be removed, so they may be inserted again when resume.
+
+        Use a unique key in table if duplicated rows are not expected.
+        """
+        logger.info('Continue inserting to table %s after %s rows', self.table.name, position)
+
+    @classmethod
+    def checkpoint_id(cls, settings) -> str:
+        """Database url without password, and table."""
+        return f'{database_id(settings.SQL_LOADER_URL)}/{settings.SQL_LOADER_TABLE}'
+
+    @classmethod
+    def input_settings(cls, settings, name: str) -> Dict[str, Any]:
+        """Rows of all inputs are inserted to the same table."""
+        return {}
+
+    def close(self):
+        """Commit pending rows and close connection."""
+        if self.transaction is not None and self.transaction.is_active:
+            self.transaction.commit()
+            self.committed += self.pending
+            self.pending = 0
+        if self.connection is not None:
+            self.connection.close()
+        if self.dispose:
+            self.engine.dispose()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Rollback pending rows if loading failed."""
+        if exc_type is not None and self.transaction is not None:
+            self.transaction.rollback()
+        self.close()
@@ -0,0 +1,84 @@
+"""
+Tabular loaders
+
+Write column batches to CSV or JSON lines file.
+"""
+import csv
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from project_template.example_etl.columns import ColumnBatch, as_columns
+from project_template.example_etl.loader.file import FileLoader
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class TabularLoader(FileLoader):
+    """
+    Base of tabular loaders.
+
+    File is written by file loader, so compression and checkpoints work the same.
+    Batches of dict records are converted to columns.
+    """
+
+    def load(self, data: Dict[str, Any]):
+        """Write a dict record."""
+        self.load_batch(ColumnBatch.from_rows([data]))
+
+    def load_batch(self, batch: Any):
+        """Write columns of batch."""
+        batch = as_columns(batch)
+        if not len(batch):
+            return
+        if self.file is None:
+            self._open()
+        self.write_columns(batch)
+        self.written(len(batch))
+
+    def write_columns(self, batch: ColumnBatch):
+        """Write a column batch to file."""
+        raise NotImplementedError()
+
+
+class CsvLoader(TabularLoader):
+    """
+    CSV loader
+
+    Fields are `TABULAR_FIELDS`, or fields of the first batch. Header is written before data if `CSV_HEADER` is true,
+    but not when continuing a file.
+    """
+    writer = None
+
+    def setup(self):
+        super().setup()
+        self.fields: List[str] = list(self.settings.TABULAR_FIELDS)
+        self.header_written = not self.settings.CSV_HEADER
+
+    def write_columns(self, batch: ColumnBatch):
+        if self.writer is None:
+            self.writer = csv.writer(self.file, delimiter=self.settings.CSV_DELIMITER, lineterminator='\n')
+        if not self.fields:
+            self.fields = batch.fields
+        if not self.header_written:
+            self.writer.writerow(self.fields)
+            self.header_written = True
+        columns = batch.columns
+        self.writer.writerows(zip(*(columns.get(field) or [None] * len(batch) for field in self.fields)))
+
+    def seek(self, position: Optional[int]):
+        """Continue writing file, header is written again only if file is truncated to empty or it is missing."""
+        exists = os.path.exists(self.path) or os.path.exists(self.settings.FILE_LOADER_PATH)
+        super().seek(position)
+        self.writer = None
+        if exists and (position or self.compression):
+            self.header_written = True
+
+
+class JsonlLoader(TabularLoader):
+    """JSON lines loader, every record is written as a JSON object in a line."""
+
+    def write_columns(self, batch: ColumnBatch):
+        dumps = json.dumps
+        self.file.writelines(f'{dumps(row, ensure_ascii=False)}\n' for row in batch.rows())
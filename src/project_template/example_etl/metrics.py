@@ -0,0 +1,140 @@
+"""
+Metrics
+
+Count records, bytes and latency of every pipeline stage, report them periodically and when run done.
+"""
+import math
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds of latency histogram buckets in seconds.
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, math.inf)
+
+STAGES = ('extract', 'transform', 'load')
+
+
+def batch_size_of(batch: List[Any]) -> int:
+    """Return size of text data in batch, other types of data are not counted."""
+    if isinstance(batch, list) and batch and isinstance(batch[0], str):
+        return sum(map(len, batch))
+    return 0
+
+
+def timed_call(func: Callable[..., Any], *args) -> Tuple[Any, float]:
+    """Call function, return result and seconds spent, it can be sent to a process pool."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class StageMetrics:
+    """Metrics of a stage, latency is observed per batch."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.records = 0
+        self.size = 0
+        self.seconds = 0.0
+        self.histogram = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, batch: List[Any], seconds: float):
+        """Observe a batch processed in seconds."""
+        self.batches += 1
+        self.records += len(batch)
+        self.size += batch_size_of(batch)
+        self.seconds += seconds
+        self.histogram[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def merge(self, other: 'StageMetrics'):
+        """Merge metrics observed by another process."""
+        self.batches += other.batches
+        self.records += other.records
+        self.size += other.size
+        self.seconds += other.seconds
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def timed(self, batches: Iterable[List[Any]]) -> Iterator[List[Any]]:
+        """Yield batches, and observe time spent to produce every batch."""
+        iterator = iter(batches)
+        while True:
+            start = time.perf_counter()
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                return
+            self.observe(batch, time.perf_counter() - start)
+            yield batch
+
+    def percentile(self, percent: float) -> float:
+        """Return upper bound of the bucket which contains the percentile of batch latency."""
+        rank = self.batches * percent / 100
+        count = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, self.histogram):
+            count += bucket_count
+            if count >= rank and count:
+                return bound
+        return 0.0
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """Return metrics of stage, throughput is computed by elapsed time of run."""
+        elapsed = elapsed or 1e-9
+        return {
+            'stage': self.name,
+            'batches': self.batches,
+            'records': self.records,
+            'bytes': self.size,
+            'seconds': round(self.seconds, 6),
+            'records_per_second': round(self.records / elapsed, 2),
+            'mb_per_second': round(self.size / elapsed / 1024 / 1024, 4),
+            'p50_seconds': self.percentile(50),
+            'p99_seconds': self.percentile(99),
+            'histogram': dict(zip(map(str, LATENCY_BUCKETS), self.histogram)),
+        }
+
+
+class PipelineMetrics:
+    """Metrics of extract, transform and load stages."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.started_at = time.perf_counter()
+        self._reported_at = time.monotonic()
+        self.stages = {name: StageMetrics(name) for name in STAGES}
+        self.extract = self.stages['extract']
+        self.transform = self.stages['transform']
+        self.load = self.stages['load']
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since metrics created."""
+        return time.perf_counter() - self.started_at
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return summary of all stages."""
+        elapsed = self.elapsed
+        return [stage.summary(elapsed) for stage in self.stages.values()]
+
+    def report(self, final: bool = False):
+        """Log metrics of all stages, the stage spends most time is the bottleneck."""
+        elapsed = self.elapsed
+        title = 'Summary' if final else 'Progress'
+        logger.info('%s of %.2f seconds:', title, elapsed)
+        for stage in self.stages.values():
+            summary = stage.summary(elapsed)
+            logger.info(
+                '  %-9s %d records, %d bytes, %.2f records/s, %.4f MB/s, busy %.2fs, batch p50 <= %ss, p99 <= %ss',
+                stage.name, summary['records'], summary['bytes'], summary['records_per_second'],
+                summary['mb_per_second'], summary['seconds'], summary['p50_seconds'], summary['p99_seconds'],
+            )
+        self._reported_at = time.monotonic()
+
+    def maybe_report(self):
+        """Report if `interval` seconds passed since last report, 0 disables periodic report."""
+        if self.interval and time.monotonic() - self._reported_at >= self.interval:
+            self.report()
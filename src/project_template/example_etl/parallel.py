@@ -0,0 +1,253 @@
+"""
+Parallel transformer
+
+Transform batches of data, or extract and transform splits of data, in a process pool.
+"""
+import os
+import pickle
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from project_template.example_etl.extractor.base import BaseExtractor
+from project_template.example_etl.loader.base import BaseLoader
+from project_template.example_etl.metrics import PipelineMetrics, StageMetrics
+from project_template.example_etl.transformer.base import BaseTransformer
+from project_template.log import init_worker_log
+
+# Plugins of current worker process, they are created by `_init_worker`.
+_extractor: Optional[BaseExtractor] = None
+_transformer: Optional[BaseTransformer] = None
+# Settings and plugin classes of a worker which runs pipelines per input, they are set by `_init_input_worker`.
+_settings = None
+_plugin_klss: Tuple = ()
+
+
+def _init_worker(
+        settings,
+        transformer_kls: Callable[..., BaseTransformer],
+        extractor_kls: Optional[Type[BaseExtractor]],
+):
+    """Create plugins once in every worker process."""
+    global _extractor, _transformer  # pylint: disable=global-statement
+    init_worker_log()
+    _transformer = transformer_kls(settings)
+    if extractor_kls is not None:
+        _extractor = extractor_kls(settings)
+
+
+def transform_batch_in_worker(batch: List[str]) -> List[str]:
+    """Transform a batch in worker process of a pool created by `create_pool`."""
+    return _transformer.transform_batch(batch)
+
+
+def _extract_transform_split(
+        split: Any,
+        batch_size: int,
+        memory_batches: int,
+        spill_dir: str,
+) -> Tuple[Union[List[List[str]], str], StageMetrics, StageMetrics]:
+    """
+    Extract a split and transform its batches in worker process, return batches and metrics of both stages.
+
+    If a split has more than `memory_batches` batches, eg: a big file of directory, its batches are spilled to
+    a file in `spill_dir`, and path of the file is returned instead.
+    """
+    transform_batch = _transformer.transform_batch
+    extract_metrics, transform_metrics = StageMetrics('extract'), StageMetrics('transform')
+    batches: List[List[str]] = []
+    spill_file = None
+    try:
+        for batch in extract_metrics.timed(_extractor.extract_split(split, batch_size)):
+            start = time.perf_counter()
+            batch = transform_batch(batch)
+            transform_metrics.observe(batch, time.perf_counter() - start)
+            batches.append(batch)
+            if len(batches) > memory_batches:
+                if spill_file is None:
+                    fd, path = tempfile.mkstemp(prefix='split-', suffix='.batches', dir=spill_dir)
+                    spill_file = open(fd, 'wb')  # pylint: disable=consider-using-with
+                for spilled in batches:
+                    pickle.dump(spilled, spill_file, pickle.HIGHEST_PROTOCOL)
+                batches = []
+        if spill_file is None:
+            return batches, extract_metrics, transform_metrics
+        for spilled in batches:
+            pickle.dump(spilled, spill_file, pickle.HIGHEST_PROTOCOL)
+    finally:
+        if spill_file is not None:
+            spill_file.close()
+    return path, extract_metrics, transform_metrics
+
+
+def read_spilled_batches(path: str) -> Iterator[List[str]]:
+    """Yield batches spilled by `_extract_transform_split`, the file is removed when all batches are read."""
+    try:
+        with open(path, 'rb') as file:
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    break
+    finally:
+        os.remove(path)
+
+
+def create_pool(
+        settings,
+        transformer_kls: Callable[..., BaseTransformer],
+        workers: int,
+        extractor_kls: Optional[Type[BaseExtractor]] = None,
+) -> ProcessPoolExecutor:
+    """Create a process pool, every worker owns a transformer, and an extractor if `extractor_kls` is given."""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(settings, transformer_kls, extractor_kls),
+    )
+
+
+def _submit_all(
+        executor: Executor,
+        func: Callable,
+        items: Iterable,
+        max_pending: int,
+        ordered: bool,
+) -> Iterator[Any]:
+    """Submit `func` for every item with at most `max_pending` items in flight, and yield results."""
+    if ordered:
+        pending: deque[Future] = deque()
+        for item in items:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
+    else:
+        running = set()
+        for item in items:
+            if len(running) >= max_pending:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            running.add(executor.submit(func, item))
+        for future in wait(running).done:
+            yield future.result()
+
+
+def parallel_transform(
+        transformer_kls: Callable[..., BaseTransformer],
+        settings,
+        batches: Iterable[List[str]],
+        workers: int,
+        ordered: bool = True,
+) -> Iterator[List[str]]:
+    """
+    Transform batches in `workers` processes.
+
+    At most `2 * workers` batches are in flight, so a fast extractor does not fill memory.
+    If `ordered` is true, transformed batches are yielded in input order, else in completion order.
+    """
+    with create_pool(settings, transformer_kls, workers) as executor:
+        yield from _submit_all(executor, transform_batch_in_worker, batches, workers * 2, ordered)
+
+
+def parallel_extract_transform(
+        extractor_kls: Type[BaseExtractor],
+        transformer_kls: Callable[..., BaseTransformer],
+        settings,
+        splits: Iterable[Any],
+        workers: int,
+        ordered: bool = True,
+        metrics: Optional[PipelineMetrics] = None,
+) -> Iterator[Iterator[List[str]]]:
+    """
+    Extract and transform splits of extractor in `workers` processes, and yield transformed batches of every split.
+
+    Every worker reads its own split, so extraction is parallel too. Only transformed batches are sent back,
+    with metrics of extract and transform stages, which are merged into `metrics` if it is given.
+    Batches of a split over `SPLIT_MEMORY_BATCHES` are spilled to a file by worker and read back lazily,
+    so memory is bounded however big a split is.
+    """
+    batch_size = settings.BATCH_SIZE
+    with tempfile.TemporaryDirectory(prefix='splits-', dir=settings.SPLIT_SPILL_DIR or None) as spill_dir, \
+            create_pool(settings, transformer_kls, workers, extractor_kls) as executor:
+        results = _submit_all(
+            executor,
+            partial(
+                _extract_transform_split,
+                batch_size=batch_size,
+                memory_batches=settings.SPLIT_MEMORY_BATCHES,
+                spill_dir=spill_dir,
+            ),
+            splits,
+            workers * 2,
+            ordered,
+        )
+        for batches, extract_metrics, transform_metrics in results:
+            if metrics is not None:
+                metrics.extract.merge(extract_metrics)
+                metrics.transform.merge(transform_metrics)
+            yield read_spilled_batches(batches) if isinstance(batches, str) else iter(batches)
+
+
+def _init_input_worker(settings, extractor_kls, transformer_kls, loader_kls):
+    """Keep settings and plugin classes in worker process, plugins are created for every input."""
+    global _settings, _plugin_klss  # pylint: disable=global-statement
+    init_worker_log()
+    _settings = settings
+    _plugin_klss = (extractor_kls, transformer_kls, loader_kls)
+
+
+def _run_input(item: Tuple[Any, Dict[str, Any]]) -> Tuple[Any, Tuple[StageMetrics, ...]]:
+    """Run pipeline of an input with settings overrides in worker process, return input and metrics of stages."""
+    split, overrides = item
+    extractor_kls, transformer_kls, loader_kls = _plugin_klss
+    input_settings = _settings.dynaconf_clone()
+    for name, value in overrides.items():
+        input_settings.set(name, value)
+
+    metrics = PipelineMetrics(0)
+    transformer = transformer_kls(input_settings)
+    try:
+        with extractor_kls(input_settings) as extractor, loader_kls(input_settings) as loader:
+            for batch in metrics.extract.timed(extractor.extract_batches(input_settings.BATCH_SIZE)):
+                start = time.perf_counter()
+                batch = transformer.transform_batch(batch)
+                metrics.transform.observe(batch, time.perf_counter() - start)
+                start = time.perf_counter()
+                loader.load_batch(batch)
+                metrics.load.observe(batch, time.perf_counter() - start)
+            for batch in metrics.transform.timed(transformer.finish()):
+                start = time.perf_counter()
+                loader.load_batch(batch)
+                metrics.load.observe(batch, time.perf_counter() - start)
+            loader.finish()
+    finally:
+        transformer.close()
+    return split, (metrics.extract, metrics.transform, metrics.load)
+
+
+def parallel_run_inputs(
+        extractor_kls: Type[BaseExtractor],
+        transformer_kls: Callable[..., BaseTransformer],
+        loader_kls: Type[BaseLoader],
+        settings,
+        inputs: Iterable[Tuple[Any, Dict[str, Any]]],
+        workers: int,
+) -> Iterator[Tuple[Any, Tuple[StageMetrics, ...]]]:
+    """
+    Run a whole pipeline for every input in `workers` processes, input is a split and its settings overrides.
+
+    Inputs are taken by idle workers one by one, so give the largest inputs first to end at about the same time.
+    Yield every input and its metrics when it is completed.
+    """
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_input_worker,
+            initargs=(settings, extractor_kls, transformer_kls, loader_kls),
+    ) as executor:
+        yield from _submit_all(executor, _run_input, inputs, workers * 2, ordered=False)
@@ -0,0 +1,133 @@
+"""
+Plugin registry
+
+Index entry points of `example_etl.*` namespaces once, cache the index on disk, and import plugins on request.
+"""
+import hashlib
+import importlib
+import json
+import os
+import sys
+from importlib.metadata import distributions
+from typing import Any, Dict, List, Optional
+
+from project_template.exceptions import PluginNotFoundError
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+NAMESPACE_PREFIX = 'example_etl.'
+
+_METADATA_SUFFIXES = ('.dist-info', '.egg-info', '.egg-link')
+
+
+def distributions_key(paths: Optional[List[str]] = None) -> str:
+    """
+    Return a key of installed distributions.
+
+    It is a digest of metadata directory names and their modification times on `sys.path`,
+    so installing, upgrading or removing a distribution changes the key, without reading any metadata.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sys.path if paths is None else paths:
+        try:
+            with os.scandir(path or '.') as entries:
+                names = sorted(
+                    (entry.name, entry.stat().st_mtime_ns) for entry in entries if entry.name.endswith(_METADATA_SUFFIXES)
+                )
+        except OSError:
+            continue
+        digest.update(json.dumps([path, names]).encode())
+    return digest.hexdigest()
+
+
+def scan_entry_points() -> Dict[str, Dict[str, str]]:
+    """Scan entry points of all distributions once, return `{namespace: {name: "module:attr"}}`."""
+    index: Dict[str, Dict[str, str]] = {}
+    seen = set()
+    for distribution in distributions():
+        # Only first distribution of a name on `sys.path` is used, like imports.
+        name = distribution.metadata['Name']
+        if name in seen:
+            continue
+        seen.add(name)
+        for entry_point in distribution.entry_points:
+            if entry_point.group.startswith(NAMESPACE_PREFIX):
+                index.setdefault(entry_point.group, {}).setdefault(entry_point.name, entry_point.value)
+    return index
+
+
+class PluginRegistry:
+    """
+    Plugin registry
+
+    Index is loaded from `cache_path` if installed distributions are not changed, else it is scanned and saved.
+    A plugin module is imported only when the plugin is requested, and only once.
+    """
+
+    def __init__(self, cache_path: str = ''):
+        self.cache_path = cache_path
+        self._index: Optional[Dict[str, Dict[str, str]]] = None
+        self._plugins: Dict[tuple, Any] = {}
+
+    @property
+    def index(self) -> Dict[str, Dict[str, str]]:
+        """Index of entry points, `{namespace: {name: "module:attr"}}`."""
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        if not self.cache_path:
+            return scan_entry_points()
+
+        key = distributions_key()
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+            if cache['key'] == key:
+                return cache['index']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        index = scan_entry_points()
+        self._save_index(key, index)
+        return index
+
+    def _save_index(self, key: str, index: Dict[str, Dict[str, str]]):
+        """Save index atomically, a failed save only makes next lookup scan again."""
+        tmp_path = f'{self.cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({'key': key, 'index': index}, file)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as ex:
+            logger.warning('Can not save plugin index to %s: %s', self.cache_path, ex)
+        else:
+            logger.debug('Save plugin index to %s', self.cache_path)
+
+    def names(self, namespace: str) -> List[str]:
+        """Names of plugins in namespace."""
+        return sorted(self.index.get(namespace, {}))
+
+    def get(self, namespace: str, name: str) -> Any:
+        """Import plugin by name from namespace."""
+        plugin = self._plugins.get((namespace, name))
+        if plugin is not None:
+            return plugin
+
+        value = self.index.get(namespace, {}).get(name)
+        if value is None:
+            raise PluginNotFoundError(namespace=namespace, name=name)
+        module_name, _, attrs = value.partition(':')
+        plugin = importlib.import_module(module_name.strip())
+        for attr in filter(None, attrs.strip().split('.')):
+            plugin = getattr(plugin, attr)
+        self._plugins[(namespace, name)] = plugin
+        return plugin
+
+    def clear(self):
+        """Forget index and imported plugins, next lookup loads index again."""
+        self._index = None
+        self._plugins.clear()
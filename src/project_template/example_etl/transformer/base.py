@@ -1,13 +1,50 @@
 """Base transformer"""
+from typing import Iterable, List, Optional, Union
 
 
 class BaseTransformer:
-    """Base transformer"""
+    """
+    Base transformer
+
+    A stateful transformer depends on data transformed before, eg: deduplication,
+    so all data must be transformed by one instance, it is not copied to worker processes.
+    A buffering transformer holds data until `finish`, eg: sorting, so positions before it are not checkpoints.
+    """
+    stateful = False
+    buffering = False
 
     def __init__(self, settings):
         self.settings = settings
 
-    def transform(self, data: str) -> str:
-        """Transform data"""
+    def transform(self, data: str) -> Optional[Union[str, List[str]]]:
+        """
+        Transform data
+
+        Return None to drop data, or a list to emit several data.
+        """
         raise NotImplementedError()
-        
\ No newline at end of file
+
+    def transform_batch(self, batch: List[str]) -> List[str]:
+        """
+        Transform a batch of data, the result may be shorter or longer than batch.
+
+        Per-record transformers are applied to each record, override it to transform batches natively.
+        """
+        transform = self.transform
+        result = []
+        for data in batch:
+            transformed = transform(data)
+            if transformed is None:
+                continue
+            if isinstance(transformed, list):
+                result.extend(transformed)
+            else:
+                result.append(transformed)
+        return result
+
+    def finish(self) -> Iterable[List[str]]:
+        """Return batches held by transformer, it is called when all data transformed."""
+        return []
+
+    def close(self):
+        """Release resources of transformer when all data transformed."""
@@ -0,0 +1,17 @@
+"""Drop blank data."""
+from typing import List, Optional
+
+from project_template.example_etl.transformer.base import BaseTransformer
+
+
+class DropBlankTransformer(BaseTransformer):
+    """
+    Drop data which only contains blank.
+    """
+    def transform(self, data: str) -> Optional[str]:
+        """Return None if data is blank."""
+        return data if data.strip() else None
+
+    def transform_batch(self, batch: List[str]) -> List[str]:
+        """Drop blank data in batch."""
+        return [data for data in batch if data.strip()]
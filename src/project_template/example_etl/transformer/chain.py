@@ -0,0 +1,46 @@
+"""Chain several transformers to transform data in one pass."""
+from typing import Iterator, List, Sequence, Type
+
+from project_template.example_etl.transformer.base import BaseTransformer
+
+
+class ChainTransformer(BaseTransformer):
+    """
+    Transform every batch by transformers one by one.
+
+    Batches are passed between transformers directly, a transformer may drop or emit several data.
+    """
+
+    def __init__(self, transformer_klss: Sequence[Type[BaseTransformer]], settings):
+        super().__init__(settings)
+        self.transformers = [kls(settings) for kls in transformer_klss]
+        self.stateful = any(transformer.stateful for transformer in self.transformers)
+        self.buffering = any(transformer.buffering for transformer in self.transformers)
+
+    def transform(self, data: str) -> List[str]:
+        """Transform data by all transformers."""
+        return self.transform_batch([data])
+
+    def transform_batch(self, batch: List[str]) -> List[str]:
+        """Transform batch by all transformers."""
+        for transformer in self.transformers:
+            if not batch:
+                break
+            batch = transformer.transform_batch(batch)
+        return batch
+
+    def finish(self) -> Iterator[List[str]]:
+        """Pass batches held by every transformer through transformers after it, before they are finished."""
+        for index, transformer in enumerate(self.transformers):
+            for batch in transformer.finish():
+                for following in self.transformers[index + 1:]:
+                    if not batch:
+                        break
+                    batch = following.transform_batch(batch)
+                if batch:
+                    yield batch
+
+    def close(self):
+        """Close all transformers."""
+        for transformer in self.transformers:
+            transformer.close()
@@ -0,0 +1,70 @@
+"""Transform column batches a whole column at once."""
+from typing import Any, Dict, List, Optional
+
+from project_template.example_etl.columns import ColumnBatch, as_columns
+from project_template.example_etl.transformer.base import BaseTransformer
+
+
+class ColumnTransformer(BaseTransformer):
+    """
+    Base of column transformers.
+
+    Batches of dict records are converted to columns, fields are `COLUMN_TRANSFORMER_FIELDS` or all fields.
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.fields: List[str] = list(settings.COLUMN_TRANSFORMER_FIELDS)
+
+    def transform(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Transform a dict record, return None if it is dropped."""
+        return next(self.transform_batch(ColumnBatch.from_rows([data])).rows(), None)
+
+    def transform_batch(self, batch: Any) -> ColumnBatch:
+        """Transform columns of batch."""
+        return self.transform_columns(as_columns(batch))
+
+    def transform_columns(self, batch: ColumnBatch) -> ColumnBatch:
+        """Transform a column batch."""
+        raise NotImplementedError()
+
+
+def _strip(column: List[Any]) -> List[Any]:
+    try:
+        return list(map(str.strip, column))
+    except TypeError:
+        return [value.strip() if isinstance(value, str) else value for value in column]
+
+
+class StripColumnsTransformer(ColumnTransformer):
+    """Remove blank of text values star and end, other values are kept."""
+
+    def transform_columns(self, batch: ColumnBatch) -> ColumnBatch:
+        fields = self.fields or batch.fields
+        columns = dict(batch.columns)
+        for field in fields:
+            if field in columns:
+                columns[field] = _strip(columns[field])
+        return ColumnBatch(columns, len(batch))
+
+
+class SelectColumnsTransformer(ColumnTransformer):
+    """Keep fields in `COLUMN_TRANSFORMER_FIELDS` in order, missing fields are None."""
+
+    def transform_columns(self, batch: ColumnBatch) -> ColumnBatch:
+        return batch.select(self.fields) if self.fields else batch
+
+
+class DropEmptyRowsTransformer(ColumnTransformer):
+    """Drop records whose values of fields are all None or blank text."""
+
+    def transform_columns(self, batch: ColumnBatch) -> ColumnBatch:
+        fields = self.fields or batch.fields
+        mask = [False] * len(batch)
+        for field in fields:
+            if field in batch.columns:
+                mask = [
+                    keep or (value is not None and (not isinstance(value, str) or bool(value.strip())))
+                    for keep, value in zip(mask, batch[field])
+                ]
+        return batch.filter(mask)
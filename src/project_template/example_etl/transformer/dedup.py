@@ -0,0 +1,191 @@
+"""
+Drop duplicate data of a run with bounded memory.
+
+Exact mode keeps digests of data in a set, and spills them to a SQLite file when the set is full.
+Bloom mode keeps a Bloom filter, some unique data is dropped at the configured false positive rate.
+"""
+import math
+import os
+import sqlite3
+import tempfile
+from hashlib import blake2b
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Set
+
+from project_template.example_etl.transformer.base import BaseTransformer
+from project_template.log import get_logger
+
+logger = get_logger(__name__)
+
+DIGEST_SIZE = 16
+# Digests of a query, SQLite limits number of variables.
+QUERY_SIZE = 500
+
+
+def digest(data: Any) -> bytes:
+    """Digest of data, 128 bits make collisions negligible. Data which is not text is digested by its repr."""
+    if not isinstance(data, str):
+        data = repr(data)
+    return blake2b(data.encode('utf-8', 'surrogatepass'), digest_size=DIGEST_SIZE).digest()
+
+
+class DigestSet:
+    """
+    A set of digests, at most `memory_items` digests are in memory.
+
+    When memory is full, digests are moved to a SQLite table, and looked up there by batches.
+    """
+
+    def __init__(self, memory_items: int, spill_dir: Optional[str] = None):
+        self.memory_items = memory_items
+        self.spill_dir = spill_dir or None
+        self.memory: Set[bytes] = set()
+        self.spilled = 0
+        self.path: Optional[str] = None
+        self.connection: Optional[sqlite3.Connection] = None
+
+    def __len__(self) -> int:
+        return len(self.memory) + self.spilled
+
+    def add_new(self, digests: List[bytes]) -> List[bool]:
+        """Add digests, return whether each digest is new, a digest repeated in `digests` is new only once."""
+        memory = self.memory
+        candidates = {item for item in digests if item not in memory}
+        if self.connection is not None and candidates:
+            candidates.difference_update(self._spilled(candidates))
+
+        result = []
+        for item in digests:
+            new = item in candidates
+            if new:
+                candidates.discard(item)
+                memory.add(item)
+            result.append(new)
+
+        if len(memory) >= self.memory_items:
+            self._spill()
+        return result
+
+    def _spilled(self, digests: Iterable[bytes]) -> Set[bytes]:
+        """Digests which are spilled to disk."""
+        found = set()
+        iterator = iter(digests)
+        while chunk := list(islice(iterator, QUERY_SIZE)):
+            cursor = self.connection.execute(
+                f'SELECT digest FROM digests WHERE digest IN ({",".join("?" * len(chunk))})', chunk
+            )
+            found.update(row[0] for row in cursor)
+        return found
+
+    def _spill(self):
+        """Move digests in memory to SQLite file."""
+        if self.connection is None:
+            fd, self.path = tempfile.mkstemp(prefix='dedup-', suffix='.db', dir=self.spill_dir)
+            os.close(fd)
+            # Digests are used by one thread at a time, but it may not be the thread which spills,
+            # eg: file is closed by event loop after an async engine transforms in its executor.
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            # It is a temporary file, durability is not needed.
+            self.connection.execute('PRAGMA journal_mode = OFF')
+            self.connection.execute('PRAGMA synchronous = OFF')
+            self.connection.execute('CREATE TABLE digests (digest BLOB PRIMARY KEY) WITHOUT ROWID')
+        with self.connection:
+            self.connection.executemany('INSERT INTO digests VALUES (?)', ((item,) for item in self.memory))
+        self.spilled += len(self.memory)
+        logger.info('Spill %d digests to %s, %d digests spilled', len(self.memory), self.path, self.spilled)
+        self.memory = set()
+
+    def close(self):
+        """Remove spilled file."""
+        self.memory = set()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            os.remove(self.path)
+
+
+class BloomFilter:
+    """
+    Bloom filter of digests.
+
+    It is sized for `capacity` items at `error_rate`, the false positive rate grows if more items are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, item: bytes) -> Iterator[int]:
+        """Bit positions of digest, they are derived from two halves of digest by double hashing."""
+        first = int.from_bytes(item[:8], 'little')
+        second = int.from_bytes(item[8:], 'little') | 1
+        size = self.size
+        return ((first + i * second) % size for i in range(self.hash_count))
+
+    def __contains__(self, item: bytes) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & 1 << (position & 7) for position in self._positions(item))
+
+    def add_new(self, item: bytes) -> bool:
+        """Add digest, return False if it is probably added before."""
+        bits = self.bits
+        new = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+
+class DedupTransformer(BaseTransformer):
+    """
+    Drop data which is transformed before in a run.
+
+    `DEDUP_TRANSFORMER_MODE` is `exact`, or `bloom` which uses fixed memory but drops some unique data.
+    """
+    stateful = True
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.mode = settings.DEDUP_TRANSFORMER_MODE
+        if self.mode == 'exact':
+            self.digests = DigestSet(settings.DEDUP_TRANSFORMER_MEMORY_ITEMS, settings.DEDUP_TRANSFORMER_SPILL_DIR)
+        elif self.mode == 'bloom':
+            self.bloom = BloomFilter(settings.DEDUP_TRANSFORMER_CAPACITY, settings.DEDUP_TRANSFORMER_ERROR_RATE)
+            logger.info(
+                'Deduplicate by bloom filter of %d bytes and %d hashes', len(self.bloom.bits), self.bloom.hash_count,
+            )
+        else:
+            raise ValueError(f'Unknown dedup transformer mode: {self.mode}')
+        self.dropped = 0
+
+    def transform(self, data: str) -> Optional[str]:
+        """Return None if data is duplicate."""
+        batch = self.transform_batch([data])
+        return batch[0] if batch else None
+
+    def transform_batch(self, batch: List[str]) -> List[str]:
+        """Drop duplicate data in batch."""
+        digests = [digest(data) for data in batch]
+        if self.mode == 'exact':
+            news = self.digests.add_new(digests)
+        else:
+            add_new = self.bloom.add_new
+            news = [add_new(item) for item in digests]
+        result = [data for data, new in zip(batch, news) if new]
+        self.dropped += len(batch) - len(result)
+        return result
+
+    def close(self):
+        """Remove spilled digests."""
+        logger.info('Drop %d duplicate data', self.dropped)
+        if self.mode == 'exact':
+            self.digests.close()
@@ -0,0 +1,155 @@
+"""
+Sort all data of a run with bounded memory.
+
+Data is collected to runs of at most `SORT_TRANSFORMER_MEMORY_ITEMS` records, every run is sorted and spilled
+to a temporary file, and the runs are merged by a heap when all data is transformed.
+"""
+import heapq
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional
+
+from project_template.example_etl.columns import ColumnBatch
+from project_template.example_etl.loader.shard import load_key_function
+from project_template.example_etl.transformer.base import BaseTransformer
+from project_template.log import get_logger, init_worker_log
+
+logger = get_logger(__name__)
+
+# Records pickled at once in a run file, a run is read back by chunks.
+CHUNK_SIZE = 1000
+# Max runs merged at once, more runs are merged by several passes to limit open files.
+MAX_FAN_IN = 256
+
+
+def sort_key(key: str) -> Optional[Callable[[Any], Any]]:
+    """
+    Key function of `SORT_TRANSFORMER_KEY`.
+
+    Data itself if it is empty, a function if it is `module:function`, else a field of dict records.
+    """
+    if not key:
+        return None
+    if ':' in key:
+        return load_key_function(key)
+    return itemgetter(key)
+
+
+def write_run(records: Iterable[Any], spill_dir: Optional[str]) -> str:
+    """Pickle records to a temporary file by chunks, return path of file."""
+    fd, path = tempfile.mkstemp(prefix='sort-', suffix='.run', dir=spill_dir)
+    with open(fd, 'wb') as file:
+        iterator = iter(records)
+        while chunk := list(islice(iterator, CHUNK_SIZE)):
+            pickle.dump(chunk, file, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def read_run(path: str) -> Iterator[Any]:
+    """Yield records of a run file, the file is removed when all records are read."""
+    try:
+        with open(path, 'rb') as file:
+            while True:
+                try:
+                    yield from pickle.load(file)
+                except EOFError:
+                    break
+    finally:
+        os.remove(path)
+
+
+def sort_run(records: List[Any], key: str, reverse: bool, spill_dir: Optional[str]) -> str:
+    """Sort records and write them to a run file, it is called in worker processes too."""
+    records.sort(key=sort_key(key), reverse=reverse)
+    return write_run(records, spill_dir)
+
+
+class SortTransformer(BaseTransformer):
+    """
+    Sort data by `SORT_TRANSFORMER_KEY`, sorted data is emitted by `finish`.
+
+    Runs are sorted by `SORT_TRANSFORMER_WORKERS` processes if it is more than 1, while next run is collected,
+    so at most `workers + 1` runs are in memory. The sort is stable, data with equal keys keep their order.
+    """
+    stateful = True
+    buffering = True
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.key = settings.SORT_TRANSFORMER_KEY
+        self.key_function = sort_key(self.key)
+        self.reverse = settings.SORT_TRANSFORMER_REVERSE
+        self.memory_items = settings.SORT_TRANSFORMER_MEMORY_ITEMS
+        self.spill_dir = settings.SORT_TRANSFORMER_SPILL_DIR or None
+        self.workers = settings.SORT_TRANSFORMER_WORKERS
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending: Deque[Future] = deque()
+        self.records: List[Any] = []
+        self.runs: List[str] = []
+
+    def transform(self, data: str) -> None:
+        """Collect data, it is emitted by `finish`."""
+        self.transform_batch([data])
+
+    def transform_batch(self, batch: List[Any]) -> List[Any]:
+        """Collect a batch, a full run is sorted and spilled. Column batch is collected as dict records."""
+        records = self.records
+        records.extend(batch.rows() if isinstance(batch, ColumnBatch) else batch)
+        while len(records) >= self.memory_items:
+            self._spill(records[:self.memory_items])
+            del records[:self.memory_items]
+        return []
+
+    def _spill(self, records: List[Any]):
+        """Sort a run and write it to a file, in a worker process if there are workers."""
+        if self.workers <= 1:
+            self.runs.append(sort_run(records, self.key, self.reverse, self.spill_dir))
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker_log)
+            if len(self.pending) >= self.workers:
+                self.runs.append(self.pending.popleft().result())
+            self.pending.append(self.executor.submit(sort_run, records, self.key, self.reverse, self.spill_dir))
+        logger.debug('Spill a run of %d records', len(records))
+
+    def finish(self) -> Iterator[List[Any]]:
+        """Merge sorted runs, and records in memory, to batches of `BATCH_SIZE`."""
+        while self.pending:
+            self.runs.append(self.pending.popleft().result())
+        records, self.records = self.records, []
+        records.sort(key=self.key_function, reverse=self.reverse)
+        if self.runs:
+            logger.info('Merge %d sorted runs and %d records in memory', len(self.runs), len(records))
+        # Runs are merged in spill order, and a merged run takes their place, so the merge is stable.
+        while len(self.runs) >= MAX_FAN_IN:
+            runs, self.runs = self.runs[:MAX_FAN_IN], self.runs[MAX_FAN_IN:]
+            self.runs.insert(0, write_run(self._merge(runs), self.spill_dir))
+        runs, self.runs = self.runs, []
+        merged = self._merge(runs + [records]) if runs else iter(records)
+
+        batch_size = self.settings.BATCH_SIZE
+        while batch := list(islice(merged, batch_size)):
+            yield batch
+
+    def _merge(self, runs: List[Any]) -> Iterator[Any]:
+        """Merge run files, and a list of sorted records at the end."""
+        iterables = [read_run(run) if isinstance(run, str) else run for run in runs]
+        return heapq.merge(*iterables, key=self.key_function, reverse=self.reverse)
+
+    def close(self):
+        """Stop workers, and remove runs which are not merged."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        for future in self.pending:
+            if not future.cancelled() and future.exception() is None:
+                self.runs.append(future.result())
+        self.pending.clear()
+        for run in self.runs:
+            os.remove(run)
+        self.runs = []
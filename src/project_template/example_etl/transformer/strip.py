@@ -1,4 +1,6 @@
 """Transform data and remove blank of data star and end."""
+import logging
+from typing import List
 
 from project_template.example_etl.transformer.base import BaseTransformer
 
@@ -13,6 +15,12 @@ class StripTransformer(BaseTransformer):
     """
     def transform(self, data: str) -> str:
         """Remove blank of data star and end."""
-        logger.debug('Strip data: "%s"', data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Strip data: "%s"', data)
         return data.strip()
-        
\ No newline at end of file
+
+    def transform_batch(self, batch: List[str]) -> List[str]:
+        """Remove blank of each data star and end."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Strip %d data', len(batch))
+        return [data.strip() for data in batch]
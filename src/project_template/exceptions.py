@@ -9,7 +9,7 @@ class PluginNotFoundError(ProjectError):
     """PluginNotFoundError"""
 
     def __init__(self, namespace: str, name: str):
-        super().__init__()
+        super().__init__(namespace, name)  # Arguments are kept, so it can be pickled from a worker process.
         self._namespace = namespace
         self._name = name
 
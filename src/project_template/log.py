@@ -1,17 +1,32 @@
 """Logger"""
 
+import atexit
 import logging
 import os
+import queue
 from logging.config import dictConfig
-# from logging.handlers import RotatingFileHandler
-
-from rich.logging import RichHandler
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Tuple
 
 from project_template.config import settings
 
-# 确保日志目录存在
-os.makedirs(settings.LOGPATH, exist_ok=True)
-LOG_FILE_PATH = os.path.join(settings.LOGPATH, 'all.log')
+# Options of applied log config, and listener of queue mode.
+_config: Optional[Tuple] = None
+_listener: Optional[QueueListener] = None
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for a listener in the same process.
+
+    Message is merged in calling thread, so later changes of arguments are not logged,
+    but record is not copied and exception info is kept for rich tracebacks.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 def verbose_formatter(verbose: int) -> str:
@@ -32,8 +47,23 @@ def update_log_level(debug: bool, level: str) -> str:
 
 
 def init_log() -> None:
-    """Init log config."""
+    """
+    Init log config, with a rich stream handler to stdout.
+    It is called by commands, so importing a module does not create log directory or import rich.
+    Config is applied once, it is applied again only if log settings changed.
+
+    If `LOG_QUEUE` is true, loggers only put records to a queue,
+    and a listener thread formats and writes them by handlers.
+    """
+    global _config  # pylint: disable=global-statement
     log_level = update_log_level(settings.DEBUG, str(settings.LOGLEVEL).upper())
+    config = (log_level, settings.VERBOSE, settings.LOGPATH, settings.LOG_QUEUE)
+    if config == _config:
+        return
+    stop_log_listener()
+    _config = config
+    # 确保日志目录存在
+    os.makedirs(settings.LOGPATH, exist_ok=True)
 
     log_config = {
         "version": 1,
@@ -45,18 +75,26 @@ def init_log() -> None:
             'simple': {
                 'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
             },
+            'rich': {
+                'format': '%(asctime)s - %(name)s - %(levelname)-9s - %(filename)-8s : %(lineno)s line - %(message)s',
+                'datefmt': '%m/%d/%Y %H:%M:%S',
+            },
         },
         "handlers": {
             "console": {
-                "formatter": verbose_formatter(settings.VERBOSE),
+                "formatter": 'rich',
                 'level': 'DEBUG',
-                "class": "logging.StreamHandler",
+                "class": "rich.logging.RichHandler",
+                'show_time': False,
+                'show_path': False,
+                'keywords': ["total", "packages", "Fetching"],
+                'rich_tracebacks': True,
             },
             'file': {
                 'class': 'logging.handlers.RotatingFileHandler',
                 'level': 'DEBUG',
                 'formatter': verbose_formatter(settings.VERBOSE),
-                'filename': LOG_FILE_PATH,
+                'filename': os.path.join(settings.LOGPATH, 'all.log'),
                 'maxBytes': 1024 * 1024 * 1024 * 200,  # 200M
                 'backupCount': '5',
                 'encoding': 'utf-8'
@@ -68,35 +106,60 @@ def init_log() -> None:
     }
 
     dictConfig(log_config)
+    if settings.LOG_QUEUE:
+        start_log_listener()
 
 
-def get_logger(name: str) -> logging.Logger:
+def start_log_listener():
+    """Move handlers of root logger to a listener thread, and log to them by a queue."""
+    global _listener  # pylint: disable=global-statement
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(LocalQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def stop_log_listener():
+    """Stop listener thread after queued records are handled, and log by its handlers directly."""
+    if _listener is None:
+        return
+    _listener.stop()
+    _restore_handlers()
+
+
+def init_worker_log():
     """
-    Gets a standard logger with a rich stream handler to stdout.
-    Logger levels: NOTSET(0)|DEBUG(10)|INFO(20)|WARNING(30)|ERROR(40)|CRITICAL(50).
+    Log by handlers directly in a forked worker process, it is called by initializer of worker processes.
+
+    Listener thread is not forked with queue handler, so records put to queue in worker would never be handled.
     """
-    # 初始化日志配置
-    init_log()
-    # 获取根日志记录器
+    if _listener is not None:
+        _restore_handlers()
+
+
+def _restore_handlers():
+    """Replace queue handler of root logger by handlers of listener."""
+    global _listener  # pylint: disable=global-statement
     root_logger = logging.getLogger()
-    # 移除默认的控制台处理器
     for handler in root_logger.handlers[:]:
-        if isinstance(handler, logging.StreamHandler) and not isinstance(handler, RichHandler):
+        if isinstance(handler, LocalQueueHandler):
             root_logger.removeHandler(handler)
-    # 创建并添加RichHandler
-    rich_formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)-9s - %(filename)-8s : %(lineno)s line - %(message)s",
-        datefmt="%m/%d/%Y %H:%M:%S"
-    )
-    rich_handler = RichHandler(show_time=False,
-                               show_path=False,
-                               keywords=["total", "packages", "Fetching"],
-                               rich_tracebacks=True
-                              )
-    rich_handler.setFormatter(rich_formatter)
-    rich_handler.setLevel(logging.INFO)
-    root_logger.addHandler(rich_handler)
-    # 返回特定名称的日志记录器
+    for handler in _listener.handlers:
+        root_logger.addHandler(handler)
+    _listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Gets a standard logger, it is configured by `init_log`.
+    Guard a costly message on hot path by `logger.isEnabledFor(logging.DEBUG)`.
+    Logger levels: NOTSET(0)|DEBUG(10)|INFO(20)|WARNING(30)|ERROR(40)|CRITICAL(50).
+    """
     return logging.getLogger(name)
 
 
@@ -118,5 +181,6 @@ def test_logger():
         logger.exception(e)
 
 if __name__ == '__main__':
+    init_log()
     test_logger()
     
\ No newline at end of file
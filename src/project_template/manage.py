@@ -1,13 +1,23 @@
 """Manage"""
-from typing import Type
-
-from stevedore import ExtensionManager
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple, Type, Union
 
 from project_template.config import settings
-from project_template.exceptions import PluginNotFoundError
-from project_template.example_etl.extractor.base import BaseExtractor
-from project_template.example_etl.loader.base import BaseLoader
+from project_template.exceptions import ProjectError
+from project_template.example_etl.checkpoint import Checkpoint
+from project_template.example_etl.extractor.base import AsyncBaseExtractor, BaseExtractor
+from project_template.example_etl.loader.base import AsyncBaseLoader, BaseLoader
+from project_template.example_etl.metrics import PipelineMetrics, timed_call
+from project_template.example_etl.parallel import (create_pool, parallel_extract_transform, parallel_run_inputs,
+                                                   parallel_transform, transform_batch_in_worker)
+from project_template.example_etl.registry import PluginRegistry
 from project_template.example_etl.transformer.base import BaseTransformer
+from project_template.example_etl.transformer.chain import ChainTransformer
 from project_template.log import get_logger
 
 logger = get_logger(__name__)
@@ -25,37 +35,397 @@ class Manage:
             'example_etl.loader',
             settings.LOADER_NAME,
         )
-        self.transformer_kls: Type[BaseTransformer] = get_extension(
-            'example_etl.transformer',
-            settings.TRANSFORMER_NAME,
-        )
+        transformer_names = settings.TRANSFORMER_NAME
+        if isinstance(transformer_names, str):
+            transformer_names = [transformer_names]
+        self.transformer_klss: List[Type[BaseTransformer]] = [
+            get_extension('example_etl.transformer', name)
+            for name in transformer_names
+        ]
+        # Several transformers are fused to one chain, it is picklable to create transformer in worker processes.
+        self.transformer_kls: Callable[..., BaseTransformer] = self.transformer_klss[0]
+        if len(self.transformer_klss) > 1:
+            self.transformer_kls = partial(ChainTransformer, self.transformer_klss)
 
         self.transformer: BaseTransformer = self.transformer_kls(settings)
+        if self.transformer.stateful and settings.WORKERS > 1:
+            logger.warning('Transformer is stateful, transform data in current process instead of worker processes.')
+        self.checkpoint = Checkpoint(settings.CHECKPOINT_PATH, settings.CHECKPOINT_INTERVAL)
+        self.metrics = PipelineMetrics(settings.METRICS_INTERVAL)
 
     def run(self):
         """Run manage"""
+        if issubclass(self.extractor_kls, AsyncBaseExtractor) or issubclass(self.loader_kls, AsyncBaseLoader):
+            raise ProjectError('Async extractor or loader can only run by async engine.')
+
+        state = None
+        self.checkpoint.bind(self.extractor_kls.checkpoint_id(settings), self.loader_kls.checkpoint_id(settings))
+        if settings.RESUME or settings.INCREMENTAL:
+            state = self.checkpoint.load()
+            if state:
+                self.checkpoint.verify(state)
+            if state and state['completed'] and not settings.INCREMENTAL:
+                logger.info('Last run is completed, nothing to resume.')
+                return
+
+        if settings.OUTPUT_PER_INPUT:
+            self.run_per_input(state)
+            logger.info('Exit example_etl.')
+            return
+
         with self.extractor_kls(settings) as extractor:
             with self.loader_kls(settings) as loader:
-                self.transform(extractor, loader)
+                if state:
+                    logger.info('Continue from checkpoint saved at %s', state['time'])
+                    loader.seek(state['loader'])
+                    extractor.seek(state['extractor'])
+                try:
+                    self.transform(extractor, loader)
+                finally:
+                    self.transformer.close()
         logger.info('Exit example_etl.')
 
+    def run_per_input(self, state: Optional[dict]):
+        """
+        Run a whole pipeline for every split of extractor, eg: every file of a directory, in worker processes.
+
+        Output of every input is written by its own loader, eg: to a file named by input.
+        Completed inputs are saved to checkpoint, an input is run again if it is not completed.
+        """
+        with self.extractor_kls(settings) as extractor:
+            if state:
+                logger.info('Continue from checkpoint saved at %s', state['time'])
+                extractor.seek(state['extractor'])
+            splits = extractor.splits()
+            completed = list(extractor.tell() or [])
+            if not splits and not completed:
+                logger.warning('Extractor has no inputs to run, eg: it extracts a file which is not split.')
+            try:
+                inputs = [(split, extractor.split_settings(split)) for split in splits]
+            except NotImplementedError as ex:
+                raise ProjectError('Extractor can not run a pipeline per input.') from ex
+
+        names = [os.path.basename(str(split)) for split in splits]
+        if len(set(names)) < len(names):
+            raise ProjectError('Inputs have the same name, their outputs would overwrite each other.')
+        try:
+            inputs = [
+                (split, {**overrides, **self.loader_kls.input_settings(settings, name)})
+                for (split, overrides), name in zip(inputs, names)
+            ]
+        except NotImplementedError as ex:
+            raise ProjectError('Loader can not write output per input.') from ex
+
+        workers = max(1, settings.WORKERS)
+        logger.info('Run pipelines of %d inputs in %d worker processes', len(inputs), workers)
+        self.metrics = PipelineMetrics(settings.METRICS_INTERVAL)
+        results = parallel_run_inputs(
+            self.extractor_kls, self.transformer_kls, self.loader_kls, settings, inputs, workers,
+        )
+        for split, stages in results:
+            for metrics, stage in zip(self.metrics.stages.values(), stages):
+                metrics.merge(stage)
+            completed.append(split)
+            if self.checkpoint.due():
+                self.checkpoint.save(completed, None)
+            self.metrics.maybe_report()
+        self.checkpoint.save(completed, None, completed=True)
+        logger.info('Data processed.')
+        self.metrics.report(final=True)
+
     def transform(self, extractor: BaseExtractor, loader: BaseLoader):
-        """Transform data from extractor to loader."""
+        """
+        Transform data from extractor to loader.
+
+        Positions of extractor and loader are saved to checkpoint periodically, when all data processed,
+        and when it is interrupted.
+        """
+        logger.info('Start transformer data ......')
+        self.metrics = PipelineMetrics(settings.METRICS_INTERVAL)
+        observe_load = self.metrics.load.observe
+        # Data of streaming extractor is flushed after every batch, since it may wait long for the next batch.
+        streaming = extractor.streaming
+        position = extractor.tell()
+        # Whether loader has no data after `position`, it is false while a batch is loaded.
+        synced = True
+        # Positions of the last checkpoint of this run, or where it starts, eg: before sorted data is loaded.
+        saved = None if position is None else (position, loader.tell())
+        try:
+            for batch, batch_position in self.transform_batches(extractor):
+                synced = False
+                start = time.perf_counter()
+                loader.load_batch(batch)
+                if streaming:
+                    loader.flush()
+                observe_load(batch, time.perf_counter() - start)
+                if batch_position is not None:
+                    position = batch_position
+                    synced = True
+                    if self.checkpoint.due():
+                        saved = (position, loader.tell())
+                        self.checkpoint.save(*saved)
+                self.metrics.maybe_report()
+        except KeyboardInterrupt:
+            # A streaming run is stopped by interrupt, it can be resumed from here.
+            # Loader position includes batches without extractor position, eg: part of an interrupted batch,
+            # or data emitted by a buffering transformer, then the last checkpoint is saved.
+            if position is not None and synced:
+                self.checkpoint.save(position, loader.tell())
+            elif saved is not None:
+                self.checkpoint.save(*saved)
+            raise
+
+        loader.finish()
+        if position is not None:
+            self.checkpoint.save(position, loader.tell(), completed=True)
+        logger.info('Data processed.')
+        self.metrics.report(final=True)
+
+    def transform_batches(self, extractor: BaseExtractor) -> Iterator[Tuple[List[str], Optional[Any]]]:
+        """Yield transformed batches, and extractor position after every batch if it can be a checkpoint."""
+        if settings.WORKERS > 1 and not self.transformer.stateful and not extractor.streaming:
+            yield from self.parallel_transform(extractor)
+            return
+        if settings.WORKERS > 1 and extractor.streaming:
+            logger.info('Extractor is streaming, transform data in current process to load it without delay.')
+
+        transform_batch = self.transformer.transform_batch
+        observe_transform = self.metrics.transform.observe
+        buffering = self.transformer.buffering
+        for batch in self.metrics.extract.timed(extractor.extract_batches(settings.BATCH_SIZE)):
+            start = time.perf_counter()
+            transformed = transform_batch(batch)
+            observe_transform(transformed, time.perf_counter() - start)
+            yield transformed, None if buffering else extractor.tell()
+        for batch in self.metrics.transform.timed(self.transformer.finish()):
+            yield batch, None
+        if buffering:
+            yield [], extractor.tell()
+
+    def parallel_transform(self, extractor: BaseExtractor) -> Iterator[Tuple[List[str], Optional[Any]]]:
+        """
+        Transform data in worker processes.
+
+        Workers extract splits by themselves if extractor can be split,
+        else batches are extracted in current process and sent to workers.
+        Data is loaded out of order if `ORDERED` is false, so there is only a checkpoint at the end.
+        Workers measure extract and transform stages of splits, else transform latency is the time waiting for
+        workers.
+        """
+        ordered = settings.ORDERED
+        splits = extractor.splits()
+        if splits:
+            logger.info('Extract and transform %d splits in %d worker processes', len(splits), settings.WORKERS)
+            results = parallel_extract_transform(
+                self.extractor_kls,
+                self.transformer_kls,
+                settings,
+                splits,
+                workers=settings.WORKERS,
+                ordered=ordered,
+                metrics=self.metrics,
+            )
+            for index, batches in enumerate(results):
+                # Position is saved with the last batch of a split.
+                last = next(batches, None)
+                for batch in batches:
+                    yield last, None
+                    last = batch
+                if last is not None:
+                    yield last, extractor.split_position(splits[index]) if ordered else None
+            if not ordered:
+                yield [], extractor.split_position(splits[-1])
+            return
+
+        logger.info('Transform data in %d worker processes', settings.WORKERS)
+        positions: deque = deque()
+
+        def extract_batches():
+            for batch in self.metrics.extract.timed(extractor.extract_batches(settings.BATCH_SIZE)):
+                positions.append(extractor.tell())
+                yield batch
+
+        results = parallel_transform(
+            self.transformer_kls,
+            settings,
+            extract_batches(),
+            workers=settings.WORKERS,
+            ordered=ordered,
+        )
+        # Every batch has one transformed batch, so positions are in the same order if it is ordered.
+        for batch in self.metrics.transform.timed(results):
+            yield batch, positions.popleft() if ordered else None
+        if not ordered:
+            yield [], extractor.tell()
+
+
+class AsyncManage(Manage):
+    """
+    Async manager
+
+    Extract, transform and load run as concurrent stages connected by bounded queues,
+    so waiting on extractor or loader I/O overlaps with transformation.
+    Sync extractor and loader are run in threads, transformer runs in a thread, or in worker processes.
+    """
+
+    def run(self):
+        """Run manage in an event loop"""
+        if settings.RESUME or settings.INCREMENTAL:
+            logger.warning('Checkpoint is not supported by async engine, run from start.')
+        if settings.OUTPUT_PER_INPUT:
+            logger.warning('Output per input is not supported by async engine, write output of all inputs together.')
+        asyncio.run(self.run_async())
+        logger.info('Exit example_etl.')
+
+    async def run_async(self):
+        """Run manage"""
+        async with _async_plugin(self.extractor_kls) as extractor:
+            async with _async_plugin(self.loader_kls) as loader:
+                try:
+                    await self.transform_async(extractor, loader)
+                finally:
+                    self.transformer.close()
+
+    async def transform_async(self, extractor: AsyncBaseExtractor, loader: AsyncBaseLoader):
+        """Transform data from extractor to loader by concurrent stages."""
         logger.info('Start transformer data ......')
-        for i in extractor.extract():
-            data = self.transformer.transform(i)
-            loader.load(data)
+        self.metrics = metrics = PipelineMetrics(settings.METRICS_INTERVAL)
+        loop = asyncio.get_running_loop()
+        extracted: asyncio.Queue = asyncio.Queue(settings.QUEUE_SIZE)
+        # Transformed batches are queued as futures in input order, so at most `QUEUE_SIZE` batches are transforming.
+        transformed: asyncio.Queue = asyncio.Queue(settings.QUEUE_SIZE)
+
+        if self.transformer.stateful:
+            # Batches are transformed one by one in input order by a thread.
+            executor = ThreadPoolExecutor(max_workers=1)
+            transform_batch = self.transformer.transform_batch
+        elif settings.WORKERS > 1:
+            executor = create_pool(settings, self.transformer_kls, settings.WORKERS)
+            transform_batch = transform_batch_in_worker
+        else:
+            executor = None
+            transform_batch = self.transformer.transform_batch
+
+        async def extract():
+            start = time.perf_counter()
+            async for batch in extractor.extract_batches(settings.BATCH_SIZE):
+                metrics.extract.observe(batch, time.perf_counter() - start)
+                await extracted.put(batch)
+                start = time.perf_counter()
+            await extracted.put(None)
+
+        async def transform():
+            while (batch := await extracted.get()) is not None:
+                await transformed.put(loop.run_in_executor(executor, timed_call, transform_batch, batch))
+            # Batches held by transformer are emitted after all batches are transformed, by the same thread.
+            finished = iter(self.transformer.finish())
+            finish_executor = executor if self.transformer.stateful else None
+            while True:
+                batch, seconds = await loop.run_in_executor(finish_executor, timed_call, next, finished, None)
+                if batch is None:
+                    break
+                future = loop.create_future()
+                future.set_result((batch, seconds))
+                await transformed.put(future)
+            await transformed.put(None)
+
+        async def load():
+            while (future := await transformed.get()) is not None:
+                batch, seconds = await future
+                metrics.transform.observe(batch, seconds)
+                start = time.perf_counter()
+                await loader.load_batch(batch)
+                if extractor.streaming:
+                    await loader.flush()
+                metrics.load.observe(batch, time.perf_counter() - start)
+                metrics.maybe_report()
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(extract())
+                group.create_task(transform())
+                group.create_task(load())
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
+        await loader.finish()
         logger.info('Data processed.')
+        metrics.report(final=True)
+
+
+class _ThreadExtractor(AsyncBaseExtractor):
+    """Run a sync extractor in threads."""
+
+    def __init__(self, extractor_kls: Type[BaseExtractor], settings):  # pylint: disable=super-init-not-called
+        self.extractor_kls = extractor_kls
+        self.settings = settings
+        self.extractor = None
+
+    async def setup(self):
+        self.extractor = await asyncio.to_thread(self.extractor_kls, self.settings)
+        self.streaming = self.extractor.streaming
+
+    async def extract_batches(self, batch_size: int) -> AsyncIterator[List[str]]:
+        iterator = iter(self.extractor.extract_batches(batch_size))
+        while (batch := await asyncio.to_thread(next, iterator, None)) is not None:
+            yield batch
+
+    async def close(self):
+        await asyncio.to_thread(self.extractor.close)
+
+
+class _ThreadLoader(AsyncBaseLoader):
+    """Run a sync loader in threads."""
+
+    def __init__(self, loader_kls: Type[BaseLoader], settings):  # pylint: disable=super-init-not-called
+        self.loader_kls = loader_kls
+        self.settings = settings
+        self.loader = None
+
+    async def setup(self):
+        self.loader = await asyncio.to_thread(self.loader_kls, self.settings)
+
+    async def load_batch(self, batch: List[str]):
+        await asyncio.to_thread(self.loader.load_batch, batch)
+
+    async def flush(self):
+        await asyncio.to_thread(self.loader.flush)
+
+    async def finish(self):
+        await asyncio.to_thread(self.loader.finish)
+
+    async def close(self):
+        await asyncio.to_thread(self.loader.close)
+
+
+def _async_plugin(kls: type) -> Union[AsyncBaseExtractor, AsyncBaseLoader]:
+    """Create async plugin, sync plugin is wrapped to run in threads."""
+    if issubclass(kls, (AsyncBaseExtractor, AsyncBaseLoader)):
+        return kls(settings)
+    if issubclass(kls, BaseExtractor):
+        return _ThreadExtractor(kls, settings)
+    return _ThreadLoader(kls, settings)
+
+
+_registry: Optional[PluginRegistry] = None
+
+
+def get_registry() -> PluginRegistry:
+    """Get the plugin registry of current process."""
+    global _registry  # pylint: disable=global-statement
+    if _registry is None:
+        _registry = PluginRegistry(settings.PLUGIN_CACHE_PATH)
+    return _registry
 
 
 def get_extension(namespace: str, name: str):
     """Get extension by name from namespace."""
-    extension_manager = ExtensionManager(namespace=namespace, invoke_on_load=False)
-    for ext in extension_manager.extensions:
-        if ext.name == name:
-            logger.info('Load plugin: %s in namespace "%s"', ext.plugin, namespace)
-            return ext.plugin
-
-    raise PluginNotFoundError(namespace=namespace, name=name)
-    
\ No newline at end of file
+    plugin = get_registry().get(namespace, name)
+    logger.info('Load plugin: %s in namespace "%s"', plugin, namespace)
+    return plugin
+
+
+def get_extension_names(namespace: str) -> List[str]:
+    """Get names of all extensions in namespace."""
+    return get_registry().names(namespace)
@@ -1,9 +1,81 @@
 """Test config"""
 import pytest
 from click.testing import CliRunner
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from project_template.config import settings
+from project_template.example_blog import views
+from project_template.example_blog.counts import count_strategy_of
+from project_template.example_blog.dependencies import get_db
+from project_template.example_blog.models import BaseModel
+from project_template.example_blog.services import create_cache
 
 
 @pytest.fixture()
 def clicker():
     """clicker fixture"""
     yield CliRunner()
+
+
+@pytest.fixture()
+def override_settings():
+    """Override settings in a test, and restore them when test done."""
+    origin = {}
+
+    def _override(**kwargs):
+        for name, value in kwargs.items():
+            origin.setdefault(name, settings.get(name))
+            settings.set(name, value)
+
+    yield _override
+    for name, value in origin.items():
+        settings.set(name, value)
+
+
+@pytest.fixture()
+def etl_files(tmp_path, override_settings):
+    """Point file extractor and file loader to temporary files."""
+    extractor_path = tmp_path / 'foo.txt'
+    loader_path = tmp_path / 'bar.txt'
+    extractor_path.write_text(''.join(f' line {i} \n' for i in range(25)), encoding='utf-8')
+    override_settings(
+        FILE_EXTRACTOR_PATH=str(extractor_path),
+        FILE_LOADER_PATH=str(loader_path),
+        CHECKPOINT_PATH=str(tmp_path / 'checkpoint.json'),
+    )
+    yield extractor_path, loader_path
+
+
+@pytest.fixture()
+def sqlite_url(tmp_path) -> str:
+    """SQLite database with blog tables"""
+    url = f'sqlite:///{tmp_path / "etl.db"}'
+    engine = create_engine(url)
+    BaseModel.metadata.create_all(engine)
+    engine.dispose()
+    yield url
+
+
+@pytest.fixture()
+def blog_session(sqlite_url):
+    """Session of SQLite blog database"""
+    engine = create_engine(sqlite_url)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture()
+def blog_client(blog_session, monkeypatch, override_settings):
+    """Client of blog views on SQLite blog database, with empty caches."""
+    override_settings(BLOG_CACHE_ENABLED=True)
+    service = views._service  # pylint: disable=protected-access
+    monkeypatch.setattr(service, 'cache', create_cache('article'))
+    monkeypatch.setattr(service.dao, 'counts', count_strategy_of(service.dao.model))
+    app = FastAPI()
+    app.include_router(views.router)
+    app.dependency_overrides[get_db] = lambda: blog_session
+    yield TestClient(app)
@@ -0,0 +1,124 @@
+"""Test async database path of blog"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from project_template.example_blog import async_views
+from project_template.example_blog.cache import LRUCache, ReadThroughCache
+from project_template.example_blog.dao import AsyncArticleDAO
+from project_template.example_blog.db import async_url
+from project_template.example_blog.dependencies import get_async_db
+from project_template.example_blog.schemas import CreateArticleSchema, UpdateArticleSchema
+from project_template.example_blog.services import AsyncArticleService, create_cache
+
+
+@pytest.fixture()
+def async_session_factory(sqlite_url):
+    """Async session factory of SQLite blog database by aiosqlite"""
+    engine = create_async_engine(async_url(make_url(sqlite_url)), poolclass=NullPool)
+    yield async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def test_async_url():
+    """Async driver is chosen by database."""
+    assert async_url(make_url('sqlite:///foo.db')).drivername == 'sqlite+aiosqlite'
+    assert async_url(make_url('mysql://root@localhost/blog')).drivername == 'mysql+aiomysql'
+
+
+def test_async_service(async_session_factory, override_settings):
+    """CRUD, pages and counts of async service."""
+    override_settings(BLOG_COUNT_STRATEGY='counter')
+    service = AsyncArticleService(ReadThroughCache(LRUCache(100, ttl=60), 'article'))
+    service.dao = AsyncArticleDAO()
+
+    async def run():
+        async with async_session_factory() as session:
+            pks = [(await service.create(session, CreateArticleSchema(title=f'{i}'))).id for i in range(5)]
+            assert (await service.get_by_id(session, pks[0])).title == '0'
+            await service.patch(session, pks[0], UpdateArticleSchema(title='a'))
+            assert (await service.get_by_id(session, pks[0])).title == 'a'
+            await service.delete(session, pks[1])
+            assert await service.get_by_id(session, pks[1]) is None
+            assert await service.total(session) == 4
+            assert [article.title for article in await service.get(session, offset=1, limit=2)] == ['2', '3']
+
+            titles, cursor = [], None
+            while True:
+                page, cursor = await service.get_page(session, cursor=cursor, limit=3)
+                titles.extend(article.title for article in page)
+                if cursor is None:
+                    break
+            assert titles == ['a', '2', '3', '4']
+
+    asyncio.run(run())
+
+
+def test_async_single_flight():
+    """Concurrent misses of a key are loaded once in event loop."""
+    cache = ReadThroughCache(LRUCache(10, ttl=0))
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def run():
+        return await asyncio.gather(*(cache.get_async('key', load) for _ in range(8)))
+
+    assert asyncio.run(run()) == ['value'] * 8
+    assert len(loads) == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_async_cancelled_load():
+    """Waiters retry the load when the first caller is cancelled."""
+    cache = ReadThroughCache(LRUCache(10, ttl=0))
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return 'value'
+
+    async def run():
+        first = asyncio.create_task(cache.get_async('key', load))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.get_async('key', load)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == ['value'] * 3
+    assert len(loads) == 2
+
+
+def test_async_views(async_session_factory, monkeypatch, override_settings):
+    """Async views serve the same API."""
+    override_settings(BLOG_CACHE_ENABLED=True)
+    monkeypatch.setattr(async_views._service, 'cache', create_cache('article'))  # pylint: disable=protected-access
+
+    async def get_test_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(async_views.router)
+    app.dependency_overrides[get_async_db] = get_test_db
+    with TestClient(app) as client:
+        for i in range(3):
+            assert client.post('/articles', json={'title': f'{i}'}).status_code == 200
+        response = client.get('/articles', params={'cursor': '', 'limit': 2})
+        assert [article['title'] for article in response.json()] == ['0', '1']
+        response = client.get('/articles', params={'cursor': response.headers['X-Next-Cursor']})
+        assert [article['title'] for article in response.json()] == ['2']
+        pk = response.json()[0]['id']
+        assert client.patch(f'/articles/{pk}', json={'title': 'b'}).json()['title'] == 'b'
+        assert client.get(f'/articles/{pk}').json()['title'] == 'b'
@@ -0,0 +1,30 @@
+"""Test benchmark"""
+from __future__ import annotations  # PEP 585
+
+import json
+
+import pytest
+
+from project_template.example_etl.bench import Bench, generate_input
+
+
+@pytest.mark.parametrize('distribution', ['fixed', 'uniform', 'normal'])
+def test_generate_input(tmp_path, distribution: str):
+    """Input is about size bytes, and same seed generates same input."""
+    first, second = tmp_path / 'first.txt', tmp_path / 'second.txt'
+    lines = generate_input(first, 10000, 40, distribution, seed=1)
+    assert generate_input(second, 10000, 40, distribution, seed=1) == lines
+    assert first.read_bytes() == second.read_bytes()
+    assert 10000 <= first.stat().st_size < 10000 + 200
+    assert len(first.read_text(encoding='utf-8').splitlines()) == lines
+
+
+def test_bench(tmp_path):
+    """Every combination is reported, failed one has an error."""
+    report = Bench(tmp_path, size=5000, line_length=20).run(['file'], ['strip'], ['file', 'missing'])
+    json.dumps(report)
+    ok, failed = report['cases']
+    assert ok['records'] == report['input']['lines']
+    assert ok['peak_rss_mb'] > 0
+    assert [stage['stage'] for stage in ok['stages']] == ['extract', 'transform', 'load']
+    assert 'missing' in failed['error']
@@ -0,0 +1,93 @@
+"""Test cache of blog services"""
+import threading
+import time
+
+from project_template.example_blog import cache as cache_module
+from project_template.example_blog.cache import MISSING, LRUCache, ReadThroughCache
+from project_template.example_blog.schemas import CreateArticleSchema, UpdateArticleSchema
+from project_template.example_blog.services import ArticleService
+
+
+def test_lru_cache(monkeypatch):
+    """The least recently used key is evicted, and a key expires after ttl."""
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    lru = LRUCache(2, ttl=10)
+    lru.set('a', 1)
+    lru.set('b', None)
+    assert lru.get('a') == 1
+    lru.set('c', 3)
+    assert lru.get('b') is MISSING
+    assert lru.evictions == 1
+    now[0] += 10
+    assert lru.get('a') is MISSING
+    assert len(lru) == 1
+
+
+def test_read_through_single_flight():
+    """Concurrent misses of a key are loaded once."""
+    cache = ReadThroughCache(LRUCache(10, ttl=0))
+    loads = []
+
+    def load():
+        loads.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('key', load))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['value'] * 8
+    assert len(loads) == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == 7
+
+
+def test_read_through_invalidate():
+    """Value loaded before a write is not cached, generational keys are invalidated by any write."""
+    cache = ReadThroughCache(LRUCache(10, ttl=0))
+
+    def stale_load():
+        cache.invalidate('key')
+        return 'stale'
+
+    assert cache.get('key', stale_load) == 'stale'
+    assert cache.get('key', lambda: 'fresh') == 'fresh'
+    assert cache.get('key', lambda: 'unused') == 'fresh'
+
+    assert cache.get_generational('page', lambda: [1]) == [1]
+    assert cache.get_generational('page', lambda: [2]) == [1]
+    cache.invalidate()
+    assert cache.get_generational('page', lambda: [2]) == [2]
+
+
+def test_service_cache(blog_session):
+    """Reads are cached across sessions, and writes invalidate them."""
+    session = blog_session
+    service = ArticleService(ReadThroughCache(LRUCache(100, ttl=60), 'article'))
+    pk = service.create(session, CreateArticleSchema(title='a')).id
+    assert service.get_by_id(session, pk).title == 'a'
+    session.close()
+    assert service.get_by_id(session, pk).title == 'a'
+    assert [article.title for article in service.get(session)] == ['a']
+    assert service.cache_stats()['hits'] == 1
+
+    service.patch(session, pk, UpdateArticleSchema(title='b'))
+    assert service.get_by_id(session, pk).title == 'b'
+    service.create(session, CreateArticleSchema(title='c'))
+    assert [article.title for article in service.get(session)] == ['b', 'c']
+    service.delete(session, pk)
+    assert service.get_by_id(session, pk) is None
+
+
+def test_service_cache_miss_then_create(blog_session):
+    """A cached miss of an id is invalidated when the id is created."""
+    session = blog_session
+    service = ArticleService(ReadThroughCache(LRUCache(100, ttl=60), 'article'))
+    assert service.get_by_id(session, 1) is None
+    pk = service.create(session, CreateArticleSchema(title='a')).id
+    assert pk == 1
+    assert service.get_by_id(session, pk).title == 'a'
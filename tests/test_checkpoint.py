@@ -0,0 +1,151 @@
+"""Test checkpoint"""
+from __future__ import annotations  # PEP 585
+
+import json
+from pathlib import Path
+
+import pytest
+
+from project_template.config import settings
+from project_template.example_etl.extractor.file import FileExtractor
+from project_template.example_etl.loader.file import FileLoader
+from project_template.exceptions import ProjectError
+from project_template.manage import Manage
+
+
+def _expect(path) -> str:
+    return ''.join(line.strip() for line in path.read_text(encoding='utf-8').splitlines())
+
+
+@pytest.mark.parametrize(
+    ['workers', 'mmap'],
+    [(1, False), (1, True), (2, False), (2, True)],
+)
+def test_incremental(etl_files, override_settings, workers: int, mmap: bool):
+    """Only appended data is processed by incremental run."""
+    extractor_path, loader_path = etl_files
+    override_settings(WORKERS=workers, FILE_EXTRACTOR_MMAP=mmap, FILE_EXTRACTOR_RANGE_SIZE=32, BATCH_SIZE=4)
+    Manage().run()
+    state = json.loads(Path(settings.CHECKPOINT_PATH).read_text(encoding='utf-8'))
+    assert state['completed']
+    assert state['extractor'] == extractor_path.stat().st_size
+
+    with open(extractor_path, 'a', encoding='utf-8') as file:
+        file.write(' new line \n')
+    loader_path.write_text(loader_path.read_text(encoding='utf-8') + 'garbage', encoding='utf-8')
+    override_settings(INCREMENTAL=True)
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == _expect(extractor_path)
+
+
+def test_resume(etl_files, override_settings):
+    """Resume from checkpoint, data loaded after checkpoint is discarded."""
+    extractor_path, loader_path = etl_files
+    content = extractor_path.read_bytes()
+    offset = content.index(b'\n', 50) + 1
+    loaded = ''.join(line.strip() for line in content[:offset].decode().splitlines())
+    loader_path.write_text(loaded + 'partial', encoding='utf-8')
+    with open(settings.CHECKPOINT_PATH, 'w', encoding='utf-8') as file:
+        json.dump({'extractor': offset, 'loader': len(loaded), 'completed': False, 'time': ''}, file)
+
+    override_settings(RESUME=True)
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == _expect(extractor_path)
+
+    # Nothing to do if last run is completed.
+    loader_path.write_text('done', encoding='utf-8')
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == 'done'
+
+
+def test_resume_failed_seek(etl_files, override_settings, monkeypatch):
+    """Output is kept until checkpoint when resume fails, eg: input is missing."""
+    _, loader_path = etl_files
+    loader_path.write_text('loaded' + 'partial', encoding='utf-8')
+    with open(settings.CHECKPOINT_PATH, 'w', encoding='utf-8') as file:
+        json.dump({'extractor': 10, 'loader': 6, 'completed': False, 'time': ''}, file)
+
+    def seek(_self, _position):
+        raise FileNotFoundError()
+
+    monkeypatch.setattr(FileExtractor, 'seek', seek)
+    override_settings(RESUME=True)
+    with pytest.raises(FileNotFoundError):
+        Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == 'loaded'
+
+    with FileLoader(settings):
+        pass
+    assert loader_path.read_text(encoding='utf-8') == 'loaded'
+
+
+def test_incremental_missing_output(etl_files, override_settings):
+    """Output removed after a completed run is written again from start."""
+    extractor_path, loader_path = etl_files
+    Manage().run()
+    loader_path.unlink()
+    with open(extractor_path, 'a', encoding='utf-8') as file:
+        file.write(' new line \n')
+    override_settings(INCREMENTAL=True)
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == 'new line'
+
+
+def test_checkpoint_of_other_input(tmp_path, etl_files, override_settings):
+    """Checkpoint saved for another input is not continued, and output is not touched."""
+    _, loader_path = etl_files
+    Manage().run()
+    output = loader_path.read_text(encoding='utf-8')
+    other_path = tmp_path / 'other.txt'
+    other_path.write_text('other\n' * 100, encoding='utf-8')
+    override_settings(FILE_EXTRACTOR_PATH=str(other_path), INCREMENTAL=True)
+    with pytest.raises(ProjectError):
+        Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == output
+
+
+class InterruptedLoader(FileLoader):
+    """File loader interrupted in the middle of the third batch."""
+    batches = 0
+
+    def load_batch(self, batch: list[str]):
+        self.batches += 1
+        if self.batches == 3:
+            super().load_batch(batch[:1])
+            self.commit()
+            raise KeyboardInterrupt()
+        super().load_batch(batch)
+
+
+def test_resume_interrupted_batch(etl_files, override_settings):
+    """Part of a batch loaded before interrupt is discarded by resume."""
+    extractor_path, loader_path = etl_files
+    override_settings(BATCH_SIZE=4, CHECKPOINT_INTERVAL=0)
+    manage = Manage()
+    manage.loader_kls = InterruptedLoader
+    with pytest.raises(KeyboardInterrupt):
+        manage.run()
+    # Two batches and a record of the third batch are loaded, the checkpoint is after two batches.
+    state = json.loads(Path(settings.CHECKPOINT_PATH).read_text(encoding='utf-8'))
+    assert loader_path.read_text(encoding='utf-8')[state['loader']:] == 'line 8'
+
+    override_settings(RESUME=True)
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == _expect(extractor_path)
+
+
+def test_resume_interrupted_sort(etl_files, override_settings):
+    """Sorted data loaded before interrupt is discarded by resume, it is sorted again from start."""
+    extractor_path, loader_path = etl_files
+    override_settings(BATCH_SIZE=4, CHECKPOINT_INTERVAL=0, TRANSFORMER_NAME='sort')
+    manage = Manage()
+    manage.loader_kls = InterruptedLoader
+    with pytest.raises(KeyboardInterrupt):
+        manage.run()
+    state = json.loads(Path(settings.CHECKPOINT_PATH).read_text(encoding='utf-8'))
+    assert (state['extractor'], state['loader']) == (0, 0)
+
+    override_settings(RESUME=True)
+    Manage().run()
+    lines = extractor_path.read_text(encoding='utf-8').splitlines(True)
+    assert loader_path.read_text(encoding='utf-8') == ''.join(sorted(lines))
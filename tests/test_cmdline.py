@@ -8,6 +8,7 @@ from project_template import __version__
 from project_template.cmdline import main
 
 
+@pytest.mark.usefixtures('etl_files')
 @pytest.mark.parametrize(
     ['invoke_args', 'exit_code', 'output_keyword'],
     [
@@ -28,3 +29,22 @@ def test_main(
     result = clicker.invoke(main, invoke_args)
     assert result.exit_code == exit_code
     assert output_keyword in result.output
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async'])
+def test_run_engine(clicker: CliRunner, etl_files, engine: str):
+    """Data is loaded by engine of option."""
+    extractor_path, loader_path = etl_files
+    result = clicker.invoke(main, ['run', '--engine', engine])
+    assert result.exit_code == 0
+    lines = extractor_path.read_text(encoding='utf-8').splitlines()
+    assert loader_path.read_text(encoding='utf-8') == ''.join(line.strip() for line in lines)
+
+
+@pytest.mark.usefixtures('etl_files')
+def test_run_profile(clicker: CliRunner, tmp_path):
+    """Profile stats are dumped to file."""
+    path = tmp_path / 'run.prof'
+    result = clicker.invoke(main, ['run', '--profile', str(path)])
+    assert result.exit_code == 0
+    assert path.stat().st_size > 0
@@ -0,0 +1,122 @@
+"""Test columnar mode"""
+from __future__ import annotations  # PEP 585
+
+import json
+
+import pytest
+
+from project_template.config import settings
+from project_template.example_etl.columns import ColumnBatch, as_columns
+from project_template.example_etl.transformer.columns import DropEmptyRowsTransformer, StripColumnsTransformer
+from project_template.manage import Manage
+
+
+def test_column_batch():
+    """Column batch can be created from rows, selected and filtered."""
+    batch = ColumnBatch.from_rows([{'a': 1, 'b': 'x'}, {'a': 2}])
+    assert batch.columns == {'a': [1, 2], 'b': ['x', None]}
+    assert len(batch) == 2
+    assert list(batch) == [{'a': 1, 'b': 'x'}, {'a': 2, 'b': None}]
+    assert list(batch.select(['b', 'c']).rows()) == [{'b': 'x', 'c': None}, {'b': None, 'c': None}]
+    assert batch.filter([False, True]) == ColumnBatch({'a': [2], 'b': [None]})
+    assert as_columns([]) == ColumnBatch({})
+    with pytest.raises(TypeError):
+        as_columns(['line'])
+
+
+def test_column_transformers(override_settings):
+    """Column transformers transform whole columns, or a dict record."""
+    override_settings(COLUMN_TRANSFORMER_FIELDS=[])
+    batch = ColumnBatch({'a': [' x ', ' ', None], 'b': [1, None, None]})
+    stripped = StripColumnsTransformer(settings).transform_batch(batch)
+    assert stripped.columns == {'a': ['x', '', None], 'b': [1, None, None]}
+    assert DropEmptyRowsTransformer(settings).transform_batch(batch) == ColumnBatch({'a': [' x '], 'b': [1]})
+    assert StripColumnsTransformer(settings).transform({'a': ' y '}) == {'a': 'y'}
+
+
+@pytest.mark.parametrize(['workers', 'mmap'], [(1, False), (2, True)])
+def test_csv_pipeline(tmp_path, override_settings, workers: int, mmap: bool):
+    """CSV is parsed to columns, transformed and written back with header."""
+    extractor_path, loader_path = tmp_path / 'foo.csv', tmp_path / 'bar.csv'
+    lines = ['id,name,note\n'] + [f'{i}, name {i} ,"a, b"\n' for i in range(20)] + ['20\n']
+    extractor_path.write_text(''.join(lines), encoding='utf-8')
+    override_settings(
+        EXTRACTOR_NAME='csv', LOADER_NAME='csv', TRANSFORMER_NAME=['strip_columns', 'select_columns'],
+        COLUMN_TRANSFORMER_FIELDS=['name', 'id'], TABULAR_FIELDS=[],
+        FILE_EXTRACTOR_PATH=str(extractor_path), FILE_LOADER_PATH=str(loader_path),
+        CHECKPOINT_PATH=str(tmp_path / 'checkpoint.json'),
+        WORKERS=workers, FILE_EXTRACTOR_MMAP=mmap, FILE_EXTRACTOR_RANGE_SIZE=64, BATCH_SIZE=4,
+    )
+    Manage().run()
+    expect = ['name,id'] + [f'name {i},{i}' for i in range(20)] + [',20']
+    assert loader_path.read_text(encoding='utf-8').splitlines() == expect
+
+
+def test_jsonl_pipeline(tmp_path, override_settings):
+    """JSON lines are parsed to columns, missing fields are None."""
+    extractor_path, loader_path = tmp_path / 'foo.jsonl', tmp_path / 'bar.jsonl'
+    records = [{'id': i, 'name': f' {i} '} for i in range(10)] + [{'id': 10}]
+    extractor_path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+    override_settings(
+        EXTRACTOR_NAME='jsonl', LOADER_NAME='jsonl', TRANSFORMER_NAME='strip_columns',
+        COLUMN_TRANSFORMER_FIELDS=[], TABULAR_FIELDS=[],
+        FILE_EXTRACTOR_PATH=str(extractor_path), FILE_LOADER_PATH=str(loader_path),
+        CHECKPOINT_PATH=str(tmp_path / 'checkpoint.json'), BATCH_SIZE=3,
+    )
+    Manage().run()
+    loaded = [json.loads(line) for line in loader_path.read_text(encoding='utf-8').splitlines()]
+    assert loaded == [{'id': i, 'name': str(i)} for i in range(10)] + [{'id': 10, 'name': None}]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_csv_directory(tmp_path, override_settings, workers: int):
+    """Every CSV file of a directory has a header, which is skipped."""
+    extractor_dir, loader_path = tmp_path / 'input', tmp_path / 'bar.csv'
+    extractor_dir.mkdir()
+    for name in 'ab':
+        lines = ['id,name\n'] + [f'{name}{i}, {i} \n' for i in range(5)]
+        (extractor_dir / f'{name}.csv').write_text(''.join(lines), encoding='utf-8')
+    override_settings(
+        EXTRACTOR_NAME='csv', LOADER_NAME='csv', TRANSFORMER_NAME='strip_columns',
+        COLUMN_TRANSFORMER_FIELDS=[], TABULAR_FIELDS=[],
+        FILE_EXTRACTOR_PATH=str(extractor_dir), FILE_LOADER_PATH=str(loader_path),
+        CHECKPOINT_PATH=str(tmp_path / 'checkpoint.json'), WORKERS=workers, BATCH_SIZE=4,
+    )
+    Manage().run()
+    lines = loader_path.read_text(encoding='utf-8').splitlines()
+    assert lines[0] == 'id,name'
+    assert sorted(lines[1:]) == [f'{name}{i},{i}' for name in 'ab' for i in range(5)]
+
+
+def test_jsonl_directory(tmp_path, override_settings):
+    """JSON lines of every file of a glob pattern are parsed to columns."""
+    loader_path = tmp_path / 'bar.jsonl'
+    for name in 'ab':
+        records = [{'id': f'{name}{i}', 'name': f' {i} '} for i in range(5)]
+        (tmp_path / f'{name}.jsonl').write_text(''.join(json.dumps(record) + '\n' for record in records),
+                                                encoding='utf-8')
+    override_settings(
+        EXTRACTOR_NAME='jsonl', LOADER_NAME='jsonl', TRANSFORMER_NAME='strip_columns',
+        COLUMN_TRANSFORMER_FIELDS=[], TABULAR_FIELDS=[],
+        FILE_EXTRACTOR_PATH=str(tmp_path / '*.jsonl'), FILE_LOADER_PATH=str(loader_path),
+        CHECKPOINT_PATH=str(tmp_path / 'checkpoint.json'), BATCH_SIZE=3,
+    )
+    Manage().run()
+    loaded = [json.loads(line) for line in loader_path.read_text(encoding='utf-8').splitlines()]
+    assert sorted(loaded, key=lambda record: record['id']) == [
+        {'id': f'{name}{i}', 'name': str(i)} for name in 'ab' for i in range(5)]
+
+
+def test_csv_record_plugins(tmp_path, override_settings):
+    """Per-record plugins get dict records of a column batch, and columnar loader takes them back."""
+    extractor_path, loader_path = tmp_path / 'foo.csv', tmp_path / 'bar.csv'
+    lines = ['id,name\n'] + [f'{i % 3}, name {i % 3} \n' for i in range(10)]
+    extractor_path.write_text(''.join(lines), encoding='utf-8')
+    override_settings(
+        EXTRACTOR_NAME='csv', LOADER_NAME='csv', TRANSFORMER_NAME=['strip_columns', 'dedup'],
+        COLUMN_TRANSFORMER_FIELDS=[], TABULAR_FIELDS=[],
+        FILE_EXTRACTOR_PATH=str(extractor_path), FILE_LOADER_PATH=str(loader_path),
+        CHECKPOINT_PATH=str(tmp_path / 'checkpoint.json'), BATCH_SIZE=4,
+    )
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8').splitlines() == ['id,name'] + [f'{i},name {i}' for i in range(3)]
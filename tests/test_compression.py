@@ -0,0 +1,74 @@
+"""Test compression"""
+from __future__ import annotations  # PEP 585
+
+import json
+
+import pytest
+
+from project_template.config import settings
+from project_template.example_etl.compression import detect_compression, open_compressed
+from project_template.exceptions import ProjectError
+from project_template.manage import Manage
+
+
+@pytest.mark.parametrize(
+    ['path', 'compression', 'expect'],
+    [
+        ('foo.txt', 'auto', None),
+        ('foo.txt.gz', 'auto', 'gzip'),
+        ('foo.BZ2', 'auto', 'bz2'),
+        ('foo.xz', 'none', None),
+        ('foo.txt', 'xz', 'xz'),
+    ]
+)
+def test_detect_compression(path: str, compression: str, expect):
+    """Test detect compression"""
+    assert detect_compression(path, compression) == expect
+
+
+def test_detect_compression_error():
+    """Test unsupported compression"""
+    with pytest.raises(ProjectError):
+        detect_compression('foo.zip', 'zip')
+
+
+@pytest.mark.parametrize('suffix', ['.gz', '.bz2', '.xz'])
+@pytest.mark.parametrize('thread', [True, False])
+def test_manage_run_compressed(tmp_path, etl_files, override_settings, suffix: str, thread: bool):
+    """Compressed file is read and written as stream."""
+    extractor_path, _ = etl_files
+    content = extractor_path.read_bytes()
+    compression = detect_compression(f'foo{suffix}')
+    compressed_extractor_path = tmp_path / f'foo.txt{suffix}'
+    with open_compressed(str(compressed_extractor_path), 'wb', compression) as file:
+        file.write(content)
+    loader_path = tmp_path / f'bar.txt{suffix}'
+    override_settings(
+        FILE_EXTRACTOR_PATH=str(compressed_extractor_path),
+        FILE_LOADER_PATH=str(loader_path),
+        FILE_COMPRESSION_THREAD=thread,
+        BATCH_SIZE=4,
+    )
+    Manage().run()
+    with open_compressed(str(loader_path), 'rb', compression) as file:
+        assert file.read().decode() == ''.join(line.strip() for line in content.decode().splitlines())
+
+    # Appended data is processed by incremental run, and appended to compressed loader file.
+    # A truncated stream written after the finished run is discarded.
+    with open_compressed(str(compressed_extractor_path), 'ab', compression) as file:
+        file.write(b' new \n')
+    with open(loader_path, 'ab') as file:
+        file.write(b'truncated stream')
+    override_settings(INCREMENTAL=True)
+    Manage().run()
+    with open_compressed(str(loader_path), 'rb', compression) as file:
+        assert file.read().decode().endswith('line 24new')
+
+
+def test_resume_compressed_unfinished(tmp_path, etl_files, override_settings):
+    """Compressed output of an unfinished run can not be continued."""
+    override_settings(FILE_LOADER_PATH=str(tmp_path / 'bar.txt.gz'), RESUME=True)
+    with open(settings.CHECKPOINT_PATH, 'w', encoding='utf-8') as file:
+        json.dump({'extractor': 10, 'loader': None, 'completed': False, 'time': ''}, file)
+    with pytest.raises(ProjectError):
+        Manage().run()
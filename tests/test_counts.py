@@ -0,0 +1,84 @@
+"""Test count strategies of blog"""
+import pytest
+from sqlalchemy import select, text
+
+from project_template.example_blog import cache as cache_module
+from project_template.example_blog.counts import CachedCount, EstimatedCount
+from project_template.example_blog.dao import ArticleDAO
+from project_template.example_blog.models import Article, Counter
+from project_template.example_blog.schemas import CreateArticleSchema
+
+
+@pytest.mark.parametrize('strategy', ['exact', 'counter', 'cached', 'estimate'])
+def test_count_strategy(blog_session, override_settings, strategy: str):
+    """Every strategy counts rows, counter is kept by create and delete."""
+    override_settings(BLOG_COUNT_STRATEGY='exact', BLOG_COUNT_STRATEGIES={'article': strategy})
+    dao = ArticleDAO()
+    pk = dao.create(blog_session, CreateArticleSchema(title='a')).id
+    assert dao.count(blog_session) == 1
+    dao.create(blog_session, CreateArticleSchema(title='b'))
+    dao.delete(blog_session, pk)
+    dao.create(blog_session, CreateArticleSchema(title='c'))
+    # Estimate is an exact count without statistics.
+    assert dao.count(blog_session) == (1 if strategy == 'cached' else 2)
+
+
+def test_counter_created_by_exact_count(blog_session, override_settings):
+    """Counter of existing rows is created by an exact count."""
+    blog_session.add_all(Article(title=f'{i}') for i in range(3))
+    blog_session.commit()
+    override_settings(BLOG_COUNT_STRATEGIES={'article': 'counter'})
+    dao = ArticleDAO()
+    assert dao.count(blog_session) == 3
+    dao.create(blog_session, CreateArticleSchema(title='a'))
+    assert dao.count(blog_session) == 4
+
+
+def test_counter_unknown(blog_session, override_settings, monkeypatch):
+    """Changes of an unknown counter are counted by next read, which does not commit session of caller."""
+    blog_session.add(Counter(name='article', value=None))
+    blog_session.commit()
+    override_settings(BLOG_COUNT_STRATEGIES={'article': 'counter'})
+    dao = ArticleDAO()
+    dao.create(blog_session, CreateArticleSchema(title='a'))
+    dao.create(blog_session, CreateArticleSchema(title='b'))
+
+    def commit():
+        raise AssertionError('Session of caller is committed')
+
+    monkeypatch.setattr(blog_session, 'commit', commit)
+    assert dao.count(blog_session) == 2
+    blog_session.rollback()
+    assert blog_session.scalar(select(Counter.value)) == 2
+
+
+def test_estimated_count(blog_session):
+    """Estimate is read from statistics after ANALYZE."""
+    blog_session.add_all(Article(title=f'{i}') for i in range(5))
+    blog_session.commit()
+    assert EstimatedCount.estimate(blog_session, 'article') is None
+    blog_session.execute(text('ANALYZE'))
+    blog_session.commit()
+    assert EstimatedCount.estimate(blog_session, 'article') == 5
+
+
+def test_cached_count_ttl(blog_session, monkeypatch):
+    """Cached count expires after ttl."""
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    counts = CachedCount(ttl=10)
+    assert counts.count(blog_session, Article) == 0
+    blog_session.add(Article(title='a'))
+    blog_session.commit()
+    assert counts.count(blog_session, Article) == 0
+    now[0] += 10
+    assert counts.count(blog_session, Article) == 1
+
+
+def test_view_total_count(blog_client, blog_session):
+    """Total count is returned in header of list."""
+    blog_session.add_all(Article(title=f'{i}') for i in range(3))
+    blog_session.commit()
+    response = blog_client.get('/articles', params={'limit': 2})
+    assert len(response.json()) == 2
+    assert response.headers['X-Total-Count'] == '3'
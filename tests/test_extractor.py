@@ -0,0 +1,170 @@
+"""Test extractor"""
+from __future__ import annotations  # PEP 585
+
+import json
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, insert
+
+from project_template.config import settings
+from project_template.example_blog.models import Article
+from project_template.example_etl.extractor.file import FileExtractor, split_ranges
+from project_template.example_etl.extractor.sql import SqlExtractor, dump_key, load_key
+from project_template.exceptions import ProjectError
+from project_template.manage import Manage
+
+
+@pytest.mark.parametrize('range_size', [1, 10, 1 << 20])
+def test_split_ranges(tmp_path, range_size: int):
+    """Ranges cover the whole file and end after newline."""
+    path = tmp_path / 'foo.txt'
+    content = b''.join(b'x' * i + b'\n' for i in range(30)) + b'tail'
+    path.write_bytes(content)
+    ranges = split_ranges(str(path), range_size)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(content)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert content[end - 1:end] == b'\n'
+
+
+def test_split_ranges_empty_file(tmp_path):
+    """Empty file has no range."""
+    path = tmp_path / 'foo.txt'
+    path.touch()
+    assert not split_ranges(str(path), 10)
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_file_extractor(etl_files, override_settings, mmap: bool):
+    """Extracted batches are the same in text and mmap mode."""
+    extractor_path, _ = etl_files
+    override_settings(FILE_EXTRACTOR_MMAP=mmap, FILE_EXTRACTOR_RANGE_SIZE=32)
+    extractor = FileExtractor(settings)
+    assert bool(extractor.splits()) is mmap
+    batches = list(extractor.extract_batches(4))
+    assert all(len(batch) <= 4 for batch in batches)
+    assert [line for batch in batches for line in batch] == extractor_path.read_text(encoding='utf-8').splitlines(True)
+
+
+@pytest.mark.parametrize('range_size', [0, -1, '16M'])
+def test_file_extractor_range_size(etl_files, override_settings, range_size):
+    """Range size must be a positive integer."""
+    override_settings(FILE_EXTRACTOR_RANGE_SIZE=range_size)
+    with pytest.raises(ProjectError):
+        FileExtractor(settings)
+
+
+def _insert_articles(url: str, titles: list[str]):
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(insert(Article), [{'title': title, 'body': None} for title in titles])
+    engine.dispose()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+def test_sql_extractor(override_settings, sqlite_url: str, chunk_size: int):
+    """Rows are extracted by keyset chunks in key order."""
+    _insert_articles(sqlite_url, [f'title {i}' for i in range(10)])
+    override_settings(
+        SQL_EXTRACTOR_URL=sqlite_url,
+        SQL_EXTRACTOR_COLUMNS=['title', 'body'],
+        SQL_EXTRACTOR_CHUNK_SIZE=chunk_size,
+        SQL_EXTRACTOR_FORMAT='text',
+    )
+    with SqlExtractor(settings) as extractor:
+        batches = list(extractor.extract_batches(2))
+        assert extractor.tell() == 10
+    assert all(len(batch) <= 2 for batch in batches)
+    assert [data for batch in batches for data in batch] == [f'title {i}\t\n' for i in range(10)]
+
+    override_settings(SQL_EXTRACTOR_FORMAT='dict', SQL_EXTRACTOR_COLUMNS=['title'])
+    with SqlExtractor(settings) as extractor:
+        extractor.seek(8)
+        assert list(extractor.extract()) == [{'title': 'title 8'}, {'title': 'title 9'}]
+
+
+def test_manage_run_sql_incremental(etl_files, override_settings, sqlite_url: str):
+    """New rows are extracted by incremental run."""
+    _, loader_path = etl_files
+    _insert_articles(sqlite_url, ['a', 'b'])
+    override_settings(
+        EXTRACTOR_NAME='sql',
+        SQL_EXTRACTOR_URL=sqlite_url,
+        SQL_EXTRACTOR_COLUMNS=['id', 'title'],
+        SQL_EXTRACTOR_CHUNK_SIZE=1,
+        TRANSFORMER_NAME='drop_blank',
+    )
+    Manage().run()
+    _insert_articles(sqlite_url, ['c'])
+    override_settings(INCREMENTAL=True)
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == '1\ta\n2\tb\n3\tc\n'
+
+
+def test_manage_run_sql_incremental_datetime_key(etl_files, override_settings, sqlite_url: str):
+    """A datetime key is saved in checkpoint and parsed back by incremental run."""
+    _, loader_path = etl_files
+    engine = create_engine(sqlite_url)
+    with engine.begin() as connection:
+        connection.execute(insert(Article), [
+            {'title': title, 'create_time': datetime(2024, 1, day, 12, 30, 15, 500)}
+            for day, title in [(1, 'a'), (2, 'b')]
+        ])
+    override_settings(
+        EXTRACTOR_NAME='sql',
+        SQL_EXTRACTOR_URL=sqlite_url,
+        SQL_EXTRACTOR_KEY='create_time',
+        SQL_EXTRACTOR_COLUMNS=['title'],
+        TRANSFORMER_NAME='drop_blank',
+    )
+    Manage().run()
+    with engine.begin() as connection:
+        connection.execute(insert(Article), [{'title': 'c', 'create_time': datetime(2024, 1, 3)}])
+    engine.dispose()
+    override_settings(INCREMENTAL=True)
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == 'a\nb\nc\n'
+
+
+@pytest.mark.parametrize('key', [None, 3, 'k', datetime(2024, 1, 1, 8), date(2024, 1, 1), Decimal('1.50')])
+def test_sql_key_json(key):
+    """Keys are dumped as json values and loaded back."""
+    assert load_key(json.loads(json.dumps(dump_key(key)))) == key
+
+
+def test_file_extractor_follow(tmp_path, override_settings):
+    """Followed file is read as it grows, partial line waits, rotation and truncation are detected."""
+    path = tmp_path / 'foo.txt'
+    path.write_bytes(b'a\nb\npart')
+    override_settings(FILE_EXTRACTOR_PATH=str(path), FILE_EXTRACTOR_FOLLOW=True, FILE_EXTRACTOR_MMAP=False,
+                      FILE_EXTRACTOR_POLL_INTERVAL=0.01, FILE_EXTRACTOR_IDLE_TIMEOUT=1)
+
+    def write():
+        time.sleep(0.2)
+        with open(path, 'ab') as file:
+            file.write(b'ial\nc\n')
+        time.sleep(0.2)
+        with open(path, 'ab') as file:
+            file.write(b'd\n')
+        path.rename(tmp_path / 'foo.txt.1')
+        path.write_bytes(b'e\nf\n')
+        time.sleep(0.2)
+        path.write_bytes(b'')
+        time.sleep(0.2)
+        path.write_bytes(b'g\n')
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    start = time.monotonic()
+    with FileExtractor(settings) as extractor:
+        assert extractor.streaming
+        lines = [line for batch in extractor.extract_batches(10) for line in batch]
+    writer.join()
+    assert lines == ['a\n', 'b\n', 'partial\n', 'c\n', 'd\n', 'e\n', 'f\n', 'g\n']
+    assert extractor.tell() == 2
+    assert time.monotonic() - start < 5
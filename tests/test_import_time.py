@@ -0,0 +1,39 @@
+"""Test import time of command line"""
+from __future__ import annotations  # PEP 585
+
+import subprocess
+import sys
+
+import pytest
+
+# Generous budget of cumulative import time in microseconds, it only catches a heavy stack imported by accident.
+BUDGET_US = 1_000_000
+
+HEAVY_MODULES = ['fastapi', 'uvicorn', 'sqlalchemy', 'rich', 'project_template.example_blog',
+                 'project_template.example_etl.bench']
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import module in a new interpreter by `python -X importtime`, return cumulative microseconds of modules."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize('module', ['project_template.cmdline', 'project_template.manage'])
+def test_import_time(module: str):
+    """Command line and ETL manager do not import web and database stack, and are imported in budget."""
+    times = import_times(module)
+    heavy = [name for name in times for heavy in HEAVY_MODULES if name == heavy or name.startswith(f'{heavy}.')]
+    assert not heavy
+    assert times[module] < BUDGET_US
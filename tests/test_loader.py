@@ -0,0 +1,159 @@
+"""Test loader"""
+from __future__ import annotations  # PEP 585
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from project_template.config import settings
+from project_template.example_blog.models import Article
+from project_template.example_etl.loader import file as file_loader
+from project_template.example_etl.loader.file import FileLoader
+from project_template.example_etl.loader.shard import ShardFileLoader
+from project_template.example_etl.loader.sql import SqlLoader
+from project_template.manage import Manage
+
+
+def first_char(data: str) -> str:
+    """Key function of shard loader"""
+    return data[:1]
+
+
+def first_code(data: str) -> int:
+    """Key function of shard loader, it returns an int key."""
+    return ord(data[0])
+
+
+@pytest.fixture()
+def shard_settings(tmp_path, override_settings):
+    """Shard loader settings"""
+    override_settings(SHARD_LOADER_PATH=str(tmp_path / 'bar-{shard}.txt'), SHARD_LOADER_COUNT=3)
+    yield [tmp_path / f'bar-{shard}.txt' for shard in range(3)]
+
+
+def test_shard_round_robin(shard_settings, override_settings):
+    """Data is distributed evenly across batches."""
+    override_settings(SHARD_LOADER_KEY='round_robin')
+    with ShardFileLoader(settings) as loader:
+        loader.load_batch(['0', '1'])
+        loader.load_batch(['2', '3', '4', '5', '6'])
+    assert [path.read_text(encoding='utf-8') for path in shard_settings] == ['036', '14', '25']
+
+
+@pytest.mark.parametrize('key', ['hash', f'{__name__}:first_char', f'{__name__}:first_code'])
+def test_shard_hash(shard_settings, override_settings, key: str):
+    """Data with the same key is written to the same shard."""
+    override_settings(SHARD_LOADER_KEY=key)
+    with ShardFileLoader(settings) as loader:
+        loader.load_batch(['a\n', 'b\n', 'a\n'])
+        loader.load_batch(['b\n', 'c\n', 'a\n'])
+        loader.finish()
+    contents = [path.read_text(encoding='utf-8') for path in shard_settings]
+    assert sorted(''.join(contents).splitlines()) == ['a', 'a', 'a', 'b', 'b', 'c']
+    for data in 'abc':
+        assert sum(data in content for content in contents) == 1
+
+
+def test_manage_run_shard(etl_files, shard_settings, override_settings):
+    """Test manage run with shard loader, and continue it incrementally."""
+    extractor_path, _ = etl_files
+    override_settings(LOADER_NAME='shard', TRANSFORMER_NAME=['drop_blank'], BATCH_SIZE=4)
+    Manage().run()
+    with open(extractor_path, 'a', encoding='utf-8') as file:
+        file.write('new\n')
+    override_settings(INCREMENTAL=True)
+    Manage().run()
+    lines = ''.join(path.read_text(encoding='utf-8') for path in shard_settings).splitlines(True)
+    assert sorted(lines) == sorted(extractor_path.read_text(encoding='utf-8').splitlines(True))
+
+
+@pytest.mark.parametrize('commit_every', [1, 7, 10000])
+def test_manage_run_sql(etl_files, override_settings, sqlite_url: str, commit_every: int):
+    """Data is inserted to article table."""
+    extractor_path, _ = etl_files
+    override_settings(
+        LOADER_NAME='sql',
+        SQL_LOADER_URL=sqlite_url,
+        SQL_LOADER_TABLE='article',
+        SQL_LOADER_COLUMN='title',
+        SQL_LOADER_VALUES={'body': 'etl'},
+        SQL_LOADER_COMMIT_EVERY=commit_every,
+        BATCH_SIZE=4,
+    )
+    Manage().run()
+    engine = create_engine(sqlite_url)
+    with engine.connect() as connection:
+        rows = connection.execute(select(Article.title, Article.body).order_by(Article.id)).all()
+    engine.dispose()
+    assert [row.title for row in rows] == [line.strip() for line in extractor_path.read_text().splitlines()]
+    assert {row.body for row in rows} == {'etl'}
+
+
+def test_sql_loader_mapping(override_settings, sqlite_url: str):
+    """Keys of dict data are renamed to columns, and pending rows are rolled back on error."""
+    override_settings(SQL_LOADER_URL=sqlite_url, SQL_LOADER_MAPPING={'name': 'title'}, SQL_LOADER_COMMIT_EVERY=10)
+    with SqlLoader(settings) as loader:
+        loader.load_batch([{'name': 'foo', 'body': 'bar'}])
+    with pytest.raises(ValueError):
+        with SqlLoader(settings) as loader:
+            loader.load_batch([{'name': 'baz'}])
+            raise ValueError()
+
+    engine = create_engine(sqlite_url)
+    with engine.connect() as connection:
+        rows = connection.execute(select(Article.title, Article.body)).all()
+    engine.dispose()
+    assert [tuple(row) for row in rows] == [('foo', 'bar')]
+
+
+def test_file_loader_group_commit(tmp_path, override_settings, monkeypatch):
+    """Data is fsynced every `FILE_LOADER_COMMIT_RECORDS` records, and when its position is a checkpoint."""
+    synced = []
+    monkeypatch.setattr(file_loader.os, 'fsync', synced.append)
+    path = tmp_path / 'bar.txt'
+    override_settings(FILE_LOADER_PATH=str(path), FILE_LOADER_DURABILITY='group_commit',
+                      FILE_LOADER_COMMIT_RECORDS=5, FILE_LOADER_COMMIT_INTERVAL=60000)
+    with FileLoader(settings) as loader:
+        for i in range(12):
+            loader.load(f'{i}\n')
+        assert len(synced) == 2
+        assert path.read_text(encoding='utf-8').count('\n') == 10
+        assert loader.tell() == path.stat().st_size == 26
+        assert len(synced) == 3
+        loader.finish()
+        assert len(synced) == 4
+
+
+def test_file_loader_atomic(tmp_path, override_settings):
+    """Output is replaced when finished, an interrupted output is continued in temporary file."""
+    path = tmp_path / 'bar.txt'
+    override_settings(FILE_LOADER_PATH=str(path), FILE_LOADER_DURABILITY='atomic')
+    path.write_text('old\n', encoding='utf-8')
+    with FileLoader(settings) as loader:
+        loader.load_batch(['a\n', 'b\n'])
+        position = loader.tell()
+        loader.load('c\n')
+    assert path.read_text(encoding='utf-8') == 'old\n'
+
+    with FileLoader(settings) as loader:
+        loader.seek(position)
+        loader.load('d\n')
+        loader.finish()
+        assert loader.tell() == 6
+    assert path.read_text(encoding='utf-8') == 'a\nb\nd\n'
+    assert not (tmp_path / 'bar.txt.tmp').exists()
+
+    with FileLoader(settings) as loader:
+        loader.seek(6)
+        loader.load('e\n')
+    assert path.read_text(encoding='utf-8') == 'a\nb\nd\n'
+    assert (tmp_path / 'bar.txt.tmp').read_text(encoding='utf-8') == 'a\nb\nd\ne\n'
+
+
+@pytest.mark.parametrize('durability', ['buffered', 'group_commit', 'atomic'])
+def test_manage_run_durability(etl_files, override_settings, durability: str):
+    """Test manage run with durability policies of file loader."""
+    extractor_path, loader_path = etl_files
+    override_settings(FILE_LOADER_DURABILITY=durability, FILE_LOADER_COMMIT_RECORDS=4, BATCH_SIZE=3)
+    Manage().run()
+    expect = ''.join(line.strip() for line in extractor_path.read_text(encoding='utf-8').splitlines())
+    assert loader_path.read_text(encoding='utf-8') == expect
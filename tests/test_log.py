@@ -1,7 +1,14 @@
 """Test log"""
+import logging
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import BufferingHandler, QueueHandler, QueueListener
+
 import pytest
 
-from project_template.log import update_log_level, verbose_formatter
+from project_template.log import (
+    LocalQueueHandler, init_log, init_worker_log, stop_log_listener, update_log_level, verbose_formatter,
+)
 
 
 @pytest.mark.parametrize(
@@ -23,3 +30,53 @@ def test_verbose_formatter():
     """Test verbose formatter"""
     assert verbose_formatter(True) == 'verbose'
     assert verbose_formatter(False) == 'simple'
+
+
+def test_init_log_queue(override_settings, tmp_path):
+    """Queue mode logs by a queue handler, and config is applied once."""
+    override_settings(LOG_QUEUE=True, LOGPATH=str(tmp_path))
+    init_log()
+    handlers = logging.getLogger().handlers
+    assert [type(handler) for handler in handlers] == [LocalQueueHandler]
+    init_log()
+    assert logging.getLogger().handlers == handlers
+
+    override_settings(LOG_QUEUE=False)
+    init_log()
+    assert not any(isinstance(handler, QueueHandler) for handler in logging.getLogger().handlers)
+
+
+def test_local_queue_handler():
+    """Message is merged in calling thread, and exception info is kept."""
+    log_queue = queue.SimpleQueue()
+    handler = BufferingHandler(10)
+    listener = QueueListener(log_queue, handler)
+    queue_logger = logging.getLogger('test_local_queue_handler')
+    queue_logger.addHandler(LocalQueueHandler(log_queue))
+    listener.start()
+    args = ['a']
+    try:
+        raise ValueError('foo')
+    except ValueError:
+        queue_logger.error('args: %s', args, exc_info=True)
+    args.append('b')
+    listener.stop()
+    record, = handler.buffer
+    assert record.getMessage() == "args: ['a']"
+    assert record.exc_info[0] is ValueError
+
+
+def _log_in_worker(message: str):
+    logging.getLogger('test_worker_log').warning(message)
+
+
+def test_worker_log(override_settings, tmp_path, capfd):
+    """Worker process forked in queue mode logs by handlers directly."""
+    override_settings(LOG_QUEUE=True, LOGPATH=str(tmp_path))
+    init_log()
+    try:
+        with ProcessPoolExecutor(max_workers=1, initializer=init_worker_log) as executor:
+            executor.submit(_log_in_worker, 'message of worker').result()
+    finally:
+        stop_log_listener()
+    assert 'message of worker' in capfd.readouterr().out
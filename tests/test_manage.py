@@ -0,0 +1,228 @@
+"""Test manage"""
+from __future__ import annotations  # PEP 585
+
+import asyncio
+import re
+import threading
+import time
+
+import pytest
+
+from project_template.config import settings
+from project_template.example_etl import parallel
+from project_template.example_etl.extractor.base import AsyncBaseExtractor, BaseExtractor
+from project_template.example_etl.loader.base import AsyncBaseLoader, BaseLoader
+from project_template.example_etl.transformer.base import BaseTransformer
+from project_template.exceptions import ProjectError
+from project_template.manage import AsyncManage, Manage
+
+
+class ListExtractor(BaseExtractor):
+    """Extract data from a list"""
+
+    def extract(self):
+        yield from ['a', 'b', 'c', 'd', 'e']
+
+
+class UpperTransformer(BaseTransformer):
+    """Upper data"""
+
+    def transform(self, data: str) -> str:
+        return data.upper()
+
+
+class ListLoader(BaseLoader):
+    """Load data to a list"""
+
+    def setup(self):
+        self.data = []
+
+    def load(self, data: str):
+        self.data.append(data)
+
+
+def test_default_batch_protocol():
+    """Per-record plugins are adapted to batch protocol."""
+    batches = list(ListExtractor(settings).extract_batches(2))
+    assert batches == [['a', 'b'], ['c', 'd'], ['e']]
+
+    transformer = UpperTransformer(settings)
+    loader = ListLoader(settings)
+    for batch in batches:
+        loader.load_batch(transformer.transform_batch(batch))
+    assert loader.data == ['A', 'B', 'C', 'D', 'E']
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 1000])
+def test_manage_run(etl_files, override_settings, batch_size: int):
+    """Test manage run with file plugins."""
+    extractor_path, loader_path = etl_files
+    override_settings(BATCH_SIZE=batch_size)
+    Manage().run()
+    expect = ''.join(line.strip() for line in extractor_path.read_text(encoding='utf-8').splitlines())
+    assert loader_path.read_text(encoding='utf-8') == expect
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_manage_run_parallel(etl_files, override_settings, ordered: bool):
+    """Test manage run in worker processes."""
+    extractor_path, loader_path = etl_files
+    override_settings(BATCH_SIZE=1, WORKERS=2, ORDERED=ordered)
+    Manage().run()
+    lines = [line.strip() for line in extractor_path.read_text(encoding='utf-8').splitlines()]
+    output = loader_path.read_text(encoding='utf-8')
+    if ordered:
+        assert output == ''.join(lines)
+    else:
+        assert sorted(re.findall(r'line \d+', output)) == sorted(lines)
+
+
+def test_manage_run_parallel_splits(etl_files, override_settings):
+    """Test workers extract byte ranges of file by themselves."""
+    extractor_path, loader_path = etl_files
+    override_settings(FILE_EXTRACTOR_MMAP=True, FILE_EXTRACTOR_RANGE_SIZE=16, WORKERS=3)
+    Manage().run()
+    expect = ''.join(line.strip() for line in extractor_path.read_text(encoding='utf-8').splitlines())
+    assert loader_path.read_text(encoding='utf-8') == expect
+
+
+class AsyncListExtractor(AsyncBaseExtractor):
+    """Extract data from a list asynchronously"""
+
+    async def extract(self):
+        for data in ['a', 'b', 'c', 'd', 'e']:
+            await asyncio.sleep(0)
+            yield data
+
+
+class AsyncListLoader(AsyncBaseLoader):
+    """Load data to a list asynchronously"""
+
+    loaded: list[str] = []
+
+    async def load(self, data: str):
+        await asyncio.sleep(0)
+        self.loaded.append(data)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_async_manage_run(etl_files, override_settings, workers: int):
+    """Test async manage run with sync file plugins."""
+    extractor_path, loader_path = etl_files
+    override_settings(BATCH_SIZE=3, QUEUE_SIZE=2, WORKERS=workers)
+    AsyncManage().run()
+    expect = ''.join(line.strip() for line in extractor_path.read_text(encoding='utf-8').splitlines())
+    assert loader_path.read_text(encoding='utf-8') == expect
+
+
+@pytest.mark.parametrize('manage_kls', [Manage, AsyncManage])
+def test_manage_run_follow(etl_files, override_settings, manage_kls):
+    """Batches of a followed file are flushed when they are loaded, not when more data comes."""
+    extractor_path, loader_path = etl_files
+    override_settings(FILE_EXTRACTOR_FOLLOW=True, FILE_EXTRACTOR_POLL_INTERVAL=0.01, FILE_EXTRACTOR_IDLE_TIMEOUT=2,
+                      FILE_LOADER_FLUSH_INTERVAL=60)
+    expect = ''.join(line.strip() for line in extractor_path.read_text(encoding='utf-8').splitlines())
+
+    def loaded() -> str:
+        return loader_path.read_text(encoding='utf-8') if loader_path.exists() else ''
+
+    runner = threading.Thread(target=manage_kls().run)
+    runner.start()
+    try:
+        deadline = time.monotonic() + 1
+        while loaded() != expect and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert runner.is_alive()
+        assert loaded() == expect
+    finally:
+        runner.join()
+
+
+def test_async_manage_run_async_plugins(override_settings):
+    """Test async manage run with async plugins."""
+    override_settings(BATCH_SIZE=2)
+    manage = AsyncManage()
+    manage.extractor_kls = AsyncListExtractor
+    manage.loader_kls = AsyncListLoader
+    AsyncListLoader.loaded = []
+    manage.run()
+    assert AsyncListLoader.loaded == ['a', 'b', 'c', 'd', 'e']
+
+    with pytest.raises(ProjectError):
+        Manage.run(manage)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_manage_run_transformer_chain(etl_files, override_settings, workers: int):
+    """Test manage run with several transformers."""
+    extractor_path, loader_path = etl_files
+    extractor_path.write_text(' a \n\n b \n   \n', encoding='utf-8')
+    override_settings(TRANSFORMER_NAME=['strip', 'drop_blank'], WORKERS=workers, BATCH_SIZE=1)
+    Manage().run()
+    assert loader_path.read_text(encoding='utf-8') == 'ab'
+
+
+@pytest.fixture()
+def input_dir(tmp_path, override_settings):
+    """Several input files of different sizes in a directory."""
+    path = tmp_path / 'inputs'
+    path.mkdir()
+    for i, count in enumerate([3, 20, 0, 7]):
+        (path / f'{i}.txt').write_text(''.join(f' line {i}-{j} \n' for j in range(count)), encoding='utf-8')
+    override_settings(FILE_EXTRACTOR_PATH=str(path), CHECKPOINT_PATH=str(tmp_path / 'checkpoint.json'))
+    yield path
+
+
+def _lines(text: str) -> list[str]:
+    return sorted(re.findall(r'line \d+-\d+', text))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_manage_run_input_dir(input_dir, tmp_path, override_settings, workers: int):
+    """Files of a directory are loaded to one output, and only new files are extracted in incremental run."""
+    loader_path = tmp_path / 'out.txt'
+    override_settings(FILE_LOADER_PATH=str(loader_path), WORKERS=workers, BATCH_SIZE=4)
+    Manage().run()
+    expect = _lines(''.join(file.read_text(encoding='utf-8') for file in input_dir.iterdir()))
+    assert _lines(loader_path.read_text(encoding='utf-8')) == expect
+
+    (input_dir / '4.txt').write_text(' line 4-0 \n', encoding='utf-8')
+    override_settings(INCREMENTAL=True, FILE_EXTRACTOR_PATH=str(input_dir / '*.txt'))
+    Manage().run()
+    expect = _lines(''.join(file.read_text(encoding='utf-8') for file in input_dir.iterdir()))
+    assert _lines(loader_path.read_text(encoding='utf-8')) == expect
+
+
+def test_manage_run_input_dir_spill(input_dir, tmp_path, override_settings, monkeypatch):
+    """Batches of big files are spilled by workers and loaded in order of files, spill files are removed."""
+    spilled = []
+    read_spilled_batches = parallel.read_spilled_batches
+    monkeypatch.setattr(parallel, 'read_spilled_batches',
+                        lambda path: spilled.append(path) or read_spilled_batches(path))
+    loader_path = tmp_path / 'out.txt'
+    spill_dir = tmp_path / 'spill'
+    spill_dir.mkdir()
+    override_settings(FILE_LOADER_PATH=str(loader_path), WORKERS=2, BATCH_SIZE=2, SPLIT_MEMORY_BATCHES=1,
+                      SPLIT_SPILL_DIR=str(spill_dir))
+    Manage().run()
+    # Files are extracted from the largest.
+    expect = ''.join(file.read_text(encoding='utf-8') for file in sorted(
+        input_dir.iterdir(), key=lambda file: file.stat().st_size, reverse=True))
+    assert re.findall(r'line \d+-\d+', loader_path.read_text(encoding='utf-8')) == re.findall(r'line \d+-\d+', expect)
+    assert len(spilled) == 3
+    assert not list(spill_dir.iterdir())
+
+
+def test_manage_run_per_input(input_dir, tmp_path, override_settings):
+    """Every input file is written to its own output file."""
+    output_dir = tmp_path / 'outputs'
+    output_dir.mkdir()
+    override_settings(FILE_LOADER_PATH=str(output_dir / 'out-{name}'), OUTPUT_PER_INPUT=True, WORKERS=2)
+    Manage().run()
+    for file in input_dir.iterdir():
+        output = (output_dir / f'out-{file.name}').read_text(encoding='utf-8')
+        assert output == ''.join(line.strip() for line in file.read_text(encoding='utf-8').splitlines())
+
+    override_settings(FILE_LOADER_PATH=str(output_dir / 'out.txt'))
+    with pytest.raises(ProjectError):
+        Manage().run()
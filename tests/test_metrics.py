@@ -0,0 +1,42 @@
+"""Test metrics"""
+from __future__ import annotations  # PEP 585
+
+import pytest
+
+from project_template.example_etl.metrics import StageMetrics
+from project_template.manage import AsyncManage, Manage
+
+
+def test_stage_metrics():
+    """Records, bytes and latency percentiles are observed per batch."""
+    metrics = StageMetrics('load')
+    metrics.observe(['ab', 'cd'], 0.002)
+    metrics.observe(['e'], 0.2)
+    metrics.observe([], 0.00001)
+    assert (metrics.batches, metrics.records, metrics.size) == (3, 3, 5)
+    assert metrics.percentile(50) == 0.005
+    assert metrics.percentile(99) == 0.5
+    summary = metrics.summary(1)
+    assert summary['records_per_second'] == 3
+    assert sum(summary['histogram'].values()) == 3
+
+
+def test_stage_metrics_timed():
+    """Batches pass through unchanged, time producing them is observed."""
+    metrics = StageMetrics('extract')
+    assert list(metrics.timed(iter([['a'], ['b', 'c']]))) == [['a'], ['b', 'c']]
+    assert metrics.batches == 2
+    assert metrics.records == 3
+
+
+@pytest.mark.parametrize(
+    ['manage_kls', 'workers', 'mmap'],
+    [(Manage, 1, False), (Manage, 2, False), (Manage, 2, True), (AsyncManage, 1, False)],
+)
+def test_pipeline_metrics(etl_files, override_settings, manage_kls, workers: int, mmap: bool):
+    """Every stage counts all records."""
+    override_settings(WORKERS=workers, FILE_EXTRACTOR_MMAP=mmap, FILE_EXTRACTOR_RANGE_SIZE=32, BATCH_SIZE=4)
+    manage = manage_kls()
+    manage.run()
+    for summary in manage.metrics.summary():
+        assert summary['records'] == 25, summary['stage']
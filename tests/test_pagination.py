@@ -0,0 +1,54 @@
+"""Test keyset pagination of blog"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from project_template.example_blog.dao import ArticleDAO
+from project_template.example_blog.models import Article
+from project_template.example_blog.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture()
+def articles(blog_session):
+    """Articles, some of them are created at the same time."""
+    start = datetime(2024, 1, 1)
+    blog_session.add_all(
+        Article(title=f'{i}', create_time=start + timedelta(seconds=i // 3), update_time=start) for i in range(10)
+    )
+    blog_session.commit()
+    yield [f'{i}' for i in range(10)]
+
+
+def test_cursor():
+    """Cursor is an opaque token of sort key."""
+    cursor = (datetime(2024, 1, 1, 12, 30, 15, 123), 42)
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+    for token in ['', 'not a cursor', encode_cursor(cursor)[:-2]]:
+        with pytest.raises(ValueError):
+            decode_cursor(token)
+
+
+def test_dao_get_page(blog_session, articles):
+    """Pages after cursors cover all rows once, rows created at the same time are ordered by id."""
+    dao = ArticleDAO()
+    titles, cursor = [], None
+    while True:
+        page, cursor = dao.get_page(blog_session, cursor, limit=4)
+        titles.extend(article.title for article in page)
+        if cursor is None:
+            break
+    assert titles == articles
+
+
+def test_view_cursor(blog_client, articles):
+    """Next cursor is returned in header."""
+    client = blog_client
+    titles, cursor = [], ''
+    while cursor is not None:
+        response = client.get('/articles', params={'cursor': cursor, 'limit': 3})
+        assert response.status_code == 200
+        titles.extend(article['title'] for article in response.json())
+        cursor = response.headers.get('X-Next-Cursor')
+    assert titles == articles
+
+    assert client.get('/articles', params={'cursor': 'bad'}).status_code == 400
@@ -0,0 +1,42 @@
+"""Test plugin registry"""
+from __future__ import annotations  # PEP 585
+
+import json
+import sys
+
+import pytest
+
+from project_template.example_etl.extractor.file import FileExtractor
+from project_template.example_etl.registry import PluginRegistry, distributions_key
+from project_template.exceptions import PluginNotFoundError
+
+
+def test_registry(tmp_path):
+    """Plugins are found by name, and index is cached."""
+    cache_path = tmp_path / 'plugins.json'
+    registry = PluginRegistry(str(cache_path))
+    assert registry.get('example_etl.extractor', 'file') is FileExtractor
+    assert 'strip' in registry.names('example_etl.transformer')
+    assert json.loads(cache_path.read_text(encoding='utf-8'))['index'] == registry.index
+    with pytest.raises(PluginNotFoundError):
+        registry.get('example_etl.extractor', 'missing')
+
+
+def test_registry_cache(tmp_path):
+    """Cached index is used while distributions are not changed."""
+    cache_path = tmp_path / 'plugins.json'
+    cache_path.write_text(json.dumps({
+        'key': distributions_key(),
+        'index': {'example_etl.extractor': {'cached': 'project_template.example_etl.extractor.file:FileExtractor'}},
+    }), encoding='utf-8')
+    assert PluginRegistry(str(cache_path)).get('example_etl.extractor', 'cached') is FileExtractor
+
+    cache_path.write_text(json.dumps({'key': 'stale', 'index': {}}), encoding='utf-8')
+    assert PluginRegistry(str(cache_path)).names('example_etl.extractor')
+
+
+def test_distributions_key(tmp_path):
+    """Key changes if a distribution is installed."""
+    key = distributions_key([str(tmp_path), *sys.path])
+    (tmp_path / 'foo-1.0.dist-info').mkdir()
+    assert distributions_key([str(tmp_path), *sys.path]) != key
@@ -0,0 +1,119 @@
+"""Test transformer"""
+from __future__ import annotations  # PEP 585
+
+from pathlib import Path
+
+import pytest
+
+from project_template.config import settings
+from project_template.example_etl.transformer.base import BaseTransformer
+from project_template.example_etl.transformer.blank import DropBlankTransformer
+from project_template.example_etl.transformer.chain import ChainTransformer
+from project_template.example_etl.transformer.dedup import BloomFilter, DedupTransformer, digest
+from project_template.example_etl.transformer.sort import SortTransformer
+from project_template.example_etl.transformer.strip import StripTransformer
+from project_template.manage import AsyncManage, Manage
+
+
+class SplitTransformer(BaseTransformer):
+    """Split data to words, drop data starts with `#`"""
+
+    def transform(self, data: str):
+        if data.startswith('#'):
+            return None
+        return data.split()
+
+
+def test_filter_and_flat_map():
+    """Per-record transformer can drop data or emit several data."""
+    assert SplitTransformer(settings).transform_batch(['a b', '# c', 'd']) == ['a', 'b', 'd']
+
+
+def test_chain_transformer():
+    """Transformers are chained in order."""
+    chain = ChainTransformer([StripTransformer, DropBlankTransformer, SplitTransformer], settings)
+    assert chain.transform_batch([' a b \n', '  \n', '#c\n', 'd\n']) == ['a', 'b', 'd']
+    assert not chain.transform_batch(['\n'])
+
+
+def test_dedup_spill(override_settings, tmp_path):
+    """Duplicate data is dropped after digests spilled, spilled file is removed when closed."""
+    override_settings(DEDUP_TRANSFORMER_MODE='exact', DEDUP_TRANSFORMER_MEMORY_ITEMS=3,
+                      DEDUP_TRANSFORMER_SPILL_DIR=str(tmp_path))
+    dedup = DedupTransformer(settings)
+    assert dedup.transform_batch(['a', 'b', 'a', 'c']) == ['a', 'b', 'c']
+    assert dedup.digests.spilled == 3
+    assert dedup.transform_batch(['b', 'd', 'd', 'e']) == ['d', 'e']
+    assert dedup.transform('c') is None
+    assert len(dedup.digests) == 5
+    assert dedup.dropped == 4
+    dedup.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_bloom_filter():
+    """False positive rate of a full filter is about error rate."""
+    bloom = BloomFilter(10000, 0.01)
+    assert sum(bloom.add_new(digest(str(i))) for i in range(10000)) > 10000 * 0.99
+    assert not bloom.add_new(digest('0'))
+    assert digest('0') in bloom
+    false_positives = sum(digest(f'new {i}') in bloom for i in range(10000))
+    assert false_positives < 10000 * 0.02
+
+
+@pytest.mark.parametrize(
+    ['manage_kls', 'workers', 'mode', 'memory_items'],
+    [
+        (Manage, 1, 'exact', 1000), (Manage, 2, 'bloom', 1000),
+        (AsyncManage, 1, 'exact', 1000), (AsyncManage, 1, 'exact', 3),
+    ],
+)
+def test_dedup_pipeline(  # pylint: disable=too-many-arguments
+        etl_files, override_settings, tmp_path, manage_kls, workers: int, mode: str, memory_items: int,
+):
+    """Stateful transformer is not copied to worker processes, so data is deduplicated across batches."""
+    extractor_path, loader_path = etl_files
+    extractor_path.write_text(''.join(f'line {i % 7}\n' for i in range(25)), encoding='utf-8')
+    override_settings(TRANSFORMER_NAME=['strip', 'dedup'], DEDUP_TRANSFORMER_MODE=mode, WORKERS=workers, BATCH_SIZE=4,
+                      DEDUP_TRANSFORMER_MEMORY_ITEMS=memory_items, DEDUP_TRANSFORMER_SPILL_DIR=str(tmp_path))
+    manage_kls().run()
+    assert Path(loader_path).read_text(encoding='utf-8') == ''.join(f'line {i}' for i in range(7))
+    assert not list(tmp_path.glob('dedup-*'))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sort_spill(override_settings, tmp_path, workers: int):
+    """Runs are spilled and merged stably, run files are removed."""
+    override_settings(SORT_TRANSFORMER_KEY='key', SORT_TRANSFORMER_MEMORY_ITEMS=3, SORT_TRANSFORMER_WORKERS=workers,
+                      SORT_TRANSFORMER_SPILL_DIR=str(tmp_path), BATCH_SIZE=4)
+    records = [{'key': i * 7 % 5, 'order': i} for i in range(20)]
+    sort = SortTransformer(settings)
+    for i in range(0, 20, 6):
+        assert sort.transform_batch(records[i:i + 6]) == []
+    assert len(sort.runs) + len(sort.pending) == 6
+    batches = list(sort.finish())
+    assert [len(batch) for batch in batches] == [4] * 5
+    assert [record for batch in batches for record in batch] == sorted(records, key=lambda record: record['key'])
+    sort.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_sort_chain_reverse(override_settings):
+    """Sorted data held by a transformer passes through transformers after it."""
+    override_settings(SORT_TRANSFORMER_KEY='', SORT_TRANSFORMER_REVERSE=True, SORT_TRANSFORMER_MEMORY_ITEMS=2)
+    chain = ChainTransformer([SortTransformer, StripTransformer], settings)
+    assert chain.stateful and chain.buffering
+    assert chain.transform_batch(['b ', 'c', 'a ', 'd ']) == []
+    assert [data for batch in chain.finish() for data in batch] == ['d', 'c', 'b', 'a']
+    chain.close()
+
+
+@pytest.mark.parametrize(['manage_kls', 'workers'], [(Manage, 1), (Manage, 2), (AsyncManage, 1), (AsyncManage, 2)])
+def test_sort_pipeline(etl_files, override_settings, manage_kls, workers: int):
+    """Sorted data is loaded at the end, and the checkpoint is saved after it."""
+    extractor_path, loader_path = etl_files
+    extractor_path.write_text(''.join(f' line {i * 7 % 25:02d}\n' for i in range(25)), encoding='utf-8')
+    override_settings(TRANSFORMER_NAME=['strip', 'sort'], SORT_TRANSFORMER_MEMORY_ITEMS=4, WORKERS=workers,
+                      BATCH_SIZE=3)
+    manage_kls().run()
+    assert Path(loader_path).read_text(encoding='utf-8') == ''.join(f'line {i:02d}' for i in range(25))